@@ -4,21 +4,32 @@ The service exposes a minimal REST interface for managing tasks and their
 execution results:
 
 * ``POST /tasks`` creates a new task entry.
+* ``POST /tasks/bulk`` creates many tasks in a single transaction.
 * ``GET /tasks`` lists all tasks.
 * ``GET /tasks/{id}`` retrieves a single task.
 * ``POST /tasks/{id}/result`` stores stdout, stderr and exit code.
+* ``POST /tasks/results`` stores many results in a single transaction.
+* ``GET /tasks/results`` is a feed of stored results after a cursor and can
+  long-poll until new results arrive.
+* ``GET /stats`` reports queue depth, in-flight tasks, arrival rate and
+  recent service time for autoscalers.
 
 All data is persisted in a SQLite database specified by ``DB_PATH``. Two tables
 are created on startup: ``tasks`` for task metadata and ``task_results`` for
-worker output.
+worker output. A task's ``metadata`` is stored as JSON and returned to workers,
+which use its ``inputs``, ``env`` and ``cacheable`` entries to decide whether a
+result may be served from their cache.
 """
 
+import asyncio
+import json
 import logging
 import os
 import sqlite3
 import signal
+import time
 import sentry_sdk
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from pydantic import BaseModel
@@ -32,7 +43,7 @@ except Exception:  # pragma: no cover - optional dependency
 from core.security import verify_api_key, verify_token, require_role, User
 from config import load_config, reload_config
 from core.log_utils import configure_logging
-from .queue import publish_task
+from .queue import publish_task, publish_tasks
 try:
     from prometheus_client import Gauge
 except Exception:  # pragma: no cover - optional dependency
@@ -40,13 +51,18 @@ except Exception:  # pragma: no cover - optional dependency
 
 config = load_config()
 DB_PATH = config["broker"]["db_path"]
+STATS_WINDOW = float(config["broker"].get("stats_window", 60))
+# Upper bound for ``GET /tasks/results?wait=`` and the rows returned per call.
+MAX_RESULT_WAIT = 30.0
+RESULT_FEED_LIMIT = 500
 
 
 def _reload_config(signum, frame) -> None:
     """Reload configuration on ``SIGHUP``."""
-    global config, DB_PATH
+    global config, DB_PATH, STATS_WINDOW
     config = reload_config()
     DB_PATH = config["broker"]["db_path"]
+    STATS_WINDOW = float(config["broker"].get("stats_window", 60))
 
 
 signal.signal(signal.SIGHUP, _reload_config)
@@ -125,6 +141,16 @@ def init_db():
     conn.execute(
         "CREATE TABLE IF NOT EXISTS task_results (task_id INTEGER, stdout TEXT, stderr TEXT, exit_code INTEGER)"
     )
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+    for column in ("created_at", "claimed_at", "finished_at"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} REAL")
+    if "metadata" not in columns:
+        conn.execute("ALTER TABLE tasks ADD COLUMN metadata TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_finished ON tasks(finished_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_results_task ON task_results(task_id)")
     conn.commit()
     update_queue_length(conn)
     conn.close()
@@ -144,6 +170,44 @@ class TaskResult(BaseModel):
     exit_code: int
 
 
+class BatchTaskResult(TaskResult):
+    task_id: int
+
+
+class TaskOutcome(BatchTaskResult):
+    status: str
+
+
+class ResultFeed(BaseModel):
+    cursor: int
+    results: list[TaskOutcome]
+
+
+class BrokerStats(BaseModel):
+    queue_depth: int
+    in_flight: int
+    arrival_rate: float
+    service_time: float | None = None
+    created_total: int
+    completed_total: int
+    window: float
+
+
+def _metadata_json(task: Task) -> str | None:
+    return json.dumps(task.metadata) if task.metadata is not None else None
+
+
+def _row_to_task(row: sqlite3.Row, status: str | None = None) -> Task:
+    metadata = row["metadata"]
+    return Task(
+        id=row["id"],
+        description=row["description"],
+        status=status or row["status"],
+        command=row["command"],
+        metadata=json.loads(metadata) if metadata else None,
+    )
+
+
 init_db()
 
 
@@ -154,8 +218,15 @@ def create_task(
 ):
     conn = get_db()
     cur = conn.execute(
-        "INSERT INTO tasks (description, status, command) VALUES (?, ?, ?)",
-        (task.description, task.status, task.command),
+        "INSERT INTO tasks (description, status, command, metadata, created_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (
+            task.description,
+            task.status,
+            task.command,
+            _metadata_json(task),
+            time.time(),
+        ),
     )
     conn.commit()
     update_queue_length(conn)
@@ -168,21 +239,45 @@ def create_task(
     return task
 
 
+@app.post("/tasks/bulk", response_model=list[Task])
+def create_tasks(
+    tasks: list[Task],
+    __: User = Depends(require_role(["admin"])),
+):
+    """Create ``tasks`` in one write transaction and return them with ids."""
+    conn = get_db()
+    now = time.time()
+    with conn:
+        for task in tasks:
+            cur = conn.execute(
+                "INSERT INTO tasks "
+                "(description, status, command, metadata, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    task.description,
+                    task.status,
+                    task.command,
+                    _metadata_json(task),
+                    now,
+                ),
+            )
+            task.id = cur.lastrowid
+    update_queue_length(conn)
+    conn.close()
+    try:
+        publish_tasks([task.id for task in tasks])
+    except Exception:  # pragma: no cover - queue optional
+        logger.warning("Failed to publish %d tasks to queue", len(tasks))
+    return tasks
+
+
 @app.get("/tasks", response_model=list[Task])
 def list_tasks(
     __: User = Depends(require_role(["admin", "worker"])),
 ):
     conn = get_db()
-    cur = conn.execute("SELECT id, description, status, command FROM tasks")
-    tasks = [
-        Task(
-            id=row["id"],
-            description=row["description"],
-            status=row["status"],
-            command=row["command"],
-        )
-        for row in cur.fetchall()
-    ]
+    cur = conn.execute("SELECT id, description, status, command, metadata FROM tasks")
+    tasks = [_row_to_task(row) for row in cur.fetchall()]
     conn.close()
     return tasks
 
@@ -194,7 +289,8 @@ def next_task(__: User = Depends(require_role(["admin", "worker"]))):
     conn.isolation_level = None
     conn.execute("BEGIN IMMEDIATE")
     row = conn.execute(
-        "SELECT id, description, command FROM tasks WHERE status='pending' ORDER BY id LIMIT 1"
+        "SELECT id, description, status, command, metadata FROM tasks "
+        "WHERE status='pending' ORDER BY id LIMIT 1"
     ).fetchone()
     if not row:
         conn.execute("COMMIT")
@@ -203,13 +299,103 @@ def next_task(__: User = Depends(require_role(["admin", "worker"]))):
         return None
     task_id = row["id"]
     conn.execute(
-        "UPDATE tasks SET status='in_progress' WHERE id=? AND status='pending'",
-        (task_id,),
+        "UPDATE tasks SET status='in_progress', claimed_at=? "
+        "WHERE id=? AND status='pending'",
+        (time.time(), task_id),
     )
     conn.execute("COMMIT")
     update_queue_length(conn)
     conn.close()
-    return Task(id=task_id, description=row["description"], status="in_progress", command=row["command"])
+    return _row_to_task(row, status="in_progress")
+
+
+@app.get("/stats", response_model=BrokerStats)
+def broker_stats(__: User = Depends(require_role(["admin", "worker"]))):
+    """Return queue statistics over the last ``stats_window`` seconds."""
+    since = time.time() - STATS_WINDOW
+    conn = get_db()
+    row = conn.execute(
+        """
+        SELECT
+            SUM(status='pending') AS queue_depth,
+            SUM(status='in_progress') AS in_flight,
+            SUM(status='done') AS completed_total,
+            COUNT(*) AS created_total
+        FROM tasks
+        """
+    ).fetchone()
+    arrivals = conn.execute(
+        "SELECT COUNT(*) FROM tasks WHERE created_at >= ?", (since,)
+    ).fetchone()[0]
+    service_time = conn.execute(
+        "SELECT AVG(finished_at - claimed_at) FROM tasks "
+        "WHERE finished_at >= ? AND claimed_at IS NOT NULL",
+        (since,),
+    ).fetchone()[0]
+    conn.close()
+    return BrokerStats(
+        queue_depth=row["queue_depth"] or 0,
+        in_flight=row["in_flight"] or 0,
+        arrival_rate=arrivals / STATS_WINDOW,
+        service_time=service_time,
+        created_total=row["created_total"] or 0,
+        completed_total=row["completed_total"] or 0,
+        window=STATS_WINDOW,
+    )
+
+
+@app.get("/tasks/results", response_model=ResultFeed)
+async def result_feed(
+    since: int | None = None,
+    ids: list[int] | None = Query(None),
+    wait: float = 0.0,
+    __: User = Depends(require_role(["admin", "worker"])),
+):
+    """Return results stored after the ``since`` cursor, oldest first.
+
+    Without ``since`` only the current cursor is returned, so clients can
+    start following the feed from now. ``ids`` restricts the results to those
+    tasks. With ``wait`` the request blocks for up to that many seconds until
+    a result arrives. Pass the returned ``cursor`` as ``since`` next time.
+    The endpoint is a coroutine so that waiting requests do not hold a
+    threadpool worker; each poll is a short indexed query.
+    """
+    conn = get_db()
+    try:
+        if since is None:
+            row = conn.execute("SELECT MAX(rowid) FROM task_results").fetchone()
+            return ResultFeed(cursor=row[0] or 0, results=[])
+        query = (
+            "SELECT r.rowid AS seq, r.task_id, r.stdout, r.stderr, r.exit_code, "
+            "t.status FROM task_results r JOIN tasks t ON t.id = r.task_id "
+            "WHERE r.rowid > ?"
+        )
+        params: list = [since]
+        if ids:
+            query += f" AND r.task_id IN ({','.join('?' for _ in ids)})"
+            params += ids
+        query += f" ORDER BY r.rowid LIMIT {RESULT_FEED_LIMIT}"
+        deadline = time.monotonic() + min(max(wait, 0.0), MAX_RESULT_WAIT)
+        while True:
+            rows = conn.execute(query, params).fetchall()
+            if rows or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        conn.close()
+    return ResultFeed(
+        cursor=rows[-1]["seq"] if rows else since,
+        results=[
+            TaskOutcome(
+                task_id=row["task_id"],
+                status=row["status"],
+                stdout=row["stdout"],
+                stderr=row["stderr"],
+                exit_code=row["exit_code"],
+            )
+            for row in rows
+        ],
+    )
 
 
 @app.get("/tasks/{task_id}", response_model=Task)
@@ -219,17 +405,12 @@ def get_task(
 ):
     conn = get_db()
     row = conn.execute(
-        "SELECT id, description, status, command FROM tasks WHERE id = ?",
+        "SELECT id, description, status, command, metadata FROM tasks WHERE id = ?",
         (task_id,),
     ).fetchone()
     conn.close()
     if row:
-        return Task(
-            id=row["id"],
-            description=row["description"],
-            status=row["status"],
-            command=row["command"],
-        )
+        return _row_to_task(row)
     raise HTTPException(status_code=404, detail="Task not found")
 
 
@@ -247,13 +428,52 @@ def save_result(
         conn.close()
         raise HTTPException(status_code=404, detail="Task not found")
     conn.execute(
-        "INSERT INTO task_results (task_id, stdout, stderr, exit_code) VALUES (?, ?, ?, ?)",
+        "INSERT INTO task_results (task_id, stdout, stderr, exit_code) "
+        "VALUES (?, ?, ?, ?)",
         (task_id, result.stdout, result.stderr, result.exit_code),
     )
     conn.execute(
-        "UPDATE tasks SET status='done' WHERE id = ?",
-        (task_id,),
+        "UPDATE tasks SET status='done', finished_at=? WHERE id = ?",
+        (time.time(), task_id),
     )
     conn.commit()
     conn.close()
     return {"status": "ok"}
+
+
+@app.post("/tasks/results")
+def save_results(
+    results: list[BatchTaskResult],
+    __: User = Depends(require_role(["worker", "admin"])),
+):
+    """Store several task results in one write transaction.
+
+    Results for unknown task ids are skipped and returned in ``missing``.
+    """
+    conn = get_db()
+    ids = sorted({r.task_id for r in results})
+    placeholders = ",".join("?" for _ in ids)
+    known = {
+        row["id"]
+        for row in conn.execute(
+            f"SELECT id FROM tasks WHERE id IN ({placeholders})", ids
+        ).fetchall()
+    } if ids else set()
+    saved = [r for r in results if r.task_id in known]
+    conn.executemany(
+        "INSERT INTO task_results (task_id, stdout, stderr, exit_code) "
+        "VALUES (?, ?, ?, ?)",
+        [(r.task_id, r.stdout, r.stderr, r.exit_code) for r in saved],
+    )
+    now = time.time()
+    conn.executemany(
+        "UPDATE tasks SET status='done', finished_at=? WHERE id = ?",
+        [(now, task_id) for task_id in sorted(known)],
+    )
+    conn.commit()
+    conn.close()
+    return {
+        "status": "ok",
+        "saved": [r.task_id for r in saved],
+        "missing": [task_id for task_id in ids if task_id not in known],
+    }
@@ -14,3 +14,15 @@ def publish_task(task_id: int) -> None:
     channel.basic_publish(exchange="", routing_key=QUEUE_NAME, body=str(task_id))
     connection.close()
 
+
+def publish_tasks(task_ids: list[int]) -> None:
+    """Publish several task IDs over a single RabbitMQ connection."""
+    if not task_ids:
+        return
+    params = pika.URLParameters(RABBITMQ_URL)
+    connection = pika.BlockingConnection(params)
+    channel = connection.channel()
+    channel.queue_declare(queue=QUEUE_NAME, durable=True)
+    for task_id in task_ids:
+        channel.basic_publish(exchange="", routing_key=QUEUE_NAME, body=str(task_id))
+    connection.close()
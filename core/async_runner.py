@@ -1,38 +1,111 @@
 import asyncio
 import shlex
-from typing import Sequence, Union, Dict
+import threading
+import time
+from typing import Sequence, Union, Dict, Optional, TYPE_CHECKING
+
+from .tool_runner import kill_process_group
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .python_pool import PythonPool
+
 
 class AsyncRunner:
-    """Run shell commands asynchronously."""
+    """Run shell commands asynchronously.
+
+    When a :class:`~core.python_pool.PythonPool` is supplied, plain
+    ``python -c``/``python script.py`` commands are dispatched to a warm
+    interpreter instead of spawning a new one.
+    """
 
-    async def run(self, command: Union[str, Sequence[str]]) -> Dict[str, Union[str, int]]:
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        python_pool: Optional["PythonPool"] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.python_pool = python_pool
+
+    async def run(
+        self,
+        command: Union[str, Sequence[str]],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Union[str, int, bool, float]]:
         """Execute ``command`` asynchronously and capture output.
 
+        The child runs in its own process group. When ``timeout`` (or the
+        runner's default) expires, or the awaiting task is cancelled, the whole
+        process group is killed so no grandchildren keep running.
+
         Parameters
         ----------
         command:
             The command to execute. Can be a string or sequence of arguments.
+        timeout:
+            Seconds to wait before killing the command. Defaults to the
+            ``timeout`` given to the constructor; ``None`` waits indefinitely.
 
         Returns
         -------
         dict
-            Dictionary with ``stdout``, ``stderr`` and ``exit_code``.
+            Dictionary with ``stdout``, ``stderr``, ``exit_code``,
+            ``timed_out``, ``duration`` (elapsed seconds) and
+            ``spawn_duration`` (seconds spent starting the command).
         """
         if isinstance(command, str):
             args = shlex.split(command)
         else:
             args = list(command)
+        timeout = self.timeout if timeout is None else timeout
+        if self.python_pool and self.python_pool.accepts(args):
+            return await self._run_in_pool(args, timeout)
 
+        start = time.perf_counter()
         proc = await asyncio.create_subprocess_exec(
             *args,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
+        spawned = time.perf_counter()
 
-        stdout, stderr = await proc.communicate()
+        communicate = asyncio.ensure_future(proc.communicate())
+        timed_out = False
+        try:
+            done, _ = await asyncio.wait({communicate}, timeout=timeout)
+            if not done:
+                timed_out = True
+                kill_process_group(proc)
+            stdout, stderr = await communicate
+        except asyncio.CancelledError:
+            kill_process_group(proc)
+            communicate.cancel()
+            await proc.wait()
+            raise
 
         return {
             "stdout": stdout.decode(),
             "stderr": stderr.decode(),
             "exit_code": proc.returncode,
+            "timed_out": timed_out,
+            "duration": time.perf_counter() - start,
+            "spawn_duration": spawned - start,
         }
+
+    async def _run_in_pool(
+        self, args: Sequence[str], timeout: Optional[float]
+    ) -> Dict[str, Union[str, int, bool, float]]:
+        """Run ``args`` in the warm Python pool without blocking the loop."""
+        cancel = threading.Event()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            None, lambda: self.python_pool.run(args, None, timeout, cancel)
+        )
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            await asyncio.wait({future})
+            raise
+        result.pop("cancelled", None)
+        return result
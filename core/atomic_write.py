@@ -0,0 +1,200 @@
+"""Crash-safe replacement of small state files.
+
+Opening a state file with mode ``"w"`` truncates it before the new content
+is written, so a crash mid-write leaves a truncated file and concurrent
+readers can observe partial content. :func:`atomic_open` and
+:func:`atomic_write` write to a temporary sibling instead and rename it over
+the target once complete. Readers therefore always see either the old or
+the new file.
+
+How durable a replacement is depends on the fsync policy:
+
+``always``
+    The temporary file is synced before the rename and its directory after
+    it, so the new content survives power loss once the call returns.
+``group``
+    The rename happens immediately and survives a crash of the process.
+    Syncing is batched by a :class:`GroupCommit`: every file replaced within
+    one ``interval`` is synced together, followed by each directory once.
+    Frequent writers pay for one sync per interval instead of one per write.
+``never``
+    Nothing is synced; the operating system writes the data back in its own
+    time.
+
+The policy defaults to ``always`` and is set process-wide with
+:func:`configure_fsync`, or per call with the ``fsync`` argument.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("always", "group", "never")
+
+
+def _fsync_path(path: Path, directory: bool = False) -> None:
+    flags = os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:  # pragma: no cover - e.g. directories on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - filesystems without fsync
+        pass
+    finally:
+        os.close(fd)
+
+
+class GroupCommit:
+    """Batch the syncs of atomically replaced files.
+
+    :meth:`add` registers a replaced file. A background thread syncs all
+    registered files and their directories ``interval`` seconds after the
+    first registration, and :meth:`flush` does so immediately. Pending files
+    are also flushed at interpreter exit.
+    """
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.commits = 0
+        self._pending: Set[Path] = set()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    def add(self, path: str | Path) -> None:
+        """Sync ``path`` with the next group commit."""
+        with self._cond:
+            self._pending.add(Path(path))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="group-commit", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """Sync all pending files now and return how many were synced."""
+        with self._flush_lock:
+            with self._cond:
+                paths, self._pending = self._pending, set()
+            if not paths:
+                return 0
+            for path in paths:
+                _fsync_path(path)
+            for directory in {p.parent for p in paths}:
+                _fsync_path(directory, directory=True)
+            self.commits += 1
+            return len(paths)
+
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(self.interval * 20)
+                    if not self._pending:
+                        # Idle; a later add() starts a new thread.
+                        self._thread = None
+                        return
+            threading.Event().wait(self.interval)
+            self.flush()
+
+
+_policy = "always"
+_group: Optional[GroupCommit] = None
+_group_lock = threading.Lock()
+
+
+def configure_fsync(policy: str = "always", group_interval: float = 0.05) -> None:
+    """Set the process-wide fsync policy used when ``fsync`` is not given."""
+    global _policy, _group
+    if policy not in POLICIES:
+        raise ValueError(
+            f"Unknown fsync policy {policy!r}; expected one of {', '.join(POLICIES)}"
+        )
+    with _group_lock:
+        if _group is not None:
+            _group.flush()
+        _policy = policy
+        _group = GroupCommit(group_interval) if policy == "group" else None
+
+
+def group_commit() -> GroupCommit:
+    """Return the process-wide :class:`GroupCommit`, creating it if needed."""
+    global _group
+    with _group_lock:
+        if _group is None:
+            _group = GroupCommit()
+        return _group
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def atomic_open(
+    path: str | Path,
+    mode: str = "w",
+    encoding: Optional[str] = "utf-8",
+    fsync: Optional[str] = None,
+) -> Iterator[IO]:
+    """Open a temporary sibling of ``path`` that replaces it on success.
+
+    ``mode`` is ``"w"`` or ``"wb"``. If the block raises, the temporary file
+    is removed and ``path`` is left untouched. ``fsync`` overrides the
+    process-wide policy.
+    """
+    if mode not in ("w", "wb"):
+        raise ValueError("atomic_open only supports modes 'w' and 'wb'")
+    policy = fsync or _policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown fsync policy {policy!r}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as fh:
+            yield fh
+            fh.flush()
+            if policy == "always":
+                os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if policy == "always":
+        _fsync_path(path.parent, directory=True)
+    elif policy == "group":
+        group_commit().add(path)
+
+
+def atomic_write(
+    path: str | Path,
+    data: str | bytes,
+    encoding: str = "utf-8",
+    fsync: Optional[str] = None,
+) -> None:
+    """Atomically replace ``path`` with ``data``."""
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with atomic_open(path, mode, encoding=encoding, fsync=fsync) as fh:
+        fh.write(data)
@@ -0,0 +1,278 @@
+"""Executor backend running orchestrator tasks on the broker's worker fleet.
+
+:class:`BrokerExecutor` is a drop-in replacement for
+:class:`core.executor.Executor`. Instead of running a task's command
+locally, :meth:`BrokerExecutor.execute` hands it to the broker and blocks
+until a worker has reported the result. Combined with the orchestrator's
+thread pool (``parallelism`` above one, or pipeline mode), the tasks that
+are ready at the same time are submitted together in one
+``POST /tasks/bulk`` request. A single background thread follows their
+completion through the long-polling ``GET /tasks/results`` feed.
+
+Like the local executor, a reported result completes the task whatever its
+exit code; a non-zero code is logged and the output written to ``logs/``.
+No result within ``task_timeout`` seconds raises :class:`RuntimeError`, and
+the orchestrator puts the task back to ``pending``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class BrokerExecutor:
+    """Submit tasks to the broker in batches and wait for their results.
+
+    Submissions arriving within ``batch_interval`` seconds of each other are
+    sent together, up to ``batch_size`` per request. ``poll_wait`` is how
+    long each request to the result feed may block on the broker. Tasks
+    without a ``command`` complete immediately, as with the local executor.
+    """
+
+    def __init__(
+        self,
+        broker_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        batch_size: int = 50,
+        batch_interval: float = 0.05,
+        poll_wait: float = 10.0,
+        task_timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.broker_url = broker_url.rstrip("/")
+        self.batch_size = max(1, int(batch_size))
+        self.batch_interval = batch_interval
+        self.poll_wait = poll_wait
+        self.task_timeout = task_timeout
+        self.session = session or requests.Session()
+        self.session.headers.update(headers or {})
+        self.submitted = 0
+        self.batches = 0
+        self._cond = threading.Condition()
+        self._queued: List[Tuple[object, Future]] = []
+        self._waiting: Dict[int, Tuple[object, Future]] = {}
+        self._cursor: Optional[int] = None
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_config(cls, cfg: dict) -> "BrokerExecutor":
+        """Build an executor from the ``orchestrator`` and ``security`` sections."""
+        orch = cfg.get("orchestrator", {})
+        headers = {}
+        if cfg["security"].get("api_key"):
+            headers["X-API-Key"] = cfg["security"]["api_key"]
+        if orch.get("broker_token"):
+            headers["Authorization"] = f"Bearer {orch['broker_token']}"
+        timeout = orch.get("broker_task_timeout")
+        return cls(
+            cfg["worker"]["broker_url"],
+            headers,
+            batch_size=int(orch.get("broker_batch_size", 50)),
+            poll_wait=float(orch.get("broker_poll_wait", 10.0)),
+            task_timeout=float(timeout) if timeout is not None else None,
+        )
+
+    # ------------------------------------------------------------------
+    def execute(self, task: object) -> None:
+        """Run ``task`` on a broker worker; raise ``RuntimeError`` on timeout."""
+        task_id = getattr(task, "id", "unknown")
+        command = getattr(task, "command", None)
+        if not command:
+            logger.info("Task %s has no command; nothing to dispatch", task_id)
+            return
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BrokerExecutor is closed")
+            self._start()
+            self._queued.append((task, future))
+            self._cond.notify_all()
+        try:
+            result = future.result(timeout=self.task_timeout)
+        except FutureTimeout:
+            future.cancel()
+            self._forget(future)
+            raise RuntimeError(
+                f"Task {task_id} did not finish on the broker "
+                f"within {self.task_timeout}s"
+            ) from None
+        self._write_log(task_id, result)
+        if result["exit_code"] != 0:
+            logger.warning(
+                "Task %s exited with code %s on the broker",
+                task_id,
+                result["exit_code"],
+            )
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop the background threads; unfinished tasks fail."""
+        with self._cond:
+            self._closed = True
+            pending = self._queued + list(self._waiting.values())
+            self._queued, self._waiting = [], {}
+            self._cond.notify_all()
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("BrokerExecutor closed"))
+        for thread in self._threads:
+            thread.join(timeout=self.poll_wait + 1)
+        self.session.close()
+
+    # ------------------------------------------------------------------
+    def _start(self) -> None:
+        if self._threads:
+            return
+        for target, name in (
+            (self._submit_loop, "submit"),
+            (self._follow_loop, "follow"),
+        ):
+            thread = threading.Thread(
+                target=target, name=f"broker-executor-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    # ------------------------------------------------------------------
+    def _submit_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queued and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Give tasks planned in the same round a moment to join.
+                deadline = time.monotonic() + self.batch_interval
+                while len(self._queued) < self.batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queued[: self.batch_size]
+                self._queued = self._queued[self.batch_size :]
+            if batch:
+                self._submit(batch)
+
+    # ------------------------------------------------------------------
+    def _submit(self, batch: List[Tuple[object, Future]]) -> None:
+        payload = [
+            {
+                "description": getattr(task, "description", "") or "",
+                "command": getattr(task, "command", None),
+                "metadata": getattr(task, "metadata", None) or None,
+            }
+            for task, _ in batch
+        ]
+        try:
+            if self._cursor is None:
+                # Follow the feed from before the first submission.
+                self._cursor = self._get_feed(None, 0)["cursor"]
+            start = self._cursor
+            resp = self.session.post(
+                f"{self.broker_url}/tasks/bulk", json=payload, timeout=30
+            )
+            resp.raise_for_status()
+            created = resp.json()
+        except (requests.RequestException, ValueError) as exc:
+            logger.error(
+                "Submitting %d tasks to the broker failed: %s", len(batch), exc
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError(f"Broker submission failed: {exc}")
+                    )
+            return
+        ids = [item["id"] for item in created]
+        with self._cond:
+            for entry, task_id in zip(batch, ids):
+                self._waiting[task_id] = entry
+            self.submitted += len(batch)
+            self.batches += 1
+            missed = self._cursor != start
+            self._cond.notify_all()
+        logger.info("Submitted %d tasks to the broker", len(batch))
+        if missed:
+            # The follower moved past results that may belong to these tasks
+            # before they were registered; fetch those directly.
+            try:
+                self._resolve(self._get_feed(start, 0, ids)["results"])
+            except (
+                requests.RequestException,
+                ValueError,
+            ) as exc:  # pragma: no cover - network
+                logger.warning("Fetching early broker results failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    def _get_feed(
+        self, since: Optional[int], wait: float, ids: Optional[List[int]] = None
+    ) -> dict:
+        params: Dict[str, object] = {"wait": wait}
+        if since is not None:
+            params["since"] = since
+        if ids:
+            params["ids"] = ids
+        resp = self.session.get(
+            f"{self.broker_url}/tasks/results", params=params, timeout=wait + 30
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    # ------------------------------------------------------------------
+    def _follow_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._waiting and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                since = self._cursor
+            try:
+                feed = self._get_feed(since, self.poll_wait)
+            except (requests.RequestException, ValueError) as exc:
+                logger.warning("Polling broker results failed: %s", exc)
+                with self._cond:
+                    self._cond.wait(1.0)
+                continue
+            with self._cond:
+                self._cursor = max(self._cursor or 0, feed["cursor"])
+            self._resolve(feed["results"])
+
+    # ------------------------------------------------------------------
+    def _resolve(self, results: List[dict]) -> None:
+        """Complete the futures of waiting tasks with their ``results``."""
+        with self._cond:
+            done = [(self._waiting.pop(r["task_id"], None), r) for r in results]
+        for entry, result in done:
+            if entry is not None and not entry[1].done():
+                entry[1].set_result(result)
+
+    # ------------------------------------------------------------------
+    def _forget(self, future: Future) -> None:
+        """Stop tracking the task of ``future``; a late result is ignored."""
+        with self._cond:
+            self._queued = [entry for entry in self._queued if entry[1] is not future]
+            for broker_id, entry in list(self._waiting.items()):
+                if entry[1] is future:
+                    del self._waiting[broker_id]
+
+    # ------------------------------------------------------------------
+    def _write_log(self, task_id, result: dict) -> None:
+        """Write worker output to ``logs/`` like the local executor does."""
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        log_file = log_dir / f"task-{task_id}-{timestamp}.log"
+        log_file.write_text(result.get("stdout", "") + result.get("stderr", ""))
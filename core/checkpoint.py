@@ -0,0 +1,93 @@
+"""Compact run checkpoint for resuming the orchestrator quickly.
+
+A restarted orchestrator used to begin every run with a full reflection
+cycle and forget how much planner budget it had spent. :class:`RunCheckpoint`
+keeps the state needed to continue where the previous process stopped in
+``<tasks_file>.checkpoint``:
+
+``cost_used`` / ``warned``
+    Planner budget usage, so the budget spans restarts.
+``in_flight``
+    Ids of tasks marked ``in_progress`` by the run. Tasks still in that state
+    on resume were interrupted and are put back to ``pending``.
+``last_reflection``
+    Wall-clock time of the last completed reflection cycle.
+``unaudited``
+    Completed tasks not yet covered by a self-audit.
+``audit_cache``
+    Path of the auditor's per-file metrics cache, reused on resume.
+
+The checkpoint is a small JSON document written with
+:func:`~core.atomic_write.atomic_write`, so a crash never leaves a partial
+file behind.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .atomic_write import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class RunCheckpoint:
+    """Periodically persisted run state for ``tasks_file``.
+
+    :meth:`update` writes at most once every ``interval`` seconds unless
+    forced; the orchestrator forces a write whenever a task is dispatched, so
+    the in-flight list on disk is never behind the task file.
+    """
+
+    VERSION = 1
+
+    def __init__(self, tasks_file: str, interval: float = 5.0) -> None:
+        tasks_path = Path(tasks_file)
+        self.path = tasks_path.with_name(tasks_path.name + ".checkpoint")
+        self.interval = interval
+        self.state: Dict[str, Any] = {}
+        self.writes = 0
+        self._last_write: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the stored state or ``None`` if missing or unusable."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.path, exc)
+            return None
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            logger.warning("Ignoring checkpoint %s with unknown version", self.path)
+            return None
+        self.state = data
+        return data
+
+    # ------------------------------------------------------------------
+    def update(self, force: bool = False, **state: Any) -> bool:
+        """Merge ``state`` and write it when due; return ``True`` if written."""
+        self.state.update(state)
+        if not force and not self.due():
+            return False
+        self.write()
+        return True
+
+    # ------------------------------------------------------------------
+    def due(self) -> bool:
+        if self._last_write is None:
+            return True
+        return time.monotonic() - self._last_write >= self.interval
+
+    # ------------------------------------------------------------------
+    def write(self) -> None:
+        """Atomically replace the checkpoint file with the current state."""
+        data = {**self.state, "version": self.VERSION, "ts": time.time()}
+        atomic_write(self.path, json.dumps(data))
+        self._last_write = time.monotonic()
+        self.writes += 1
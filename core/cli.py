@@ -12,6 +12,10 @@ from dataclasses import asdict
 import yaml
 from .planner import Planner
 from .executor import Executor
+from .broker_executor import BrokerExecutor
+from .atomic_write import configure_fsync
+from .cost_model import cost_model_from_config
+from .task_store import TaskStore, task_store_from_config
 from .reflector import Reflector
 from .self_auditor import SelfAuditor
 from .telemetry import setup_telemetry
@@ -107,6 +111,20 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to tasks.yml",
     )
 
+    tasks_cmd = subparsers.add_parser(
+        "tasks", help="Move tasks between tasks.yml and the SQLite store"
+    )
+    tasks_sub = tasks_cmd.add_subparsers(dest="tasks_command", required=True)
+    for name, help_text in (
+        ("import", "Replace the SQLite store's tasks with tasks.yml"),
+        ("export", "Write the SQLite store's tasks to tasks.yml"),
+    ):
+        sub = tasks_sub.add_parser(name, help=help_text)
+        sub.add_argument("--tasks", default="tasks.yml", help="Path to tasks.yml")
+        sub.add_argument(
+            "--db", default=None, help="SQLite database (default: task_store.path)"
+        )
+
     # Internal command used by "start"; not exposed in docs
     run = subparsers.add_parser("_run")
     run.add_argument("--config", default="config.yaml")
@@ -135,20 +153,38 @@ def _run_orchestrator(
         return 1
     cfg = load_config()
     setup_telemetry(jaeger_endpoint=cfg["tracing"]["jaeger_endpoint"])
-    memory = Memory(Path("state.json"))
+    configure_fsync(cfg["storage"]["fsync"], cfg["storage"]["group_commit_interval"])
+    memory = Memory(
+        Path("state.json"),
+        snapshot=cfg["memory"]["snapshot"],
+        snapshot_codec=cfg["memory"]["snapshot_codec"],
+    )
     try:
         memory.save(memory.load())
     except Exception as exc:  # pragma: no cover - unexpected I/O errors
         logging.error("Error accessing memory: %s", exc)
         return 1
 
-    planner = Planner(budget=budget, warning_threshold=warning_threshold)
-    executor = Executor()
-    reflector = Reflector()
-    auditor = SelfAuditor()
-    orchestrator = Orchestrator(planner, executor, reflector, memory, auditor)
+    cost_model = cost_model_from_config(cfg)
+    planner = Planner(
+        budget=budget, warning_threshold=warning_threshold, cost_model=cost_model
+    )
+    if cfg["orchestrator"]["executor"] == "broker":
+        executor = BrokerExecutor.from_config(cfg)
+    else:
+        executor = Executor(cost_model=cost_model)
+    store = task_store_from_config(cfg)
+    reflector = Reflector(task_store=store)
+    auditor = SelfAuditor(cache_file=cfg["auditor"]["cache_file"])
+    orchestrator = Orchestrator(planner, executor, reflector, store or memory, auditor)
     logging.info("Orchestrator running")
-    orchestrator.run()
+    try:
+        orchestrator.run()
+    finally:
+        if isinstance(executor, BrokerExecutor):
+            executor.close()
+        if cost_model is not None:
+            cost_model.flush()
     return 0
 
 
@@ -222,6 +258,20 @@ def main(argv=None) -> int:
         yaml.safe_dump(data, sys.stdout, sort_keys=False)
         return 0
 
+    if args.command == "tasks":
+        store = TaskStore(args.db or load_config()["task_store"]["path"])
+        if args.tasks_command == "import":
+            count = store.import_yaml(args.tasks)
+            logging.info(
+                "Imported %d tasks from %s into %s", count, args.tasks, store.path
+            )
+        else:
+            count = store.export_yaml(args.tasks)
+            logging.info(
+                "Exported %d tasks from %s to %s", count, store.path, args.tasks
+            )
+        return 0
+
     if args.command == "_run":
         return _run_orchestrator(
             Path(args.config), budget=args.budget, warning_threshold=args.warning_threshold
@@ -7,11 +7,18 @@ from pathlib import Path
 import yaml
 
 DEFAULT_CONFIG = {
-    "broker": {"db_path": "tasks.db", "metrics_port": 9000},
+    "broker": {"db_path": "tasks.db", "metrics_port": 9000, "stats_window": 60},
     "worker": {
         "broker_url": "http://broker:8000",
         "metrics_port": 9001,
         "concurrency": 2,
+        "task_timeout": None,
+        "python_pool": 0,
+        "metrics_tag": "family",
+        "report_batch_size": 1,
+        "report_flush_interval": 0.5,
+        "idle_poll": None,
+        "concurrency_file": None,
     },
     "node": {"host": "localhost", "port": 50051},
     "security": {
@@ -32,11 +39,43 @@ DEFAULT_CONFIG = {
         "root": "sandbox",
         "allowed_commands": ["echo", "touch"],
         "root_env": "SANDBOX_ROOT",
+        "timeout": None,
+        "python_pool": 0,
     },
+    "orchestrator": {
+        "parallelism": 1,
+        "pool": "thread",
+        "mode": "loop",
+        "batch_planning": False,
+        "journal": False,
+        "journal_compact_every": 100,
+        "journal_compact_interval": 5.0,
+        "checkpoint": False,
+        "checkpoint_interval": 5.0,
+        "reflect_interval": 3600.0,
+        "audit_every": 1,
+        "audit_interval": 0.0,
+        "profile_threshold": None,
+        "profile_dir": "profiles",
+        "profile_sample_rate": 1.0,
+        "executor": "local",
+        "broker_token": None,
+        "broker_batch_size": 50,
+        "broker_poll_wait": 10.0,
+        "broker_task_timeout": None,
+    },
+    "auditor": {"cache_file": ".audit_cache.json"},
+    "cost_model": {"enabled": False, "path": ".cost_model.json", "window": 20},
+    "task_store": {"backend": "yaml", "path": "tasks.sqlite"},
+    "storage": {"fsync": "always", "group_commit_interval": 0.05},
+    "memory": {"snapshot": False, "snapshot_codec": "json"},
     "planner": {
         "budget": 0,
         "warning_threshold": 0.8,
         "budget_env": "PLANNER_BUDGET",
+        "incremental": False,
+        "mode": "priority",
+        "critical_path_weight": 1.0,
     },
     "tracing": {
         "jaeger_endpoint": "http://localhost:4317",
@@ -52,7 +91,17 @@ DEFAULT_CONFIG = {
         "performance": 0.5,
         "style": 0.2,
     },
-    "mcp": {"host": "localhost", "port": 8004, "host_env": "MCP_HOST", "port_env": "MCP_PORT"},
+    "mcp": {
+        "host": "localhost",
+        "port": 8004,
+        "host_env": "MCP_HOST",
+        "port_env": "MCP_PORT",
+    },
+    "cache": {
+        "enabled": False,
+        "path": ".cache/results.db",
+        "max_bytes": 64 * 1024 * 1024,
+    },
 }
 
 CONFIG_PATH = Path(__file__).resolve().parents[1] / "config.yaml"
@@ -71,23 +120,51 @@ def load_config(path: str | Path | None = None) -> dict:
         "node": {**DEFAULT_CONFIG["node"], **data.get("node", {})},
         "security": {**DEFAULT_CONFIG["security"], **data.get("security", {})},
         "sandbox": {**DEFAULT_CONFIG["sandbox"], **data.get("sandbox", {})},
+        "orchestrator": {
+            **DEFAULT_CONFIG["orchestrator"],
+            **data.get("orchestrator", {}),
+        },
+        "auditor": {**DEFAULT_CONFIG["auditor"], **data.get("auditor", {})},
+        "cost_model": {**DEFAULT_CONFIG["cost_model"], **data.get("cost_model", {})},
+        "task_store": {**DEFAULT_CONFIG["task_store"], **data.get("task_store", {})},
+        "storage": {**DEFAULT_CONFIG["storage"], **data.get("storage", {})},
+        "memory": {**DEFAULT_CONFIG["memory"], **data.get("memory", {})},
         "planner": {**DEFAULT_CONFIG["planner"], **data.get("planner", {})},
         "tracing": {**DEFAULT_CONFIG["tracing"], **data.get("tracing", {})},
         "logging": {**DEFAULT_CONFIG["logging"], **data.get("logging", {})},
         "reward": {**DEFAULT_CONFIG["reward"], **data.get("reward", {})},
         "mcp": {**DEFAULT_CONFIG["mcp"], **data.get("mcp", {})},
+        "cache": {**DEFAULT_CONFIG["cache"], **data.get("cache", {})},
     }
 
     if "DB_PATH" in os.environ:
         cfg["broker"]["db_path"] = os.environ["DB_PATH"]
     if "BROKER_URL" in os.environ:
         cfg["worker"]["broker_url"] = os.environ["BROKER_URL"]
+    if "BROKER_STATS_WINDOW" in os.environ:
+        cfg["broker"]["stats_window"] = float(os.environ["BROKER_STATS_WINDOW"])
     if "BROKER_METRICS_PORT" in os.environ:
         cfg["broker"]["metrics_port"] = int(os.environ["BROKER_METRICS_PORT"])
     if "WORKER_METRICS_PORT" in os.environ:
         cfg["worker"]["metrics_port"] = int(os.environ["WORKER_METRICS_PORT"])
     if "WORKER_CONCURRENCY" in os.environ:
         cfg["worker"]["concurrency"] = int(os.environ["WORKER_CONCURRENCY"])
+    if "WORKER_TASK_TIMEOUT" in os.environ:
+        cfg["worker"]["task_timeout"] = float(os.environ["WORKER_TASK_TIMEOUT"])
+    if "WORKER_METRICS_TAG" in os.environ:
+        cfg["worker"]["metrics_tag"] = os.environ["WORKER_METRICS_TAG"]
+    if "WORKER_PYTHON_POOL" in os.environ:
+        cfg["worker"]["python_pool"] = int(os.environ["WORKER_PYTHON_POOL"])
+    if "WORKER_CONCURRENCY_FILE" in os.environ:
+        cfg["worker"]["concurrency_file"] = os.environ["WORKER_CONCURRENCY_FILE"]
+    if "WORKER_IDLE_POLL" in os.environ:
+        cfg["worker"]["idle_poll"] = float(os.environ["WORKER_IDLE_POLL"])
+    if "WORKER_REPORT_BATCH_SIZE" in os.environ:
+        cfg["worker"]["report_batch_size"] = int(os.environ["WORKER_REPORT_BATCH_SIZE"])
+    if "WORKER_REPORT_FLUSH_INTERVAL" in os.environ:
+        cfg["worker"]["report_flush_interval"] = float(
+            os.environ["WORKER_REPORT_FLUSH_INTERVAL"]
+        )
     if "NODE_HOST" in os.environ:
         cfg["node"]["host"] = os.environ["NODE_HOST"]
     if "NODE_PORT" in os.environ:
@@ -104,8 +181,116 @@ def load_config(path: str | Path | None = None) -> dict:
 
     if "SANDBOX_ROOT" in os.environ:
         cfg["sandbox"]["root"] = os.environ["SANDBOX_ROOT"]
+    if "SANDBOX_TIMEOUT" in os.environ:
+        cfg["sandbox"]["timeout"] = float(os.environ["SANDBOX_TIMEOUT"])
+    if "SANDBOX_PYTHON_POOL" in os.environ:
+        cfg["sandbox"]["python_pool"] = int(os.environ["SANDBOX_PYTHON_POOL"])
+    if "ORCHESTRATOR_PARALLELISM" in os.environ:
+        cfg["orchestrator"]["parallelism"] = int(os.environ["ORCHESTRATOR_PARALLELISM"])
+    if "ORCHESTRATOR_POOL" in os.environ:
+        cfg["orchestrator"]["pool"] = os.environ["ORCHESTRATOR_POOL"]
+    if "ORCHESTRATOR_MODE" in os.environ:
+        cfg["orchestrator"]["mode"] = os.environ["ORCHESTRATOR_MODE"]
+    if "ORCHESTRATOR_BATCH_PLANNING" in os.environ:
+        cfg["orchestrator"]["batch_planning"] = os.environ[
+            "ORCHESTRATOR_BATCH_PLANNING"
+        ].lower() in {"1", "true", "yes"}
+    if "ORCHESTRATOR_JOURNAL" in os.environ:
+        cfg["orchestrator"]["journal"] = os.environ["ORCHESTRATOR_JOURNAL"].lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+    if "ORCHESTRATOR_JOURNAL_COMPACT_EVERY" in os.environ:
+        cfg["orchestrator"]["journal_compact_every"] = int(
+            os.environ["ORCHESTRATOR_JOURNAL_COMPACT_EVERY"]
+        )
+    if "ORCHESTRATOR_JOURNAL_COMPACT_INTERVAL" in os.environ:
+        cfg["orchestrator"]["journal_compact_interval"] = float(
+            os.environ["ORCHESTRATOR_JOURNAL_COMPACT_INTERVAL"]
+        )
+    if "ORCHESTRATOR_CHECKPOINT" in os.environ:
+        cfg["orchestrator"]["checkpoint"] = os.environ[
+            "ORCHESTRATOR_CHECKPOINT"
+        ].lower() in {"1", "true", "yes"}
+    if "ORCHESTRATOR_CHECKPOINT_INTERVAL" in os.environ:
+        cfg["orchestrator"]["checkpoint_interval"] = float(
+            os.environ["ORCHESTRATOR_CHECKPOINT_INTERVAL"]
+        )
+    if "ORCHESTRATOR_REFLECT_INTERVAL" in os.environ:
+        cfg["orchestrator"]["reflect_interval"] = float(
+            os.environ["ORCHESTRATOR_REFLECT_INTERVAL"]
+        )
+    if "ORCHESTRATOR_AUDIT_EVERY" in os.environ:
+        cfg["orchestrator"]["audit_every"] = int(os.environ["ORCHESTRATOR_AUDIT_EVERY"])
+    if "ORCHESTRATOR_AUDIT_INTERVAL" in os.environ:
+        cfg["orchestrator"]["audit_interval"] = float(
+            os.environ["ORCHESTRATOR_AUDIT_INTERVAL"]
+        )
+    if "ORCHESTRATOR_PROFILE_THRESHOLD" in os.environ:
+        value = os.environ["ORCHESTRATOR_PROFILE_THRESHOLD"]
+        cfg["orchestrator"]["profile_threshold"] = float(value) if value else None
+    if "ORCHESTRATOR_PROFILE_DIR" in os.environ:
+        cfg["orchestrator"]["profile_dir"] = os.environ["ORCHESTRATOR_PROFILE_DIR"]
+    if "ORCHESTRATOR_PROFILE_SAMPLE_RATE" in os.environ:
+        cfg["orchestrator"]["profile_sample_rate"] = float(
+            os.environ["ORCHESTRATOR_PROFILE_SAMPLE_RATE"]
+        )
+    if "ORCHESTRATOR_EXECUTOR" in os.environ:
+        cfg["orchestrator"]["executor"] = os.environ["ORCHESTRATOR_EXECUTOR"]
+    if "ORCHESTRATOR_BROKER_TOKEN" in os.environ:
+        cfg["orchestrator"]["broker_token"] = os.environ["ORCHESTRATOR_BROKER_TOKEN"]
+    if "ORCHESTRATOR_BROKER_BATCH_SIZE" in os.environ:
+        cfg["orchestrator"]["broker_batch_size"] = int(
+            os.environ["ORCHESTRATOR_BROKER_BATCH_SIZE"]
+        )
+    if "ORCHESTRATOR_BROKER_TASK_TIMEOUT" in os.environ:
+        value = os.environ["ORCHESTRATOR_BROKER_TASK_TIMEOUT"]
+        cfg["orchestrator"]["broker_task_timeout"] = float(value) if value else None
+    if "AUDIT_CACHE_FILE" in os.environ:
+        cfg["auditor"]["cache_file"] = os.environ["AUDIT_CACHE_FILE"] or None
+    if "COST_MODEL_ENABLED" in os.environ:
+        cfg["cost_model"]["enabled"] = os.environ["COST_MODEL_ENABLED"].lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+    if "COST_MODEL_PATH" in os.environ:
+        cfg["cost_model"]["path"] = os.environ["COST_MODEL_PATH"]
+    if "COST_MODEL_WINDOW" in os.environ:
+        cfg["cost_model"]["window"] = int(os.environ["COST_MODEL_WINDOW"])
+    if "TASK_STORE_BACKEND" in os.environ:
+        cfg["task_store"]["backend"] = os.environ["TASK_STORE_BACKEND"]
+    if "TASK_STORE_PATH" in os.environ:
+        cfg["task_store"]["path"] = os.environ["TASK_STORE_PATH"]
+    if "STORAGE_FSYNC" in os.environ:
+        cfg["storage"]["fsync"] = os.environ["STORAGE_FSYNC"]
+    if "STORAGE_GROUP_COMMIT_INTERVAL" in os.environ:
+        cfg["storage"]["group_commit_interval"] = float(
+            os.environ["STORAGE_GROUP_COMMIT_INTERVAL"]
+        )
+    if "MEMORY_SNAPSHOT" in os.environ:
+        cfg["memory"]["snapshot"] = os.environ["MEMORY_SNAPSHOT"].lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+    if "MEMORY_SNAPSHOT_CODEC" in os.environ:
+        cfg["memory"]["snapshot_codec"] = os.environ["MEMORY_SNAPSHOT_CODEC"]
     if "PLANNER_BUDGET" in os.environ:
         cfg["planner"]["budget"] = int(os.environ["PLANNER_BUDGET"])
+    if "PLANNER_MODE" in os.environ:
+        cfg["planner"]["mode"] = os.environ["PLANNER_MODE"]
+    if "PLANNER_CRITICAL_PATH_WEIGHT" in os.environ:
+        cfg["planner"]["critical_path_weight"] = float(
+            os.environ["PLANNER_CRITICAL_PATH_WEIGHT"]
+        )
+    if "PLANNER_INCREMENTAL" in os.environ:
+        cfg["planner"]["incremental"] = os.environ["PLANNER_INCREMENTAL"].lower() in {
+            "1",
+            "true",
+            "yes",
+        }
 
     if "API_KEY" in os.environ:
         sec["api_key"] = os.environ["API_KEY"]
@@ -158,6 +343,17 @@ def load_config(path: str | Path | None = None) -> dict:
     if env_name and env_name in os.environ:
         cfg["mcp"]["port"] = int(os.environ[env_name])
 
+    if "RESULT_CACHE_ENABLED" in os.environ:
+        cfg["cache"]["enabled"] = os.environ["RESULT_CACHE_ENABLED"].lower() in {
+            "1",
+            "true",
+            "yes",
+        }
+    if "RESULT_CACHE_PATH" in os.environ:
+        cfg["cache"]["path"] = os.environ["RESULT_CACHE_PATH"]
+    if "RESULT_CACHE_MAX_BYTES" in os.environ:
+        cfg["cache"]["max_bytes"] = int(os.environ["RESULT_CACHE_MAX_BYTES"])
+
     if "LOG_CONFIG" in os.environ:
         cfg["logging"]["config_file"] = os.environ["LOG_CONFIG"]
     if "LOG_LEVEL" in os.environ:
@@ -0,0 +1,162 @@
+"""Expected task runtimes learned from recorded executions.
+
+``Task.cost`` is maintained by hand, so the planner budget counts tasks
+rather than the time they take. :class:`DurationCostModel` learns the
+expected runtime of tasks online from the durations the
+:class:`~core.executor.Executor` measures. Durations are grouped by:
+
+* command family: the executable plus, for Python, the module or script it
+  runs (``python -m pytest``, ``python scripts/build.py``),
+* the task's ``component``,
+* all recorded executions.
+
+An estimate uses the most specific group with history. Each group keeps a
+sample count and a running mean that turns into an exponentially weighted
+mean after ``window`` samples, so estimates follow commands that get slower
+or faster. The statistics are persisted as a small JSON document.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shlex
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .atomic_write import atomic_write
+
+logger = logging.getLogger(__name__)
+
+_PYTHON = {"python", "python3"}
+_ALL = "*"
+
+
+class DurationCostModel:
+    """Online estimator of task runtimes in seconds.
+
+    Statistics are written to ``path`` after every ``save_every`` recorded
+    executions and by :meth:`flush`. Without a ``path`` the model only lives
+    in memory. ``revision`` grows with every recorded execution, so callers
+    that cache derived values can tell when the estimates changed.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str | Path | None = ".cost_model.json",
+        window: int = 20,
+        save_every: int = 10,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.window = max(1, int(window))
+        self.save_every = max(1, int(save_every))
+        self.stats: Dict[str, List[float]] = {}
+        self.revision = 0
+        self._unsaved = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def family(task: object) -> Optional[str]:
+        """Return the command family of ``task`` or ``None`` without a command."""
+        command = getattr(task, "command", None)
+        if not command:
+            return None
+        try:
+            parts = shlex.split(command)
+        except ValueError:
+            parts = command.split()
+        if not parts:
+            return None
+        exe = os.path.basename(parts[0])
+        if exe in _PYTHON and len(parts) > 1:
+            if parts[1] == "-m" and len(parts) > 2:
+                return f"{exe} -m {parts[2]}"
+            if not parts[1].startswith("-"):
+                return f"{exe} {parts[1]}"
+        return exe
+
+    # ------------------------------------------------------------------
+    def _keys(self, task: object) -> List[str]:
+        keys = []
+        family = self.family(task)
+        if family:
+            keys.append(f"command:{family}")
+        component = getattr(task, "component", None)
+        if component:
+            keys.append(f"component:{component}")
+        keys.append(_ALL)
+        return keys
+
+    # ------------------------------------------------------------------
+    def record(self, task: object, seconds: float) -> None:
+        """Add an execution of ``task`` that took ``seconds``."""
+        with self._lock:
+            for key in self._keys(task):
+                count, mean = self.stats.get(key, (0, 0.0))
+                count += 1
+                mean += (seconds - mean) / min(count, self.window)
+                self.stats[key] = [count, mean]
+            self.revision += 1
+            self._unsaved += 1
+            due = self._unsaved >= self.save_every
+        if due:
+            self.flush()
+
+    # ------------------------------------------------------------------
+    def estimate(self, task: object) -> Optional[float]:
+        """Return the expected runtime of ``task`` or ``None`` without history."""
+        with self._lock:
+            for key in self._keys(task):
+                if key in self.stats:
+                    return self.stats[key][1]
+        return None
+
+    # ------------------------------------------------------------------
+    def cost(self, task: object) -> float:
+        """Return the expected runtime, falling back to ``task.cost``."""
+        estimate = self.estimate(task)
+        return estimate if estimate is not None else getattr(task, "cost", 1)
+
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable cost model %s: %s", self.path, exc)
+            return
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self.stats = {k: list(v) for k, v in data.get("stats", {}).items()}
+
+    # ------------------------------------------------------------------
+    def flush(self) -> None:
+        """Persist the statistics if anything changed since the last save."""
+        with self._lock:
+            if not self.path or not self._unsaved:
+                return
+            try:
+                atomic_write(
+                    self.path,
+                    json.dumps({"version": self.VERSION, "stats": self.stats}),
+                )
+            except OSError as exc:  # pragma: no cover - IO issues
+                logger.warning("Could not write cost model %s: %s", self.path, exc)
+                return
+            self._unsaved = 0
+
+
+def cost_model_from_config(cfg: dict) -> Optional[DurationCostModel]:
+    """Return a :class:`DurationCostModel` if ``cost_model.enabled`` is set."""
+    model_cfg = cfg.get("cost_model", {})
+    if not model_cfg.get("enabled"):
+        return None
+    return DurationCostModel(
+        model_cfg.get("path"), window=int(model_cfg.get("window", 20))
+    )
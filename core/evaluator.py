@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Any, Dict, List
 import yaml
 
+from .atomic_write import atomic_open
+
 
 class Evaluator:
     """Provide lightweight scoring and reflection for tasks and patches."""
@@ -54,7 +56,7 @@ class Evaluator:
         data = self._load_critiques()
         for k, v in critiques.items():
             data[str(k)] = v
-        with self.log_path.open("w") as fh:
+        with atomic_open(self.log_path) as fh:
             yaml.safe_dump(data, fh, sort_keys=False)
 
     # ------------------------------------------------------------------
@@ -99,5 +101,5 @@ class Evaluator:
         data = self._load_patch_scores()
         for idx, result in scores.items():
             data[str(idx)] = result
-        with self.patch_log.open("w") as fh:
+        with atomic_open(self.patch_log) as fh:
             yaml.safe_dump(data, fh, sort_keys=False)
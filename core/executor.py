@@ -9,7 +9,10 @@ import time
 from contextlib import nullcontext
 
 from .config import load_config
-from .tool_runner import ToolRunner
+from .tool_runner import ToolRunner, ToolResult
+from .python_pool import PythonPool
+from .result_cache import ResultCache, cache_from_config, cacheable
+from .cost_model import DurationCostModel
 
 try:
     from opentelemetry import metrics, trace
@@ -19,9 +22,19 @@ except Exception:  # pragma: no cover - optional dependency
 
 
 class Executor:
-    """Carry out tasks and capture their output."""
+    """Carry out tasks and capture their output.
 
-    def __init__(self, tool_runner: ToolRunner | None = None) -> None:
+    Command durations are recorded in ``cost_model`` when one is given, so
+    the planner can budget tasks by their expected runtime. Results served
+    from the result cache and timed-out runs are not recorded.
+    """
+
+    def __init__(
+        self,
+        tool_runner: ToolRunner | None = None,
+        result_cache: ResultCache | None = None,
+        cost_model: DurationCostModel | None = None,
+    ) -> None:
         self.logger = logging.getLogger(__name__)
         if metrics:
             meter = metrics.get_meter_provider().get_meter(__name__)
@@ -38,18 +51,61 @@ class Executor:
         cfg = load_config()
         sandbox_cfg = cfg.get("sandbox", {})
         if tool_runner is None:
+            pool_size = int(sandbox_cfg.get("python_pool") or 0)
             tool_runner = ToolRunner(
                 sandbox_cfg.get("root", "sandbox"),
                 sandbox_cfg.get("allowed_commands", []),
+                timeout=sandbox_cfg.get("timeout"),
+                python_pool=PythonPool(pool_size) if pool_size else None,
             )
         self.tool_runner = tool_runner
+        self.result_cache = (
+            result_cache if result_cache is not None else cache_from_config(cfg)
+        )
+        self.cost_model = cost_model
+
+    # ------------------------------------------------------------------
+    def _cache_key(self, task: object, command: str) -> str:
+        meta = getattr(task, "metadata", None) or {}
+        return ResultCache.key(
+            command,
+            inputs=meta.get("inputs", []),
+            env=meta.get("env", []),
+            root=getattr(self.tool_runner, "sandbox_root", None),
+        )
+
+    # ------------------------------------------------------------------
+    def _run_command(self, task: object, command: str):
+        """Run ``command`` through the tool runner or serve it from cache.
+
+        Returns the result and whether it came from the cache.
+        """
+        if self.result_cache is None or not cacheable(getattr(task, "metadata", None)):
+            return self.tool_runner.run(command), False
+        key = self._cache_key(task, command)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            self.logger.info(
+                "Result cache hit for task %s", getattr(task, "id", "unknown")
+            )
+            result = ToolResult(
+                command, cached["exit_code"], cached["stdout"], cached["stderr"]
+            )
+            return result, True
+        result = self.tool_runner.run(command)
+        if result.returncode == 0 and not getattr(result, "timed_out", False):
+            self.result_cache.put(key, result.stdout, result.stderr, result.returncode)
+        return result, False
 
     def execute(self, task: object) -> None:
         """Execute ``task`` and write any command output to ``logs/``.
 
         If the task defines a ``command`` attribute, it will be executed in a
         subprocess. The combined stdout and stderr are written to a timestamped
-        log file under ``logs/``.
+        log file under ``logs/``. When a result cache is enabled, successful
+        results are reused for identical commands whose declared ``inputs``
+        files and ``env`` variables (from ``task.metadata``) are unchanged.
+        Tasks declaring neither, and without ``cacheable: true``, always run.
 
         Parameters
         ----------
@@ -77,7 +133,7 @@ class Executor:
             else nullcontext()
         )
         with span_ctx:
-            result = self.tool_runner.run(command)
+            result, from_cache = self._run_command(task, command)
         duration = time.perf_counter() - start_time
 
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
@@ -85,8 +141,21 @@ class Executor:
         log_dir.mkdir(exist_ok=True)
         log_file = log_dir / f"task-{getattr(task, 'id', 'unknown')}-{timestamp}.log"
         log_file.write_text(result.stdout + result.stderr)
+        if getattr(result, "timed_out", False):
+            self.logger.warning(
+                "Task %s timed out after %.1fs",
+                attrs["task.id"],
+                getattr(result, "duration", duration),
+            )
 
         if self._tasks_executed:
             self._tasks_executed.add(1, attrs)
         if self._task_duration:
             self._task_duration.record(duration, attrs)
+        # Cache hits and timeouts say nothing about how long the command takes.
+        if (
+            self.cost_model is not None
+            and not from_cache
+            and not getattr(result, "timed_out", False)
+        ):
+            self.cost_model.record(task, duration)
@@ -1,13 +1,30 @@
 """Persistent storage utility for tasks and metadata."""
 
 from pathlib import Path
+import copy
 import json
+import logging
+import threading
+import time
 import yaml
-from jsonschema import validate
+from jsonschema import Draft7Validator
+from jsonschema.exceptions import best_match
 from dataclasses import asdict
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+from .atomic_write import atomic_open
+from .near_duplicates import MinHashLSH
+from .snapshot import Snapshot, StaleSnapshotError, is_snapshot, write_snapshot
 from .task import Task
 
+logger = logging.getLogger(__name__)
+
+# libyaml parses task files roughly ten times faster than the Python loader.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Task files modified within this many nanoseconds are parsed but not cached:
+# a second write in the same timestamp tick would leave their stat unchanged.
+_RACY_NS = 2_000_000_000
+
 
 TASK_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -40,68 +57,213 @@ TASK_SCHEMA = {
     },
 }
 
+_TASKS_VALIDATOR = Draft7Validator(TASK_SCHEMA)
+_ITEM_VALIDATOR = Draft7Validator(TASK_SCHEMA["items"])
+
+
+class _TaskFileCache:
+    """Parsed and validated task files shared by all :class:`Memory` objects.
+
+    Entries are keyed by resolved path and reused while the file's
+    ``(st_mtime_ns, st_size, st_ino)`` is unchanged. Like
+    :class:`~core.observability.MetricsProvider`, files modified within the
+    last two seconds are not cached, since a second write in the same
+    timestamp tick may leave all three unchanged. ``validated`` remembers the
+    last row that passed validation for each task id, so rows that did not
+    change between two versions of a file are not validated again.
+    """
+
+    def __init__(self) -> None:
+        self.files: Dict[Path, Tuple[Tuple[int, int], List[dict]]] = {}
+        self.validated: Dict[Path, Dict[int, dict]] = {}
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.files.clear()
+            self.validated.clear()
+
+    def prune(self) -> None:
+        """Drop entries of files that no longer exist; call with ``lock`` held."""
+        for path in [
+            p for p in self.files.keys() | self.validated.keys() if not p.exists()
+        ]:
+            self.files.pop(path, None)
+            self.validated.pop(path, None)
+
+
+_task_cache = _TaskFileCache()
+
+
+def task_from_row(item: dict) -> Task:
+    """Return a :class:`Task` for a task file row; unknown keys go to ``metadata``."""
+    fields = Task.__dataclass_fields__
+    base = {k: v for k, v in item.items() if k in fields}
+    extra = {k: v for k, v in item.items() if k not in fields}
+    if extra:
+        meta = base.get("metadata", {}) or {}
+        meta.update(extra)
+        base["metadata"] = meta
+    return Task(**base)
+
+
+def task_to_row(task: Task) -> dict:
+    """Return the task file row for ``task``, flattening ``metadata``."""
+    t_dict = asdict(task)
+    data = {k: v for k, v in t_dict.items() if k != "metadata" and v is not None}
+    if t_dict.get("metadata"):
+        data.update(t_dict["metadata"])
+    return data
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _validate_tasks(rows: Any, validated: Dict[int, dict]) -> None:
+    """Validate ``rows`` against :data:`TASK_SCHEMA`, skipping known rows.
+
+    ``validated`` maps task ids to rows that already passed and is updated
+    with the rows checked by this call.
+    """
+    if not isinstance(rows, list):
+        _TASKS_VALIDATOR.validate(rows)
+    for index, row in enumerate(rows):
+        task_id = row.get("id") if isinstance(row, dict) else None
+        if isinstance(task_id, int) and validated.get(task_id) == row:
+            continue
+        error = best_match(_ITEM_VALIDATOR.iter_errors(row))
+        if error is not None:
+            error.path.appendleft(index)
+            raise error
+        if isinstance(task_id, int):
+            validated[task_id] = copy.deepcopy(row)
+
+
+def load_task_file(tasks_file: str | Path) -> List[Task]:
+    """Return list of :class:`Task` from a YAML file or an empty list.
+
+    Parsed files are cached until their modification time, size or inode
+    changes. Every call returns new :class:`Task` objects, so callers may
+    modify them freely.
+    """
+    path = Path(tasks_file).resolve()
+    now = time.time_ns()
+    key = _stat_key(path)
+    with _task_cache.lock:
+        if key is None:
+            _task_cache.files.pop(path, None)
+            _task_cache.validated.pop(path, None)
+            return []
+        cached = _task_cache.files.get(path)
+        if cached is None or cached[0] != key:
+            with path.open("r") as fh:
+                tasks_data = yaml.load(fh, Loader=_YAML_LOADER) or []
+            _validate_tasks(tasks_data, _task_cache.validated.setdefault(path, {}))
+            cached = (key, tasks_data)
+            if now - key[0] > _RACY_NS:
+                _task_cache.files[path] = cached
+            else:
+                _task_cache.files.pop(path, None)
+        tasks_data = copy.deepcopy(cached[1])
+    return [task_from_row(item) for item in tasks_data]
+
+
+def save_task_file(tasks: List[Task], tasks_file: str | Path) -> None:
+    """Atomically write list of :class:`Task` to ``tasks_file`` in YAML format."""
+    tasks_data = [task_to_row(t) for t in tasks]
+    path = Path(tasks_file).resolve()
+    with _task_cache.lock:
+        _validate_tasks(tasks_data, _task_cache.validated.setdefault(path, {}))
+        with atomic_open(path) as fh:
+            yaml.safe_dump(tasks_data, fh, sort_keys=False)
+        # A file this recent is never cached; temporary files written
+        # here and renamed away are forgotten.
+        _task_cache.files.pop(path, None)
+        _task_cache.prune()
+
 
 class Memory:
     """Persist simple JSON state to disk."""
 
-    def __init__(self, path: Path):
+    def __init__(
+        self, path: Path, snapshot: bool = False, snapshot_codec: str = "json"
+    ):
         """Initialize the memory store.
 
         Parameters
         ----------
         path:
             File location for the JSON state.
+        snapshot:
+            Save state in the binary format of :mod:`core.snapshot` instead
+            of JSON. Either format is read regardless of this setting.
+        snapshot_codec:
+            Section codec of saved snapshots, ``"json"`` or ``"marshal"``.
         """
         self.path = Path(path)
+        self.snapshot = snapshot
+        self.snapshot_codec = snapshot_codec
 
     def load(self):
         """Load and return persisted state or an empty dict."""
         if not self.path.exists():
             return {}
+        if is_snapshot(self.path):
+            snap = self._open_snapshot()
+            if snap is None:
+                return {}
+            with snap:
+                return snap.value()
         with self.path.open("r") as fh:
             return json.load(fh)
 
+    def load_section(self, key: str, default=None):
+        """Return one top-level entry of the state, or ``default``.
+
+        Snapshots only decode the requested section; JSON state is loaded in
+        full.
+        """
+        if is_snapshot(self.path):
+            snap = self._open_snapshot()
+            if snap is None:
+                return default
+            with snap:
+                return snap[key] if key in snap and not snap.root_value else default
+        state = self.load()
+        return state.get(key, default) if isinstance(state, dict) else default
+
+    def _open_snapshot(self) -> Optional[Snapshot]:
+        """Open the state snapshot, or return ``None`` if it is stale."""
+        try:
+            return Snapshot(self.path)
+        except StaleSnapshotError as exc:
+            logger.warning("Ignoring state snapshot: %s", exc)
+            return None
+
     def save(self, data):
-        """Persist ``data`` to disk as JSON."""
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w") as fh:
+        """Persist ``data`` to disk as JSON or as a snapshot."""
+        if self.snapshot:
+            write_snapshot(self.path, data, codec=self.snapshot_codec)
+            return
+        with atomic_open(self.path) as fh:
             json.dump(data, fh)
 
     # New helper methods for YAML task files
     def load_tasks(self, tasks_file: str) -> List[Task]:
-        """Return list of :class:`Task` from a YAML file or an empty list."""
-        path = Path(tasks_file)
-        if not path.exists():
-            return []
-        with path.open("r") as fh:
-            tasks_data = yaml.safe_load(fh) or []
-        validate(instance=tasks_data, schema=TASK_SCHEMA)
-        fields = set(Task.__dataclass_fields__.keys())
-        tasks = []
-        for item in tasks_data:
-            base = {k: v for k, v in item.items() if k in fields}
-            extra = {k: v for k, v in item.items() if k not in fields}
-            if extra:
-                meta = base.get("metadata", {}) or {}
-                meta.update(extra)
-                base["metadata"] = meta
-            tasks.append(Task(**base))
-        return tasks
+        """Return list of :class:`Task` from a YAML file or an empty list.
+
+        See :func:`load_task_file`.
+        """
+        return load_task_file(tasks_file)
 
     def save_tasks(self, tasks: List[Task], tasks_file: str) -> None:
         """Write list of :class:`Task` to ``tasks_file`` in YAML format."""
-        fields = set(Task.__dataclass_fields__.keys())
-        tasks_data = []
-        for t in tasks:
-            t_dict = asdict(t)
-            data = {k: v for k, v in t_dict.items() if k in fields and k != "metadata" and v is not None}
-            if t_dict.get("metadata"):
-                data.update(t_dict["metadata"])
-            tasks_data.append(data)
-        validate(instance=tasks_data, schema=TASK_SCHEMA)
-        path = Path(tasks_file)
-        with path.open("w") as fh:
-            yaml.safe_dump(tasks_data, fh, sort_keys=False)
+        save_task_file(tasks, tasks_file)
 
     def load_critiques(self, file: str) -> dict:
         """Return critique data from YAML or an empty dict."""
@@ -113,9 +275,7 @@ class Memory:
 
     def save_critiques(self, data: dict, file: str) -> None:
         """Write critique data to ``file``."""
-        path = Path(file)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w") as fh:
+        with atomic_open(file) as fh:
             yaml.safe_dump(data, fh, sort_keys=False)
 
     def reconcile_tasks(
@@ -123,6 +283,8 @@ class Memory:
         existing: List[Task],
         incoming: List[Task],
         critique_map: dict,
+        near_duplicate_threshold: Optional[float] = None,
+        lsh_options: Optional[dict] = None,
     ) -> List[Task]:
         """Merge tasks while removing duplicates.
 
@@ -130,6 +292,12 @@ class Memory:
         duplicates. If both versions exist, the variant with the higher critique
         score is kept. Missing fields from the lower scored task are merged into
         the retained one.
+
+        With ``near_duplicate_threshold`` set, tasks whose descriptions have at
+        least that Jaccard similarity are merged as well. Candidates come from a
+        :class:`~core.near_duplicates.MinHashLSH` index built with
+        ``lsh_options``. Dependencies on a task merged away this way are
+        pointed at the task that absorbed it.
         """
 
         def merge(base: Task, other: Task) -> Task:
@@ -204,4 +372,33 @@ class Memory:
         for task in incoming:
             add_task(task, "new")
 
-        return [t for t, _ in selected.values()]
+        if near_duplicate_threshold is None:
+            return [t for t, _ in selected.values()]
+
+        index = MinHashLSH(near_duplicate_threshold, **(lsh_options or {}))
+        kept: List[list] = []
+        replaced: dict[int, int] = {}
+        for task, score in selected.values():
+            match = index.query_or_add(len(kept), task.description)
+            if match is None:
+                kept.append([task, score])
+                continue
+            entry = kept[match[0]]
+            if score >= entry[1]:
+                replaced[entry[0].id] = task.id
+                entry[0], entry[1] = merge(task, entry[0]), score
+            else:
+                replaced[task.id] = entry[0].id
+                merge(entry[0], task)
+
+        def resolve(task_id: int) -> int:
+            while task_id in replaced:
+                task_id = replaced[task_id]
+            return task_id
+
+        result = [t for t, _ in kept]
+        if replaced:
+            for task in result:
+                deps = {resolve(d) for d in task.dependencies} - {task.id}
+                task.dependencies = sorted(deps)
+        return result
@@ -0,0 +1,188 @@
+"""MinHash/LSH index for finding reworded duplicate tasks.
+
+Reflection keeps proposing tasks that differ from existing ones only in
+wording. Comparing every pair of descriptions is quadratic, so
+:class:`MinHashLSH` generates candidates with locality-sensitive hashing:
+
+* a text becomes a set of character shingles, hashed to integers,
+* a MinHash signature of ``num_perm`` slots is computed with one-permutation
+  hashing: each shingle is hashed once and only updates the minimum of
+  the slot it falls into. Empty slots borrow from the next filled slot,
+  which keeps the cost linear in the number of shingles,
+* the signature is split into ``bands`` bands of equal width. Two texts
+  become candidates when any band matches exactly.
+
+Candidates are confirmed with the exact Jaccard similarity of their shingle
+sets, so LSH only affects which duplicates are found, never whether an
+unrelated text is reported. Adding and querying a text costs time linear in
+its length plus the size of the buckets it lands in.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+_MASK64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+_SPACE = re.compile(r"\s+")
+
+
+def choose_bands(num_perm: int, threshold: float) -> int:
+    """Return the band count whose LSH threshold is closest below ``threshold``.
+
+    With ``b`` bands of ``r`` rows, texts with similarity ``s`` become
+    candidates with probability ``1 - (1 - s**r)**b``, which rises steeply
+    around ``(1/b)**(1/r)``. Staying below ``threshold`` favours recall; the
+    exact check removes the extra candidates.
+    """
+    best_bands, best_point = num_perm, 0.0
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        point = (1 / bands) ** (1 / rows)
+        if point <= threshold and point > best_point:
+            best_bands, best_point = bands, point
+    return best_bands
+
+
+class MinHashLSH:
+    """Index of texts answering "which indexed text is most similar?".
+
+    Parameters
+    ----------
+    threshold:
+        Minimum Jaccard similarity of shingle sets for a match.
+    num_perm:
+        Number of MinHash slots per signature.
+    bands:
+        Number of LSH bands; chosen from ``threshold`` when omitted.
+    shingle_size:
+        Length of the character shingles.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: Optional[int] = None,
+        shingle_size: int = 5,
+    ) -> None:
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = int(num_perm)
+        self.bands = int(bands) if bands else choose_bands(self.num_perm, threshold)
+        self.rows = max(1, self.num_perm // self.bands)
+        self.shingle_size = int(shingle_size)
+        self._shingles: Dict[Hashable, FrozenSet[int]] = {}
+        self._buckets: Dict[Tuple, List[Hashable]] = defaultdict(list)
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    # ------------------------------------------------------------------
+    def shingles(self, text: str) -> FrozenSet[int]:
+        """Return the hashed character shingles of normalised ``text``."""
+        norm = _SPACE.sub(" ", text.lower()).strip().encode()
+        k = self.shingle_size
+        if len(norm) <= k:
+            return frozenset([zlib.crc32(norm)])
+        return frozenset(zlib.crc32(norm[i : i + k]) for i in range(len(norm) - k + 1))
+
+    # ------------------------------------------------------------------
+    def signature(self, shingles: FrozenSet[int]) -> List[int]:
+        """Return the one-permutation MinHash signature of ``shingles``."""
+        n = self.num_perm
+        slots: Dict[int, int] = {}
+        # Visiting hashes in descending order leaves each slot's minimum.
+        for h in sorted(((s * _MIX + 1) & _MASK64 for s in shingles), reverse=True):
+            slots[h % n] = h
+        if not slots:
+            return [0] * n
+        # Densify: an empty slot takes the value of the next filled slot,
+        # offset by the distance so that borrowed values stay distinct.
+        result = [0] * n
+        nxt = min(slots) + n
+        for i in range(n - 1, -1, -1):
+            value = slots.get(i)
+            if value is not None:
+                nxt = i
+                result[i] = value
+            else:
+                result[i] = (slots[nxt % n] + (nxt - i) * _MIX) & _MASK64
+        return result
+
+    # ------------------------------------------------------------------
+    def _band_keys(self, signature: List[int]) -> List[Tuple]:
+        r = self.rows
+        return [(b, tuple(signature[b * r : (b + 1) * r])) for b in range(self.bands)]
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+        if not a and not b:
+            return 1.0
+        common = len(a & b)
+        return common / (len(a) + len(b) - common)
+
+    # ------------------------------------------------------------------
+    def add(self, key: Hashable, text: str) -> None:
+        """Index ``text`` under ``key``."""
+        shingles = self.shingles(text)
+        self._insert(key, shingles, self._band_keys(self.signature(shingles)))
+
+    # ------------------------------------------------------------------
+    def query(self, text: str) -> Optional[Tuple[Hashable, float]]:
+        """Return ``(key, similarity)`` of the most similar indexed text.
+
+        Only texts at or above ``threshold`` are considered; ``None`` is
+        returned when there is none.
+        """
+        shingles = self.shingles(text)
+        return self._best(shingles, self._band_keys(self.signature(shingles)))
+
+    # ------------------------------------------------------------------
+    def query_or_add(
+        self, key: Hashable, text: str
+    ) -> Optional[Tuple[Hashable, float]]:
+        """Return the best match for ``text`` like :meth:`query`.
+
+        Without a match ``text`` is indexed under ``key`` and ``None`` is
+        returned. This hashes ``text`` once instead of twice.
+        """
+        shingles = self.shingles(text)
+        bands = self._band_keys(self.signature(shingles))
+        match = self._best(shingles, bands)
+        if match is None:
+            self._insert(key, shingles, bands)
+        return match
+
+    # ------------------------------------------------------------------
+    def _insert(
+        self, key: Hashable, shingles: FrozenSet[int], bands: List[Tuple]
+    ) -> None:
+        self._shingles[key] = shingles
+        for band in bands:
+            self._buckets[band].append(key)
+
+    # ------------------------------------------------------------------
+    def _best(
+        self, shingles: FrozenSet[int], bands: List[Tuple]
+    ) -> Optional[Tuple[Hashable, float]]:
+        candidates = set()
+        for band in bands:
+            candidates.update(self._buckets.get(band, ()))
+        best: Optional[Tuple[Hashable, float]] = None
+        size = len(shingles)
+        for key in candidates:
+            other = self._shingles[key]
+            # Jaccard similarity is at most the ratio of the set sizes.
+            if min(size, len(other)) < self.threshold * max(size, len(other)):
+                continue
+            similarity = self.jaccard(shingles, other)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
@@ -1,30 +1,56 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from .log_utils import configure_logging
 
+# Filesystem timestamps can be coarser than the time between two writes. A
+# file modified this recently may change again without its mtime moving, so
+# its cached parse is not reused.
+_RACY_NS = 2_000_000_000
+
 
 class MetricsProvider:
-    """Simple provider for observability metrics."""
+    """Simple provider for observability metrics.
+
+    The parsed metrics file is cached and reused while its modification
+    time, size and inode are unchanged. ``reads`` counts the parses.
+    """
 
     def __init__(self, metrics_path: Optional[Path] = None) -> None:
         configure_logging()
         self.metrics_path = Path(metrics_path or "metrics.json")
         self.logger = logging.getLogger(__name__)
+        self.reads = 0
+        self._cache: Optional[Tuple[Tuple[int, int, int], Dict]] = None
 
     def collect(self) -> Dict:
         """Return metrics from ``metrics_path`` if available."""
-        if not self.metrics_path.exists():
+        now = time.time_ns()
+        try:
+            st = self.metrics_path.stat()
+        except FileNotFoundError:
             self.logger.info("Metrics file %s not found", self.metrics_path)
+            self._cache = None
             return {}
+        except OSError as exc:  # pragma: no cover - IO issues
+            self.logger.warning("Failed to read metrics: %s", exc)
+            return {}
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if self._cache is not None and self._cache[0] == key:
+            return copy.deepcopy(self._cache[1])
         try:
             with self.metrics_path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+                metrics = json.load(f)
         except Exception as exc:  # pragma: no cover - IO issues
             self.logger.warning("Failed to read metrics: %s", exc)
             return {}
-
+        self.reads += 1
+        settled = now - st.st_mtime_ns > _RACY_NS
+        self._cache = (key, metrics) if settled else None
+        return copy.deepcopy(metrics) if settled else metrics
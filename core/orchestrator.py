@@ -1,29 +1,158 @@
 """High-level coordinator for planner, executor and auditor."""
 
-from typing import List, Callable, Any
+from typing import Dict, List, Callable, Any
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor as PoolExecutor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import nullcontext
 from dataclasses import asdict
+from pathlib import Path
 from .sentinel import EthicalSentinel
 try:
     from opentelemetry import metrics, trace
 except Exception:  # pragma: no cover - optional dependency
     metrics = None
     trace = None
+import cProfile
+import itertools
 import logging
+import random
 import subprocess
+import threading
+import time
 
+from .config import load_config
 from .log_utils import configure_logging
 
+from .checkpoint import RunCheckpoint
+from .pipeline import Pipeline
+from .status_journal import StatusJournal
 from .task import Task
+from .task_store import TaskStore
 
+# Executor used by tasks dispatched to a process pool, created per process.
+_PROCESS_EXECUTOR = None
+
+
+def _execute_in_process(task: Task) -> None:
+    """Run ``task`` with a default :class:`~core.executor.Executor` in a pool."""
+    global _PROCESS_EXECUTOR
+    if _PROCESS_EXECUTOR is None:
+        from .executor import Executor
+
+        _PROCESS_EXECUTOR = Executor()
+    _PROCESS_EXECUTOR.execute(task)
 
 
 class Orchestrator:
-    """Coordinate the self-improving loop of planning and execution."""
+    """Coordinate the self-improving loop of planning and execution.
+
+    With ``parallelism`` above one, up to that many ready tasks run at once
+    on a ``"thread"`` or ``"process"`` pool. Both default to the
+    ``orchestrator`` section of the configuration. Process pools execute
+    tasks with a default :class:`~core.executor.Executor` built in each pool
+    process, since executors hold state that cannot be pickled.
+
+    With ``journal`` enabled, status changes are appended to a
+    :class:`~core.status_journal.StatusJournal` next to the task file instead
+    of rewriting the whole file each time. The journal is compacted into the
+    task file periodically, on every full save and at the end of the run, and
+    replayed when tasks are loaded so that an interrupted run resumes with
+    the latest statuses. A :class:`~core.task_store.TaskStore` already
+    updates single rows, so no journal is kept for it.
+
+    The self-audit runs after every ``audit_every`` completed tasks or
+    ``audit_interval`` seconds, whichever comes first; either trigger is
+    disabled by setting it to zero. Completions not yet audited are audited
+    before the run halts, so tasks the audit adds are still executed.
+
+    With ``checkpoint`` enabled, planner budget usage, in-flight tasks, the
+    last reflection time and the audit backlog are kept in a
+    :class:`~core.checkpoint.RunCheckpoint` next to the task file. A
+    restarted run resumes from it: interrupted tasks go back to ``pending``
+    and reflection is skipped if the previous cycle finished less than
+    ``reflect_interval`` seconds ago.
+
+    With ``batch_planning`` enabled, parallel runs fill their free slots
+    with :meth:`Planner.plan_batch`, which picks the set of ready tasks with
+    the highest total priority that fits the remaining budget.
+
+    ``mode="pipeline"`` runs reflection and audits in the background while
+    ready tasks keep executing; see :mod:`core.pipeline`.
+
+    Setting ``profile_threshold`` in the configuration profiles steps with
+    :mod:`cProfile` and writes the profile of any step slower than the
+    threshold to ``profile_dir``. ``profile_sample_rate`` limits profiling
+    to a fraction of the steps to reduce its overhead.
+    """
 
-    def __init__(self, planner, executor, reflector, memory, auditor, sentinel: EthicalSentinel | None = None):
+    def __init__(
+        self,
+        planner,
+        executor,
+        reflector,
+        memory,
+        auditor,
+        sentinel: EthicalSentinel | None = None,
+        parallelism: int | None = None,
+        pool: str | None = None,
+        journal: bool | None = None,
+        mode: str | None = None,
+        checkpoint: bool | None = None,
+    ):
         """Store dependencies for later use."""
 
         configure_logging()
+        orch_cfg = load_config().get("orchestrator", {})
+        self.parallelism = max(
+            1,
+            int(
+                parallelism
+                if parallelism is not None
+                else orch_cfg.get("parallelism", 1)
+            ),
+        )
+        self.pool = pool or orch_cfg.get("pool", "thread")
+        if self.pool not in {"thread", "process"}:
+            raise ValueError(f"Unknown orchestrator pool: {self.pool}")
+        self.mode = mode or orch_cfg.get("mode", "loop")
+        if self.mode not in {"loop", "pipeline"}:
+            raise ValueError(f"Unknown orchestrator mode: {self.mode}")
+        self.batch_planning = bool(orch_cfg.get("batch_planning", False))
+        self.journal = bool(
+            journal if journal is not None else orch_cfg.get("journal", False)
+        )
+        self.journal_compact_every = int(orch_cfg.get("journal_compact_every", 100))
+        self.journal_compact_interval = float(
+            orch_cfg.get("journal_compact_interval", 5.0)
+        )
+        self._journal: StatusJournal | None = None
+        self.checkpoint = bool(
+            checkpoint if checkpoint is not None else orch_cfg.get("checkpoint", False)
+        )
+        self.checkpoint_interval = float(orch_cfg.get("checkpoint_interval", 5.0))
+        self.reflect_interval = float(orch_cfg.get("reflect_interval", 3600.0))
+        self._checkpoint: RunCheckpoint | None = None
+        self._in_flight: set = set()
+        self._last_reflection: float | None = None
+        self.resumed = False
+        self.pipeline: Pipeline | None = None
+        threshold = orch_cfg.get("profile_threshold")
+        self.profile_threshold = float(threshold) if threshold is not None else None
+        self.profile_dir = Path(orch_cfg.get("profile_dir", "profiles"))
+        self.profile_sample_rate = float(orch_cfg.get("profile_sample_rate", 1.0))
+        self.profiles: List[Path] = []
+        self._profiling = threading.local()
+        self._profile_seq = itertools.count()
+        self.audit_every = max(0, int(orch_cfg.get("audit_every", 1)))
+        self.audit_interval = float(orch_cfg.get("audit_interval", 0.0))
+        self._unaudited = 0
+        self._last_audit = time.monotonic()
         self.planner = planner
         self.executor = executor
         self.reflector = reflector
@@ -39,23 +168,104 @@ class Orchestrator:
             self._tasks_executed = meter.create_counter(
                 "tasks_executed_total", description="Number of tasks executed successfully"
             )
+            self._step_duration = meter.create_histogram(
+                "orchestrator_step_seconds",
+                unit="s",
+                description="Duration of orchestrator steps",
+            )
         else:  # pragma: no cover - telemetry optional
             self._runs = None
             self._tasks_executed = None
+            self._step_duration = None
         self._tracer = trace.get_tracer(__name__) if trace else None
 
     # ------------------------------------------------------------------
     def _run_step(self, name: str, func: Callable[..., Any], *args, **kwargs):
-        """Run a step with uniform logging and error handling."""
+        """Run a step with uniform logging, timing and error handling.
+
+        The step runs in an ``orchestrator.<name>`` span and its duration is
+        recorded in the ``orchestrator_step_seconds`` histogram, tagged with
+        the step name and whether it succeeded.
+        """
         self.logger.info("Orchestrator: Step '%s' starting.", name)
+        attrs = self._step_attributes(name, args)
+        span = (
+            self._tracer.start_as_current_span(f"orchestrator.{name}", attributes=attrs)
+            if self._tracer
+            else nullcontext()
+        )
+        profiler = self._start_profiler()
+        outcome = "error"
+        start = time.perf_counter()
         try:
-            result = func(*args, **kwargs)
+            with span:
+                result = func(*args, **kwargs)
+            outcome = "ok"
         except Exception:
             self.logger.exception("Orchestrator: Step '%s' failed.", name)
             raise
-        self.logger.info("Orchestrator: Step '%s' finished.", name)
+        finally:
+            duration = time.perf_counter() - start
+            if self._step_duration:
+                self._step_duration.record(duration, {"step": name, "outcome": outcome})
+            if profiler is not None:
+                self._stop_profiler(profiler, name, duration)
+        self.logger.info("Orchestrator: Step '%s' finished in %.3fs.", name, duration)
         return result
 
+    # ------------------------------------------------------------------
+    def _step_attributes(self, name: str, args: tuple) -> Dict[str, Any]:
+        attrs: Dict[str, Any] = {"orchestrator.step": name}
+        for arg in args:
+            if isinstance(arg, Task):
+                attrs["task.id"] = str(getattr(arg, "id", "N/A"))
+            elif isinstance(arg, list):
+                attrs["tasks.count"] = len(arg)
+            elif isinstance(arg, str):
+                attrs["tasks.file"] = arg
+        return attrs
+
+    # ------------------------------------------------------------------
+    def _start_profiler(self) -> cProfile.Profile | None:
+        """Start profiling the step unless disabled, sampled out or nested."""
+        if self.profile_threshold is None or getattr(self._profiling, "active", False):
+            return None
+        if self.profile_sample_rate < 1 and random.random() >= self.profile_sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # pragma: no cover - another profiler is active
+            return None
+        self._profiling.active = True
+        return profiler
+
+    # ------------------------------------------------------------------
+    def _stop_profiler(
+        self, profiler: cProfile.Profile, name: str, duration: float
+    ) -> None:
+        profiler.disable()
+        self._profiling.active = False
+        if duration < self.profile_threshold:
+            return
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            path = self.profile_dir / (
+                f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-"
+                f"{next(self._profile_seq)}.prof"
+            )
+            profiler.dump_stats(str(path))
+        except OSError as exc:  # pragma: no cover - IO issues
+            self.logger.warning("Writing profile for step '%s' failed: %s", name, exc)
+            return
+        self.profiles.append(path)
+        self.logger.warning(
+            "Orchestrator: Step '%s' took %.3fs; profile written to %s.",
+            name,
+            duration,
+            path,
+        )
+
     # ------------------------------------------------------------------
     def _task_to_dict(self, task: Task) -> dict:
         """Serialize a :class:`Task` to a plain dictionary including metadata."""
@@ -78,7 +288,15 @@ class Orchestrator:
         except Exception as exc:  # pragma: no cover - defensive
             self.logger.exception("Loading tasks failed: %s", exc)
             return []
-        return tasks or []
+        tasks = tasks or []
+        if self._journal is not None:
+            applied = self._journal.replay(tasks)
+            if applied:
+                self.logger.info(
+                    "Orchestrator: Replayed %d journaled status changes.", applied
+                )
+                self._save_tasks(tasks, tasks_file)
+        return tasks
 
     # ------------------------------------------------------------------
     def _items_to_tasks(self, items: list) -> List[Task]:
@@ -109,6 +327,7 @@ class Orchestrator:
             # Only handle known reflection issues
             self.logger.exception("Reflection failed: %s", exc)
             return tasks
+        self._last_reflection = time.time()
         if reflected is None:
             return tasks
         tasks = self._convert_reflection(reflected)
@@ -119,7 +338,10 @@ class Orchestrator:
     def _save_tasks(self, tasks: List[Task], tasks_file: str) -> None:
         """Persist tasks to disk."""
         try:
-            self.memory.save_tasks(tasks, tasks_file)
+            if self._journal is not None:
+                self._journal.compact(tasks)
+            else:
+                self.memory.save_tasks(tasks, tasks_file)
         except Exception as exc:  # pragma: no cover - defensive
             self.logger.exception("Saving tasks failed: %s", exc)
 
@@ -127,12 +349,105 @@ class Orchestrator:
         """Update task status if possible and persist."""
         if hasattr(task, "status"):
             task.status = status
-            self._save_tasks(tasks, tasks_file)
+            notify = getattr(self.planner, "task_updated", None)
+            if notify is not None:
+                notify(task)
+            if self._checkpoint is not None:
+                self._track_in_flight(task, status)
+            if self._journal is None:
+                if not isinstance(self.memory, TaskStore):
+                    self._save_tasks(tasks, tasks_file)
+                    return
+                try:
+                    # The SQLite store only rewrites this task's row.
+                    self.memory.update_task(task)
+                except Exception as exc:  # pragma: no cover - defensive
+                    self.logger.exception("Updating task failed: %s", exc)
+                return
+            try:
+                self._journal.record(task, tasks)
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.exception("Journaling status failed: %s", exc)
         else:
             self.logger.warning(
                 "Task '%s' has no 'status' attribute.", getattr(task, "id", "N/A")
             )
 
+    # ------------------------------------------------------------------
+    def _track_in_flight(self, task: Task, status: str) -> None:
+        """Checkpoint dispatched tasks before they start executing."""
+        task_id = getattr(task, "id", None)
+        if status == "in_progress":
+            self._in_flight.add(task_id)
+            self._save_checkpoint(force=True)
+        else:
+            self._in_flight.discard(task_id)
+            self._save_checkpoint()
+
+    # ------------------------------------------------------------------
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        cost_used = getattr(self.planner, "cost_used", 0)
+        cache_file = getattr(self.auditor, "cache_file", None)
+        return {
+            "cost_used": cost_used if isinstance(cost_used, (int, float)) else 0,
+            "warned": bool(getattr(self.planner, "_warned", False)),
+            "in_flight": list(self._in_flight),
+            "last_reflection": self._last_reflection,
+            "unaudited": self._unaudited,
+            "audit_cache": (
+                str(cache_file) if isinstance(cache_file, (str, Path)) else None
+            ),
+        }
+
+    # ------------------------------------------------------------------
+    def _save_checkpoint(self, force: bool = False) -> None:
+        if self._checkpoint is None:
+            return
+        try:
+            self._checkpoint.update(force=force, **self._checkpoint_state())
+        except OSError as exc:  # pragma: no cover - IO issues
+            self.logger.warning("Writing checkpoint failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    def _resume(self, tasks: List[Task], tasks_file: str) -> None:
+        """Restore run state from the checkpoint of a previous process."""
+        state = self._checkpoint.load()
+        if state is None:
+            return
+        if hasattr(self.planner, "cost_used"):
+            self.planner.cost_used = state.get("cost_used", 0)
+            self.planner._warned = bool(state.get("warned", False))
+        interrupted = set(state.get("in_flight") or [])
+        reset = [
+            t
+            for t in tasks
+            if getattr(t, "id", None) in interrupted
+            and getattr(t, "status", None) == "in_progress"
+        ]
+        for task in reset:
+            task.status = "pending"
+        if reset:
+            self._save_tasks(tasks, tasks_file)
+        self._last_reflection = state.get("last_reflection")
+        self._unaudited = int(state.get("unaudited", 0))
+        cache = state.get("audit_cache")
+        if cache and getattr(self.auditor, "cache_file", False) is None:
+            self.auditor.cache_file = Path(cache)
+        self.resumed = True
+        self.logger.info(
+            "Orchestrator: Resumed from checkpoint; %d interrupted tasks reset, "
+            "budget used %s.",
+            len(reset),
+            state.get("cost_used", 0),
+        )
+
+    # ------------------------------------------------------------------
+    def _reflection_due(self) -> bool:
+        """Return ``False`` if a resumed run reflected recently enough."""
+        if self._last_reflection is None:
+            return True
+        return time.time() - self._last_reflection >= self.reflect_interval
+
     def _is_blocked(self, task: Task) -> bool:
         """Return True if the Ethical Sentinel blocks this task."""
         if self.sentinel and not self.sentinel.allows(getattr(task, "id", "")):
@@ -155,6 +470,22 @@ class Orchestrator:
         tasks.extend(new_tasks)
         self._save_tasks(tasks, tasks_file)
 
+    def _audit_due(self) -> bool:
+        """Return ``True`` when completed tasks should be audited now."""
+        if not self._unaudited:
+            return False
+        if self.audit_every and self._unaudited >= self.audit_every:
+            return True
+        return (
+            bool(self.audit_interval)
+            and time.monotonic() - self._last_audit >= self.audit_interval
+        )
+
+    def _audit(self, tasks: List[Task], tasks_file: str) -> None:
+        self._unaudited = 0
+        self._last_audit = time.monotonic()
+        self._run_step("audit_and_extend", self._audit_and_extend, tasks, tasks_file)
+
     def _execute_task(self, task: Task, tasks: List[Task], tasks_file: str) -> None:
         if self._is_blocked(task):
             return
@@ -173,30 +504,197 @@ class Orchestrator:
         self.logger.info("Orchestrator: Task '%s' completed.", getattr(task, "id", "N/A"))
         if self._tasks_executed:
             self._tasks_executed.add(1)
-        self._run_step("audit_and_extend", self._audit_and_extend, tasks, tasks_file)
+        self._unaudited += 1
+        if self._audit_due():
+            self._audit(tasks, tasks_file)
 
     def run(self, tasks_file: str = "tasks.yml") -> None:
         """Run the orchestration loop."""
         attrs = {"tasks.file": tasks_file}
         with self._tracer.start_as_current_span("orchestrator.run", attributes=attrs):
-            tasks: List[Task] = self._run_step(
-                "load_tasks", self._load_tasks, tasks_file
-            )
-            tasks = self._run_step("reflect", self._reflect, tasks, tasks_file)
+            if self.journal and isinstance(self.memory, TaskStore):
+                # The SQLite store already writes one row per status change.
+                self.logger.info(
+                    "Orchestrator: Task store in use; status journal disabled."
+                )
+            elif self.journal:
+                self._journal = StatusJournal(
+                    tasks_file,
+                    self.memory,
+                    compact_every=self.journal_compact_every,
+                    compact_interval=self.journal_compact_interval,
+                )
+            if self.checkpoint:
+                self._checkpoint = RunCheckpoint(
+                    tasks_file, interval=self.checkpoint_interval
+                )
+            tasks: List[Task] = []
+            self._unaudited = 0
+            self._last_audit = time.monotonic()
+            self._in_flight = set()
+            self._last_reflection = None
+            self.resumed = False
+            try:
+                tasks = self._run_step("load_tasks", self._load_tasks, tasks_file)
+                if self._checkpoint is not None:
+                    self._run_step("resume", self._resume, tasks, tasks_file)
+                if self.mode == "pipeline":
+                    self.pipeline = Pipeline(self)
+                    self._run_step("pipeline", self.pipeline.run, tasks, tasks_file)
+                else:
+                    if self._reflection_due():
+                        tasks = self._run_step(
+                            "reflect", self._reflect, tasks, tasks_file
+                        )
+                    else:
+                        self.logger.info(
+                            "Orchestrator: Skipping reflection; last cycle is recent."
+                        )
+                    if self.parallelism > 1:
+                        self._run_parallel(tasks, tasks_file)
+                    else:
+                        self._run_sequential(tasks, tasks_file)
+            finally:
+                if self._journal is not None:
+                    if self._journal.pending:
+                        self._save_tasks(tasks, tasks_file)
+                    self._journal.close()
+                    self._journal = None
+                if self._checkpoint is not None:
+                    self._save_checkpoint(force=True)
+                    self._checkpoint = None
+            self.logger.info("Orchestrator: Run finished.")
+
+    # ------------------------------------------------------------------
+    def _run_sequential(self, tasks: List[Task], tasks_file: str) -> None:
+        """Execute planned tasks one at a time until none are actionable."""
+        while True:
+            next_task = self.planner.plan(tasks)
+            if next_task is None:
+                if self._unaudited:
+                    self._audit(tasks, tasks_file)
+                    continue
+                self.logger.info("Orchestrator: No actionable tasks. Halting.")
+                break
 
-            while True:
-                next_task = self.planner.plan(tasks)
-                if next_task is None:
-                    self.logger.info("Orchestrator: No actionable tasks. Halting.")
-                    break
+            self.logger.info(
+                "Orchestrator: Task '%s' selected for execution.",
+                getattr(next_task, "id", "N/A"),
+            )
+            self._run_step(
+                "execute_task", self._execute_task, next_task, tasks, tasks_file
+            )
+            self._runs.add(1)
 
+    # ------------------------------------------------------------------
+    def _plan_ready(self, candidates: List[Task], slots: int) -> List[Task]:
+        """Plan up to ``slots`` tasks to start now."""
+        if self.batch_planning and hasattr(self.planner, "plan_batch"):
+            batch = self.planner.plan_batch(candidates, slots)
+            if batch.tasks:
                 self.logger.info(
-                    "Orchestrator: Task '%s' selected for execution.",
-                    getattr(next_task, "id", "N/A"),
+                    "Orchestrator: Planned %d tasks; budget left unused: %s.",
+                    len(batch.tasks),
+                    "unlimited" if batch.unused_budget is None else batch.unused_budget,
                 )
-                self._run_step(
-                    "execute_task", self._execute_task, next_task, tasks, tasks_file
-                )
-                self._runs.add(1)
+            return batch.tasks
+        next_task = self.planner.plan(candidates)
+        return [next_task] if next_task is not None else []
 
-            self.logger.info("Orchestrator: Run finished.")
+    # ------------------------------------------------------------------
+    def _make_pool(self) -> PoolExecutor:
+        if self.pool == "process":
+            return ProcessPoolExecutor(max_workers=self.parallelism)
+        return ThreadPoolExecutor(
+            max_workers=self.parallelism, thread_name_prefix="orchestrator"
+        )
+
+    # ------------------------------------------------------------------
+    def _submit(self, pool: PoolExecutor, task: Task) -> Future:
+        if self.pool == "process":
+            return pool.submit(_execute_in_process, task)
+        return pool.submit(self.executor.execute, task)
+
+    # ------------------------------------------------------------------
+    def _finish_task(
+        self, task: Task, future: Future, tasks: List[Task], tasks_file: str
+    ) -> bool:
+        """Apply the outcome of ``future`` to ``task``; return ``True`` on success."""
+        exc = future.exception()
+        if exc is None:
+            self._set_status(task, "done", tasks, tasks_file)
+            self.logger.info(
+                "Orchestrator: Task '%s' completed.", getattr(task, "id", "N/A")
+            )
+            if self._tasks_executed:
+                self._tasks_executed.add(1)
+            return True
+        if isinstance(exc, (RuntimeError, OSError, subprocess.SubprocessError)):
+            self.logger.error(
+                "Execution failed for task %s: %s",
+                getattr(task, "id", "N/A"),
+                exc,
+                exc_info=exc,
+            )
+            self._set_status(task, "pending", tasks, tasks_file)
+            return False
+        raise exc
+
+    # ------------------------------------------------------------------
+    def _run_parallel(self, tasks: List[Task], tasks_file: str) -> None:
+        """Execute ready tasks concurrently until the planner has nothing left.
+
+        Tasks are planned one at a time, so dependency checks and the planner
+        budget apply exactly as in sequential runs, unless ``batch_planning``
+        fills all free slots with one :meth:`Planner.plan_batch` call. Status
+        changes are saved as each task finishes. The audit runs at most once
+        per batch of completions.
+        """
+        running: Dict[Future, Task] = {}
+        blocked: set[int] = set()
+        with self._make_pool() as pool:
+            try:
+                while True:
+                    while len(running) < self.parallelism:
+                        candidates = (
+                            [t for t in tasks if id(t) not in blocked]
+                            if blocked
+                            else tasks
+                        )
+                        planned = self._plan_ready(
+                            candidates, self.parallelism - len(running)
+                        )
+                        if not planned:
+                            break
+                        for next_task in planned:
+                            if self._is_blocked(next_task):
+                                blocked.add(id(next_task))
+                                continue
+                            self._set_status(
+                                next_task, "in_progress", tasks, tasks_file
+                            )
+                            self.logger.info(
+                                "Orchestrator: Executing task '%s'.",
+                                getattr(next_task, "id", "N/A"),
+                            )
+                            running[self._submit(pool, next_task)] = next_task
+                    if not running:
+                        if self._unaudited:
+                            self._audit(tasks, tasks_file)
+                            continue
+                        self.logger.info("Orchestrator: No actionable tasks. Halting.")
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if self._finish_task(
+                            running.pop(future), future, tasks, tasks_file
+                        ):
+                            self._unaudited += 1
+                        if self._runs:
+                            self._runs.add(1)
+                    if self._audit_due():
+                        self._audit(tasks, tasks_file)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
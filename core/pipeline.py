@@ -0,0 +1,346 @@
+"""Event-driven orchestrator mode overlapping reflection, execution and audits.
+
+:class:`Pipeline` runs the stages of an :class:`~core.orchestrator.Orchestrator`
+as asyncio workers connected by queues:
+
+``reflect``
+    Runs :meth:`Reflector.run_cycle` once on a snapshot of the task list in
+    a background thread, without letting it save. Execution starts
+    immediately instead of waiting for it.
+``execute``
+    ``parallelism`` workers take planned tasks from the execute queue and
+    run them on the orchestrator's thread or process pool.
+``audit``
+    Audits a snapshot of the task list in a background thread whenever the
+    orchestrator's audit cadence is due. At most one audit runs at a time;
+    completions finishing meanwhile are covered by the next one.
+``merge``
+    Every stage reports back through the merge queue, and a single
+    coordinator applies the results. Only the coordinator touches the task
+    list, so planning, status changes and saves never race with the
+    background stages.
+
+Reflection and audits only ever add tasks. Tasks already in the list are
+owned by the executor, so a producer cannot override the status of a task
+that finished while it was working on an older snapshot. New tasks whose id
+was taken in the meantime, for example by the other producer, are renumbered
+together with dependencies on them.
+
+Stage durations are exported as the ``orchestrator_stage_seconds``
+histogram and the work waiting for each stage as the
+``orchestrator_stage_queue_depth`` up/down counter, both tagged with
+``stage``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor as PoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+try:
+    from opentelemetry import metrics
+except Exception:  # pragma: no cover - optional dependency
+    metrics = None
+
+from .task import Task
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .orchestrator import Orchestrator
+
+STAGES = {
+    "reflect": "Time spent in a background reflection cycle",
+    "execute": "Time a task spent executing on the pool",
+    "audit": "Time spent in a background self-audit",
+    "merge": "Time spent applying a stage result to the task list",
+}
+
+
+class StageMetrics:
+    """Per-stage durations and queue depths of a pipeline run."""
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.depth: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.max_depth: Dict[str, int] = {stage: 0 for stage in STAGES}
+        if metrics:
+            meter = metrics.get_meter_provider().get_meter(__name__)
+            self._duration = meter.create_histogram(
+                "orchestrator_stage_seconds",
+                unit="s",
+                description="Duration of orchestrator pipeline stages",
+            )
+            self._depth = meter.create_up_down_counter(
+                "orchestrator_stage_queue_depth",
+                description="Work items waiting for an orchestrator pipeline stage",
+            )
+        else:  # pragma: no cover - telemetry optional
+            self._duration = None
+            self._depth = None
+
+    # ------------------------------------------------------------------
+    def record(self, stage: str, seconds: float) -> None:
+        self.durations[stage].append(seconds)
+        if self._duration is not None:
+            self._duration.record(seconds, {"stage": stage})
+
+    # ------------------------------------------------------------------
+    def adjust(self, stage: str, delta: int) -> None:
+        if not delta:
+            return
+        self.depth[stage] += delta
+        self.max_depth[stage] = max(self.max_depth[stage], self.depth[stage])
+        if self._depth is not None:
+            self._depth.add(delta, {"stage": stage})
+
+    # ------------------------------------------------------------------
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, total and maximum duration and peak depth per stage."""
+        return {
+            stage: {
+                "count": len(values),
+                "total": sum(values),
+                "max": max(values, default=0.0),
+                "max_depth": self.max_depth[stage],
+            }
+            for stage, values in self.durations.items()
+        }
+
+
+class Pipeline:
+    """Run ``orchestrator`` with reflection and audits in the background."""
+
+    def __init__(self, orchestrator: "Orchestrator") -> None:
+        self.orch = orchestrator
+        self.logger = logging.getLogger(__name__)
+        self.metrics = StageMetrics()
+        self._executing = 0
+        self._auditing = False
+        self._reflecting = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    # ------------------------------------------------------------------
+    def run(self, tasks: List[Task], tasks_file: str) -> None:
+        """Execute ``tasks`` until no stage has work left."""
+        asyncio.run(self._run(tasks, tasks_file))
+        for stage, stats in self.metrics.summary().items():
+            self.logger.info(
+                "Orchestrator pipeline: stage '%s' ran %d times, %.3fs total, "
+                "peak depth %d.",
+                stage,
+                stats["count"],
+                stats["total"],
+                stats["max_depth"],
+            )
+
+    # ------------------------------------------------------------------
+    async def _run(self, tasks: List[Task], tasks_file: str) -> None:
+        self._execute_q: asyncio.Queue = asyncio.Queue()
+        self._audit_q: asyncio.Queue = asyncio.Queue()
+        self._reflect_q: asyncio.Queue = asyncio.Queue()
+        self._merge_q: asyncio.Queue = asyncio.Queue()
+        pool = self.orch._make_pool()
+        workers = [
+            asyncio.create_task(self._execute_worker(pool))
+            for _ in range(self.orch.parallelism)
+        ]
+        workers.append(asyncio.create_task(self._audit_worker()))
+        workers.append(asyncio.create_task(self._reflect_worker()))
+        try:
+            if self.orch._reflection_due():
+                self._reflecting = True
+                self._put(self._reflect_q, "reflect", self._snapshot(tasks))
+            await self._coordinate(tasks, tasks_file)
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    def _snapshot(self, tasks: List[Task]) -> List[dict]:
+        return [self.orch._task_to_dict(t) for t in tasks]
+
+    # ------------------------------------------------------------------
+    def _put(self, queue: asyncio.Queue, stage: str, item) -> None:
+        queue.put_nowait(item)
+        self.metrics.adjust(stage, 1)
+
+    # ------------------------------------------------------------------
+    async def _get(self, queue: asyncio.Queue, stage: str):
+        item = await queue.get()
+        self.metrics.adjust(stage, -1)
+        return item
+
+    # ------------------------------------------------------------------
+    async def _execute_worker(self, pool: PoolExecutor) -> None:
+        while True:
+            task = await self._get(self._execute_q, "execute")
+            start = time.perf_counter()
+            future = self.orch._submit(pool, task)
+            try:
+                await asyncio.wrap_future(future)
+            except Exception:
+                pass  # inspected by the coordinator through ``future``
+            self.metrics.record("execute", time.perf_counter() - start)
+            self._put(self._merge_q, "merge", ("done", task, future))
+
+    # ------------------------------------------------------------------
+    async def _audit_worker(self) -> None:
+        while True:
+            snapshot, covered = await self._get(self._audit_q, "audit")
+            start = time.perf_counter()
+            try:
+                results = await asyncio.to_thread(self.orch.auditor.audit, snapshot)
+            except Exception as exc:  # pragma: no cover - defensive
+                self.logger.exception("Audit failed: %s", exc)
+                results = []
+            self.metrics.record("audit", time.perf_counter() - start)
+            # The completions covered by this audit are no longer waiting.
+            self.metrics.adjust("audit", 1 - covered)
+            self._put(self._merge_q, "merge", ("audit", snapshot, results or []))
+
+    # ------------------------------------------------------------------
+    async def _reflect_worker(self) -> None:
+        while True:
+            snapshot = await self._get(self._reflect_q, "reflect")
+            start = time.perf_counter()
+            try:
+                # The coordinator saves the new tasks in ``_merge``; a save here
+                # would overwrite statuses set after the snapshot was taken.
+                reflected = await asyncio.to_thread(
+                    self.orch.reflector.run_cycle, snapshot, save=False
+                )
+                self.orch._last_reflection = time.time()
+            except (ValueError, RuntimeError, FileNotFoundError) as exc:
+                self.logger.exception("Reflection failed: %s", exc)
+                reflected = None
+            self.metrics.record("reflect", time.perf_counter() - start)
+            self._put(self._merge_q, "merge", ("reflect", snapshot, reflected or []))
+
+    # ------------------------------------------------------------------
+    def _dispatch(self, tasks: List[Task], tasks_file: str, blocked: set) -> None:
+        """Plan ready tasks until every execute worker has one."""
+        orch = self.orch
+        while self._executing < orch.parallelism:
+            candidates = (
+                [t for t in tasks if id(t) not in blocked] if blocked else tasks
+            )
+            planned = orch._plan_ready(candidates, orch.parallelism - self._executing)
+            if not planned:
+                return
+            for next_task in planned:
+                if orch._is_blocked(next_task):
+                    blocked.add(id(next_task))
+                    continue
+                orch._set_status(next_task, "in_progress", tasks, tasks_file)
+                orch.logger.info(
+                    "Orchestrator: Executing task '%s'.",
+                    getattr(next_task, "id", "N/A"),
+                )
+                self._executing += 1
+                self._put(self._execute_q, "execute", next_task)
+
+    # ------------------------------------------------------------------
+    def _request_audit(self, tasks: List[Task]) -> None:
+        orch = self.orch
+        covered, orch._unaudited = orch._unaudited, 0
+        orch._last_audit = time.monotonic()
+        self._auditing = True
+        # ``covered`` completions already count towards the audit depth.
+        self._audit_q.put_nowait((self._snapshot(tasks), covered))
+
+    # ------------------------------------------------------------------
+    def _audit_wait(self) -> Optional[float]:
+        """Return how long to wait for results before an interval audit is due."""
+        orch = self.orch
+        if self._auditing or not orch._unaudited or not orch.audit_interval:
+            return None
+        return max(0.0, orch._last_audit + orch.audit_interval - time.monotonic())
+
+    # ------------------------------------------------------------------
+    async def _coordinate(self, tasks: List[Task], tasks_file: str) -> None:
+        orch = self.orch
+        blocked: set = set()
+        while True:
+            if not self._auditing and orch._audit_due():
+                self._request_audit(tasks)
+            self._dispatch(tasks, tasks_file, blocked)
+            if not (self._executing or self._auditing or self._reflecting):
+                if orch._unaudited:
+                    self._request_audit(tasks)
+                    continue
+                orch.logger.info("Orchestrator: No actionable tasks. Halting.")
+                return
+            wait = self._audit_wait()
+            if wait is not None and self._timer is None:
+                # Wake the coordinator when an interval audit becomes due.
+                self._timer = asyncio.get_running_loop().call_later(
+                    wait, self._put, self._merge_q, "merge", ("tick",)
+                )
+            event = await self._get(self._merge_q, "merge")
+            start = time.perf_counter()
+            self._apply(event, tasks, tasks_file)
+            self.metrics.record("merge", time.perf_counter() - start)
+
+    # ------------------------------------------------------------------
+    def _apply(self, event: tuple, tasks: List[Task], tasks_file: str) -> None:
+        orch = self.orch
+        kind = event[0]
+        if kind == "tick":
+            self._timer = None
+        elif kind == "done":
+            _, task, future = event
+            self._executing -= 1
+            if orch._finish_task(task, future, tasks, tasks_file):
+                orch._unaudited += 1
+                self.metrics.adjust("audit", 1)
+            if orch._runs:
+                orch._runs.add(1)
+        elif kind == "audit":
+            _, snapshot, results = event
+            self._auditing = False
+            self._merge(orch._items_to_tasks(results), snapshot, tasks, tasks_file)
+        elif kind == "reflect":
+            _, snapshot, reflected = event
+            self._reflecting = False
+            if reflected:
+                self._merge(
+                    orch._convert_reflection(reflected), snapshot, tasks, tasks_file
+                )
+
+    # ------------------------------------------------------------------
+    def _merge(
+        self,
+        produced: List[Task],
+        snapshot: List[dict],
+        tasks: List[Task],
+        tasks_file: str,
+    ) -> None:
+        """Append tasks ``produced`` from ``snapshot`` that are new to ``tasks``."""
+        known = {item.get("id") for item in snapshot}
+        existing = {getattr(t, "id", None) for t in tasks}
+        ids = existing | {task.id for task in produced}
+        next_id = max((i for i in ids if isinstance(i, int)), default=0) + 1
+        added: List[Task] = []
+        renumbered: Dict[int, int] = {}
+        for task in produced:
+            if task.id in known:
+                continue
+            if task.id in existing:
+                renumbered[task.id] = next_id
+                task.id = next_id
+                next_id += 1
+            existing.add(task.id)
+            added.append(task)
+        if not added:
+            return
+        for task in added:
+            task.dependencies = [renumbered.get(dep, dep) for dep in task.dependencies]
+        tasks.extend(added)
+        self.orch._save_tasks(tasks, tasks_file)
+        self.logger.info("Orchestrator pipeline: merged %d new tasks.", len(added))
@@ -2,14 +2,17 @@
 
 The heavy lifting such as dependency evaluation and budget tracking is
 implemented in :mod:`core.planner_utils` to keep this module small and
-easy to maintain.
+easy to maintain. Incremental planning over long task lists uses the ready
+queue in :mod:`core.planner_index`.
 """
 
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 import logging
 
 from .task import Task
 from .config import load_config
+from .planner_index import PlannerIndex
 from .planner_utils import (
     validate_unique_ids,
     get_pending_tasks,
@@ -19,23 +22,137 @@ from .planner_utils import (
     should_warn_about_budget,
     increment_cost_and_warn,
     will_exceed_budget,
+    select_batch,
+    critical_path_lengths,
 )
 
 logger = logging.getLogger(__name__)
 
+PLANNER_MODES = {"priority", "critical_path"}
+
+
+@dataclass
+class BatchPlan:
+    """Tasks selected by :meth:`Planner.plan_batch`.
+
+    ``unused_budget`` is ``None`` when the planner has no budget. ``exact``
+    is ``False`` when the selection came from the greedy fallback.
+    """
+
+    tasks: List[Task] = field(default_factory=list)
+    cost: float = 0
+    unused_budget: Optional[float] = None
+    exact: bool = True
+
 
 class Planner:
-    """Plan task execution order while tracking a cost budget."""
+    """Plan task execution order while tracking a cost budget.
+
+    With ``incremental`` enabled, the planner keeps a
+    :class:`~core.planner_index.PlannerIndex` for the task list it is given
+    instead of rescanning it on every call. The index is rebuilt when a
+    different list is passed and extended when tasks are appended; status
+    changes must be reported through :meth:`task_updated`.
 
-    def __init__(self, budget: int | None = None, warning_threshold: float | None = None) -> None:
+    :meth:`plan_batch` solves the batch selection exactly while the
+    knapsack table stays within ``batch_exact_limit`` cells.
+
+    ``mode="critical_path"`` ranks ready tasks by ``priority`` plus
+    ``critical_path_weight`` times the longest chain of work that waits on
+    them, so tasks gating deep dependency chains start early. Chains are
+    weighed with ``task_weight``, the task cost by default, and a
+    dependency cycle raises ``ValueError`` as soon as the tasks are planned.
+
+    Given a :class:`~core.cost_model.DurationCostModel`, a task costs its
+    expected runtime in seconds instead of its hand-maintained ``cost``.
+    The budget then limits estimated execution time, and batch selection
+    and critical paths weigh tasks by how long they take.
+    """
+
+    batch_exact_limit = 200_000
+
+    def __init__(
+        self,
+        budget: int | None = None,
+        warning_threshold: float | None = None,
+        incremental: bool | None = None,
+        mode: str | None = None,
+        critical_path_weight: float | None = None,
+        task_weight: Callable[[Task], float] | None = None,
+        cost_model=None,
+    ) -> None:
         cfg = load_config()
         planner_cfg = cfg.get("planner", {})
         self.budget = budget if budget is not None else planner_cfg.get("budget", 0)
         self.warning_threshold = (
             warning_threshold if warning_threshold is not None else planner_cfg.get("warning_threshold", 0.8)
         )
+        self.incremental = bool(
+            incremental
+            if incremental is not None
+            else planner_cfg.get("incremental", False)
+        )
+        self.mode = mode or planner_cfg.get("mode", "priority")
+        if self.mode not in PLANNER_MODES:
+            raise ValueError(f"Unknown planner mode: {self.mode}")
+        self.critical_path_weight = float(
+            critical_path_weight
+            if critical_path_weight is not None
+            else planner_cfg.get("critical_path_weight", 1.0)
+        )
+        self.cost_model = cost_model
+        self.task_weight = task_weight or self._cost
         self.cost_used = 0
         self._warned = False
+        self._index: PlannerIndex | None = None
+        self._paths: Dict[int, float] = {}
+        self._paths_for: tuple | None = None
+
+    def _cost(self, task: Task) -> float:
+        if self.cost_model is not None:
+            return self.cost_model.cost(task)
+        return getattr(task, "cost", 1)
+
+    def task_updated(self, task: Task) -> None:
+        """Record a status change of ``task`` in the incremental index."""
+        if self._index is not None:
+            self._index.update(task)
+
+    def _critical_paths(self, tasks: List[Task]) -> Dict[int, float]:
+        """Return critical path lengths, recomputed when ``tasks`` changes.
+
+        The lengths are also recomputed once the cost model has recorded new
+        executions, since its estimates are the default task weights.
+        """
+        revision = getattr(self.cost_model, "revision", None)
+        key = self._paths_for
+        if key is None or key[0] is not tasks or key[1:] != (len(tasks), revision):
+            validate_unique_ids(tasks)
+            self._paths = critical_path_lengths(tasks, self.task_weight)
+            self._paths_for = (tasks, len(tasks), revision)
+        return self._paths
+
+    def _rank(self, task: Task):
+        priority = getattr(task, "priority", 0)
+        if self.mode != "critical_path":
+            return priority
+        return priority + self.critical_path_weight * self._paths.get(id(task), 0)
+
+    def _index_for(self, tasks: List[Task]) -> PlannerIndex:
+        index = self._index
+        critical = self.mode == "critical_path"
+        computed_for = self._paths_for
+        if critical:
+            self._critical_paths(tasks)
+        rebuild = index is None or index.tasks is not tasks or len(tasks) < index.size
+        # New tasks or new cost estimates change the critical paths, and with
+        # them the rank of tasks already in the index.
+        if rebuild or (critical and self._paths_for is not computed_for):
+            self._index = None
+            index = self._index = PlannerIndex(tasks, rank=self._rank)
+        elif len(tasks) > index.size:
+            index.extend()
+        return index
 
     def plan(self, tasks: List[Task]) -> Optional[Task]:
         """Determine the next task to execute.
@@ -53,17 +170,14 @@ class Planner:
             logger.warning("Budget exhausted; no further tasks will be planned")
             return None
 
-        validate_unique_ids(tasks)
-        pending_tasks = get_pending_tasks(tasks)
-        if not pending_tasks:
-            return None
-
-        ready_tasks = filter_ready_tasks(pending_tasks, tasks)
-        if not ready_tasks:
+        if self.incremental:
+            selected = self._index_for(tasks).peek()
+        else:
+            selected = self._select(tasks)
+        if selected is None:
             return None
 
-        selected = select_highest_priority(ready_tasks)
-        cost = getattr(selected, "cost", 1)
+        cost = self._cost(selected)
         if will_exceed_budget(self.budget, self.cost_used, cost):
             logger.warning(
                 "Task %s exceeds remaining budget", getattr(selected, "id", "N/A")
@@ -78,3 +192,67 @@ class Planner:
         )
         return selected
 
+    def plan_batch(self, tasks: List[Task], k: int) -> BatchPlan:
+        """Select up to ``k`` ready tasks to execute together.
+
+        Ready tasks never depend on each other, since a dependency has to be
+        ``done`` first, so any subset can run concurrently. The subset
+        maximizes total priority while its total cost fits the remaining
+        budget; in critical path mode the blended rank is maximized instead.
+        The cost is charged to the budget like :meth:`plan` does.
+        """
+        remaining = self.budget - self.cost_used if self.budget else None
+        if k <= 0:
+            return BatchPlan(unused_budget=remaining)
+        if is_budget_exhausted(self.budget, self.cost_used):
+            logger.warning("Budget exhausted; no further tasks will be planned")
+            return BatchPlan(unused_budget=0)
+
+        if self.incremental:
+            ready = self._index_for(tasks).ready()
+        else:
+            validate_unique_ids(tasks)
+            if self.mode == "critical_path":
+                self._critical_paths(tasks)
+            ready = filter_ready_tasks(get_pending_tasks(tasks), tasks)
+            ready.sort(key=self._rank, reverse=True)
+        chosen, exact = select_batch(
+            ready,
+            k,
+            remaining,
+            self.batch_exact_limit,
+            value=self._rank,
+            cost=self._cost,
+        )
+        cost = sum(self._cost(t) for t in chosen)
+        if chosen:
+            self.cost_used, self._warned = increment_cost_and_warn(
+                self.cost_used,
+                self.budget,
+                self.warning_threshold,
+                self._warned,
+                increment=cost,
+            )
+        return BatchPlan(
+            tasks=chosen,
+            cost=cost,
+            unused_budget=remaining - cost if remaining is not None else None,
+            exact=exact,
+        )
+
+    def _select(self, tasks: List[Task]) -> Optional[Task]:
+        validate_unique_ids(tasks)
+        if self.mode == "critical_path":
+            self._critical_paths(tasks)
+        pending_tasks = get_pending_tasks(tasks)
+        if not pending_tasks:
+            return None
+
+        ready_tasks = filter_ready_tasks(pending_tasks, tasks)
+        if not ready_tasks:
+            return None
+
+        if self.mode == "critical_path":
+            ready_tasks.sort(key=self._rank, reverse=True)
+            return ready_tasks[0]
+        return select_highest_priority(ready_tasks)
@@ -0,0 +1,162 @@
+"""Incrementally maintained ready queue for :class:`core.planner.Planner`.
+
+The stateless planner rescans the whole task list on every call: it checks
+ids for uniqueness, filters pending tasks, looks up each dependency with a
+linear search and sorts the ready tasks. :class:`PlannerIndex` keeps that
+work between calls:
+
+* an id map from task id to position in the list,
+* reverse dependency edges from a task id to the tasks depending on it,
+* per-task counts of dependencies that are not ``done``,
+* a heap of pending tasks without unmet dependencies, keyed by descending
+  priority and then list position.
+
+Building the index is linear in the number of tasks and dependencies. A
+status change reported through :meth:`PlannerIndex.update` costs
+``O(log n)`` plus the number of dependants of the task, and
+:meth:`PlannerIndex.peek` returns the same task as the stateless planner.
+Heap entries are invalidated lazily: stale entries are discarded when they
+reach the top.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .task import Task
+
+logger = logging.getLogger(__name__)
+
+
+def _priority(task: Task):
+    return getattr(task, "priority", 0)
+
+
+class PlannerIndex:
+    """Ready-task index over ``tasks``.
+
+    Tasks appended to the list are picked up by :meth:`extend`. Status
+    changes must be reported through :meth:`update`; other changes to
+    existing tasks, such as edited dependencies, require a new index.
+    ``rank`` orders ready tasks and defaults to their priority.
+    """
+
+    def __init__(
+        self, tasks: List[Task], rank: Optional[Callable[[Task], Any]] = None
+    ) -> None:
+        self.tasks = tasks
+        self._rank = rank or _priority
+        self._by_id: Dict[Any, int] = {}
+        self._dependents: Dict[Any, List[int]] = defaultdict(list)
+        self._unmet: List[int] = []
+        self._status: List[Any] = []
+        self._heap: List[Tuple[Any, int]] = []
+        self.extend()
+
+    # ------------------------------------------------------------------
+    @property
+    def size(self) -> int:
+        """Number of tasks indexed so far."""
+        return len(self._status)
+
+    # ------------------------------------------------------------------
+    def extend(self) -> None:
+        """Index the tasks appended to the list since the last call."""
+        start = self.size
+        new = self.tasks[start:]
+        seen = set()
+        for task in new:
+            task_id = getattr(task, "id", None)
+            if task_id is None:
+                continue
+            if task_id in self._by_id or task_id in seen:
+                raise ValueError(f"Duplicate task id {task_id} detected")
+            seen.add(task_id)
+
+        for pos, task in enumerate(new, start):
+            task_id = getattr(task, "id", None)
+            if task_id is not None:
+                self._by_id[task_id] = pos
+            self._status.append(getattr(task, "status", None))
+            self._unmet.append(0)
+
+        for pos, task in enumerate(new, start):
+            for dep_id in getattr(task, "dependencies", None) or []:
+                self._dependents[dep_id].append(pos)
+                dep_pos = self._by_id.get(dep_id)
+                if dep_pos is None:
+                    if self._status[pos] == "pending":
+                        logger.warning(
+                            "Task %s skipped: dependency %s not found",
+                            getattr(task, "id", "<unknown>"),
+                            dep_id,
+                        )
+                    self._unmet[pos] += 1
+                elif self._status[dep_pos] != "done":
+                    self._unmet[pos] += 1
+            self._push(pos)
+
+        # Older tasks counted dependencies on these ids as missing.
+        for pos, task in enumerate(new, start):
+            if self._status[pos] != "done":
+                continue
+            for dependent in self._dependents.get(getattr(task, "id", None), ()):
+                if dependent < start:
+                    self._unmet[dependent] -= 1
+                    self._push(dependent)
+
+    # ------------------------------------------------------------------
+    def update(self, task: Task) -> None:
+        """Apply the current status of ``task`` to the index."""
+        task_id = getattr(task, "id", None)
+        pos = self._by_id.get(task_id)
+        if pos is None or self.tasks[pos] is not task:
+            return
+        old, new = self._status[pos], getattr(task, "status", None)
+        if old == new:
+            return
+        self._status[pos] = new
+        if (old == "done") != (new == "done"):
+            delta = -1 if new == "done" else 1
+            for dependent in self._dependents.get(task_id, ()):
+                self._unmet[dependent] += delta
+                if delta < 0:
+                    self._push(dependent)
+        self._push(pos)
+
+    # ------------------------------------------------------------------
+    def is_ready(self, pos: int) -> bool:
+        """Return ``True`` if the task at ``pos`` is pending and ready to run."""
+        return self._status[pos] == "pending" and self._unmet[pos] == 0
+
+    # ------------------------------------------------------------------
+    def peek(self) -> Optional[Task]:
+        """Return the ready task the stateless planner would select."""
+        while self._heap:
+            key, pos = self._heap[0]
+            if not self.is_ready(pos):
+                heapq.heappop(self._heap)
+                continue
+            if key != -self._rank(self.tasks[pos]):
+                # Priority changed since the entry was pushed.
+                heapq.heapreplace(self._heap, (-self._rank(self.tasks[pos]), pos))
+                continue
+            return self.tasks[pos]
+        return None
+
+    # ------------------------------------------------------------------
+    def ready(self) -> List[Task]:
+        """Return every ready task in the order the planner would select them."""
+        positions = {pos for _, pos in self._heap if self.is_ready(pos)}
+        return [
+            self.tasks[pos]
+            for pos in sorted(positions, key=lambda p: (-self._rank(self.tasks[p]), p))
+        ]
+
+    # ------------------------------------------------------------------
+    def _push(self, pos: int) -> None:
+        if self.is_ready(pos):
+            heapq.heappush(self._heap, (-self._rank(self.tasks[pos]), pos))
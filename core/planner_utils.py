@@ -6,7 +6,8 @@ dependency resolution, priority selection and budget tracking.
 """
 
 import logging
-from typing import List, Optional
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional
 
 from .task import Task
 
@@ -51,6 +52,66 @@ def dependencies_met(task: Task, tasks: List[Task]) -> bool:
     return True
 
 
+def critical_path_lengths(
+    tasks: List[Task], weight: Callable[[Task], float]
+) -> Dict[int, float]:
+    """Return the longest weighted path from each task to a sink.
+
+    The result maps ``id(task)`` to the task's own ``weight`` plus the
+    heaviest chain of tasks depending on it, computed in one topological
+    pass. Finished tasks weigh nothing and dependencies on unknown ids are
+    ignored. Raises ``ValueError`` naming the tasks of a dependency cycle.
+    """
+    by_id = {getattr(t, "id", None): t for t in tasks}
+    by_id.pop(None, None)
+    dependants: Dict[object, List[Task]] = defaultdict(list)
+    indegree: Dict[int, int] = {}
+    for task in tasks:
+        deps = [d for d in getattr(task, "dependencies", None) or [] if d in by_id]
+        indegree[id(task)] = len(deps)
+        for dep in deps:
+            dependants[dep].append(task)
+
+    queue = deque(t for t in tasks if indegree[id(t)] == 0)
+    order: List[Task] = []
+    while queue:
+        task = queue.popleft()
+        order.append(task)
+        for child in dependants.get(getattr(task, "id", None), ()):
+            indegree[id(child)] -= 1
+            if indegree[id(child)] == 0:
+                queue.append(child)
+    if len(order) < len(tasks):
+        cycle = _find_cycle([t for t in tasks if indegree[id(t)] > 0], by_id)
+        raise ValueError(
+            "Dependency cycle detected: " + " -> ".join(str(t.id) for t in cycle)
+        )
+
+    lengths: Dict[int, float] = {}
+    for task in reversed(order):
+        own = 0 if getattr(task, "status", None) == "done" else weight(task)
+        below = dependants.get(getattr(task, "id", None), ())
+        lengths[id(task)] = own + max((lengths[id(c)] for c in below), default=0)
+    return lengths
+
+
+def _find_cycle(stuck: List[Task], by_id: Dict[object, Task]) -> List[Task]:
+    """Follow dependencies among ``stuck`` tasks until one repeats."""
+    stuck_ids = {id(t) for t in stuck}
+    path: List[Task] = []
+    seen: Dict[int, int] = {}
+    task = stuck[0]
+    while id(task) not in seen:
+        seen[id(task)] = len(path)
+        path.append(task)
+        task = next(
+            by_id[d]
+            for d in getattr(task, "dependencies", None) or []
+            if d in by_id and id(by_id[d]) in stuck_ids
+        )
+    return path[seen[id(task)]:] + [task]
+
+
 def select_highest_priority(tasks: List[Task]) -> Task:
     """Return the task with the highest priority."""
     tasks.sort(key=lambda t: getattr(t, "priority", 0), reverse=True)
@@ -100,3 +161,113 @@ def will_exceed_budget(budget: Optional[int], cost_used: int, cost: int) -> bool
     """Return ``True`` if ``cost`` would exceed remaining ``budget``."""
 
     return bool(budget and cost_used + cost > budget)
+
+
+def _task_cost(task: Task):
+    return getattr(task, "cost", 1)
+
+
+def _task_priority(task: Task):
+    return getattr(task, "priority", 0)
+
+
+def _knapsack(
+    ready: List[Task],
+    k: int,
+    capacity: int,
+    value: Callable[[Task], float],
+    cost_of: Callable[[Task], float],
+) -> List[Task]:
+    """Return up to ``k`` tasks of maximal total priority costing at most ``capacity``.
+
+    Among selections with equal priority the one with more tasks wins.
+    """
+    # best[c][w]: best (priority, count) using at most c tasks and cost w.
+    best = [[(0, 0)] * (capacity + 1) for _ in range(k + 1)]
+    keep = []
+    for task in ready:
+        cost = cost_of(task)
+        gain = value(task)
+        taken = [bytearray(capacity + 1) for _ in range(k + 1)]
+        for c in range(k, 0, -1):
+            row, prev = best[c], best[c - 1]
+            for w in range(capacity, cost - 1, -1):
+                base = prev[w - cost]
+                candidate = (base[0] + gain, base[1] + 1)
+                if candidate > row[w]:
+                    row[w] = candidate
+                    taken[c][w] = 1
+        keep.append(taken)
+
+    chosen = []
+    c, w = k, capacity
+    for i in range(len(ready) - 1, -1, -1):
+        if c and keep[i][c][w]:
+            chosen.append(ready[i])
+            c -= 1
+            w -= cost_of(ready[i])
+    return chosen
+
+
+def _greedy_batch(
+    ready: List[Task],
+    k: int,
+    capacity,
+    value: Callable[[Task], float],
+    cost_of: Callable[[Task], float],
+) -> List[Task]:
+    """Fill the batch by value per unit of cost, as a fast approximation."""
+
+    def density(task: Task):
+        cost = cost_of(task)
+        return (cost == 0, value(task) / cost if cost else value(task))
+
+    chosen, spent = [], 0
+    for task in sorted(ready, key=density, reverse=True):
+        if len(chosen) == k:
+            break
+        if spent + cost_of(task) <= capacity:
+            chosen.append(task)
+            spent += cost_of(task)
+    # Density order can miss a single valuable task; take it if it alone is worth more.
+    fitting = [t for t in ready if cost_of(t) <= capacity]
+    if fitting:
+        single = max(fitting, key=value)
+        if value(single) > sum(value(t) for t in chosen):
+            chosen = [single]
+    return chosen
+
+
+def select_batch(
+    ready: List[Task],
+    k: int,
+    capacity: Optional[int],
+    exact_limit: int,
+    value: Callable[[Task], float] = _task_priority,
+    cost: Callable[[Task], float] = _task_cost,
+) -> tuple[List[Task], bool]:
+    """Choose up to ``k`` of the ``ready`` tasks within ``capacity``.
+
+    ``ready`` must be in planning order. Without a ``capacity`` the first
+    ``k`` tasks are returned. Otherwise the selection maximizes the total
+    ``value`` (priority by default) with an exact knapsack when all costs
+    are integers and ``len(ready) * k * capacity`` is at most
+    ``exact_limit``, and with a greedy approximation otherwise. Returns the
+    chosen tasks in planning order and whether the selection is exact.
+    """
+    k = min(k, len(ready))
+    if capacity is None:
+        return ready[:k], True
+
+    def cost_of(task: Task):
+        return max(0, cost(task))
+
+    costs = [cost_of(t) for t in ready]
+    capacity = min(capacity, sum(costs))
+    exact = all(isinstance(c, int) for c in costs) and isinstance(capacity, int)
+    if exact and len(ready) * k * (capacity + 1) <= exact_limit:
+        chosen = _knapsack(ready, k, capacity, value, cost_of)
+    else:
+        chosen, exact = _greedy_batch(ready, k, capacity, value, cost_of), False
+    picked = {id(t) for t in chosen}
+    return [t for t in ready if id(t) in picked], exact
@@ -0,0 +1,261 @@
+"""Warm pool of pre-forked Python interpreters for short task commands.
+
+Starting a fresh interpreter dominates the runtime of commands such as
+``python -c ...`` or ``python script.py``. :class:`PythonPool` keeps a
+``forkserver`` zygote that has already imported the configured modules and a
+few idle children forked from it. Each command is handed to one idle child
+which runs it exactly once and exits, so no state leaks between commands.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .tool_runner import kill_process_group
+
+# Interpreter flags that only affect buffering and bytecode caching, so a
+# warm child can ignore them. Flags such as ``-I``, ``-E``, ``-s`` and ``-S``
+# change module resolution or environment handling and are left to a fresh
+# interpreter.
+_IGNORED_FLAGS = {"-u", "-B"}
+
+
+def parse_python_command(args: Sequence[str]) -> Optional[Tuple[str, str, List[str]]]:
+    """Return ``(mode, target, argv)`` if ``args`` is a plain Python command.
+
+    ``mode`` is ``"code"`` for ``python -c CODE`` and ``"script"`` for
+    ``python path.py``. ``None`` is returned for anything the pool cannot run
+    faithfully (``-m``, unknown flags, other executables).
+    """
+    if not args:
+        return None
+    exe = os.path.basename(args[0])
+    if exe not in {"python", "python3", os.path.basename(sys.executable)}:
+        return None
+    i = 1
+    while i < len(args) and args[i] in _IGNORED_FLAGS:
+        i += 1
+    if i >= len(args):
+        return None
+    if args[i] == "-c":
+        if i + 1 >= len(args):
+            return None
+        return "code", args[i + 1], ["-c", *args[i + 2:]]
+    if args[i].startswith("-"):
+        return None
+    return "script", args[i], list(args[i:])
+
+
+def _serve(conn) -> None:
+    """Entry point of a warm child: run one job then exit."""
+    os.setsid()
+    try:
+        job = conn.recv()
+    except EOFError:
+        job = None
+    conn.close()
+    if job is None:
+        os._exit(0)
+    mode, target, argv, cwd, stdout_path, stderr_path = job
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    out_fd = os.open(stdout_path, os.O_WRONLY | os.O_TRUNC)
+    err_fd = os.open(stderr_path, os.O_WRONLY | os.O_TRUNC)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    sys.stdout = open(1, "w", closefd=False)
+    sys.stderr = open(2, "w", closefd=False)
+
+    code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        sys.argv = argv
+        if mode == "code":
+            sys.path[0:0] = [""]
+            exec(compile(target, "<string>", "exec"), {"__name__": "__main__"})
+        else:
+            import runpy
+
+            sys.path.insert(0, os.path.dirname(os.path.abspath(target)))
+            runpy.run_path(target, run_name="__main__")
+    except SystemExit as exc:
+        if exc.code is None:
+            code = 0
+        elif isinstance(exc.code, int):
+            code = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    os._exit(code)
+
+
+class PythonPool:
+    """Run Python commands in fresh forks of a warm interpreter."""
+
+    # Interval used to poll ``cancel_event`` while a command runs.
+    _POLL_INTERVAL = 0.05
+
+    def __init__(self, size: int = 2, preload: Sequence[str] | None = None) -> None:
+        self.size = max(1, int(size))
+        self._ctx = multiprocessing.get_context("forkserver")
+        self._ctx.set_forkserver_preload([__name__, *(preload or [])])
+        self._idle: List[Tuple[multiprocessing.Process, object]] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.append(self._fork())
+
+    # ------------------------------------------------------------------
+    def _fork(self):
+        reader, writer = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(target=_serve, args=(reader,), daemon=True)
+        proc.start()
+        reader.close()
+        return proc, writer
+
+    # ------------------------------------------------------------------
+    def _acquire(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PythonPool is closed")
+            if self._idle:
+                return self._idle.pop()
+        return self._fork()
+
+    # ------------------------------------------------------------------
+    def _replenish(self) -> None:
+        with self._lock:
+            missing = 0 if self._closed else self.size - len(self._idle)
+        for _ in range(missing):
+            worker = self._fork()
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    self._discard(worker)
+                else:
+                    self._idle.append(worker)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _discard(worker) -> None:
+        proc, conn = worker
+        try:
+            conn.send(None)
+        except OSError:
+            pass
+        conn.close()
+        proc.join(timeout=1)
+
+    # ------------------------------------------------------------------
+    def accepts(self, command: Sequence[str]) -> bool:
+        """Return ``True`` if ``command`` can run inside the pool."""
+        return not self._closed and parse_python_command(command) is not None
+
+    # ------------------------------------------------------------------
+    def run(
+        self,
+        command: Sequence[str],
+        cwd: str | Path | None = None,
+        timeout: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> Dict[str, object]:
+        """Run ``command`` in a warm child and return its result.
+
+        The result mirrors :meth:`core.async_runner.AsyncRunner.run` with
+        ``stdout``, ``stderr``, ``exit_code``, ``timed_out``, ``duration`` and
+        ``spawn_duration`` plus a ``cancelled`` flag set when ``cancel_event``
+        stopped the child.
+        """
+        parsed = parse_python_command(command)
+        if parsed is None:
+            raise ValueError(f"Not a Python command: {command!r}")
+        mode, target, argv = parsed
+
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="pypool-") as tmp:
+            out_path = os.path.join(tmp, "stdout")
+            err_path = os.path.join(tmp, "stderr")
+            open(out_path, "wb").close()
+            open(err_path, "wb").close()
+
+            proc, conn = self._acquire()
+            conn.send(
+                (mode, target, argv, str(cwd) if cwd else None, out_path, err_path)
+            )
+            conn.close()
+            spawned = time.perf_counter()
+            self._replenish()
+
+            timed_out, cancelled = self._wait(proc, start, timeout, cancel_event)
+            if timed_out or cancelled:
+                kill_process_group(proc)
+                proc.join()
+            with open(out_path, "rb") as fh:
+                stdout = fh.read().decode(errors="replace")
+            with open(err_path, "rb") as fh:
+                stderr = fh.read().decode(errors="replace")
+
+        return {
+            "stdout": stdout,
+            "stderr": stderr,
+            "exit_code": proc.exitcode,
+            "timed_out": timed_out,
+            "cancelled": cancelled,
+            "duration": time.perf_counter() - start,
+            "spawn_duration": spawned - start,
+        }
+
+    # ------------------------------------------------------------------
+    def _wait(
+        self,
+        proc,
+        start: float,
+        timeout: float | None,
+        cancel_event: threading.Event | None,
+    ) -> Tuple[bool, bool]:
+        """Wait for ``proc`` and return ``(timed_out, cancelled)``."""
+        if cancel_event is None:
+            proc.join(timeout)
+            return proc.exitcode is None, False
+        while proc.exitcode is None:
+            if cancel_event.is_set():
+                return False, True
+            step = self._POLL_INTERVAL
+            if timeout is not None:
+                remaining = timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    return True, False
+                step = min(step, remaining)
+            proc.join(step)
+        return False, False
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Stop all idle children."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            self._discard(worker)
+
+    def __enter__(self) -> "PythonPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -9,15 +9,22 @@ from typing import Dict, List, Optional
 
 import yaml
 
+from .atomic_write import atomic_open
 from .self_auditor import SelfAuditor
 from .observability import MetricsProvider
 from .log_utils import configure_logging
 from .code_llm import CodeLLM
+from .memory import task_from_row, task_to_row
+from .task_store import TaskStore
 from reflector import ReplayBuffer, PPOAgent, StateBuilder
 
 
 class Reflector:
-    """Run a reflection cycle to analyze and evolve the system."""
+    """Run a reflection cycle to analyze and evolve the system.
+
+    Tasks are read from and written to ``tasks_path``, or to ``task_store``
+    when one is given.
+    """
 
     def __init__(
         self,
@@ -27,9 +34,11 @@ class Reflector:
         metrics_provider: Optional["MetricsProvider"] = None,
         code_model: Optional[CodeLLM] = None,
         rl_agent: Optional[PPOAgent] = None,
+        task_store: Optional[TaskStore] = None,
     ) -> None:
         configure_logging()
         self.tasks_path = Path(tasks_path)
+        self.task_store = task_store
         self.complexity_threshold = complexity_threshold
         self.analysis_paths = analysis_paths or self._discover_analysis_paths()
         self.self_auditor = SelfAuditor(complexity_threshold=complexity_threshold)
@@ -45,30 +54,44 @@ class Reflector:
             )
         else:
             self.rl_agent = None
+        self._cycle_metrics: Optional[Dict] = None
         self.logger = logging.getLogger(__name__)
 
     # ------------------------------------------------------------------
-    def run_cycle(self, tasks: Optional[List[Dict]] = None) -> List[Dict]:
-        """Execute a full reflection cycle and persist any new tasks."""
+    def run_cycle(
+        self, tasks: Optional[List[Dict]] = None, save: bool = True
+    ) -> List[Dict]:
+        """Execute a full reflection cycle and persist any new tasks.
+
+        With ``save`` disabled the updated task list is only returned, for
+        callers that persist it themselves.
+        """
 
         self.logger.info("Starting reflection cycle")
 
         if tasks is None:
             tasks = self._load_tasks()
 
-        if self.rl_agent and self.metrics_provider:
-            metrics = self.metrics_provider.collect()
-            self.rl_agent.train_step(metrics)
+        # Every stage of the cycle shares one read of the metrics.
+        self._cycle_metrics = (
+            self.metrics_provider.collect() if self.metrics_provider else {}
+        )
+        try:
+            if self.rl_agent and self.metrics_provider:
+                self.rl_agent.train_step(self._cycle_metrics)
 
-        analysis_results = self.analyze()
-        decisions = self.decide(analysis_results, tasks)
-        new_tasks = self.execute(decisions, tasks)
-        self._suggest_code_actions(new_tasks)
+            analysis_results = self.analyze()
+            decisions = self.decide(analysis_results, tasks)
+            new_tasks = self.execute(decisions, tasks)
+            self._suggest_code_actions(new_tasks)
+        finally:
+            self._cycle_metrics = None
 
         if new_tasks:
             updated_tasks = tasks + new_tasks
             self.validate(updated_tasks)
-            self._save_tasks(updated_tasks)
+            if save:
+                self._save_tasks(updated_tasks)
             self.logger.info("Reflection cycle completed: %d new tasks", len(new_tasks))
         else:
             self.logger.info("Reflection cycle completed: no new tasks generated")
@@ -97,7 +120,7 @@ class Reflector:
         analysis["strategic_insights"] = self._generate_strategic_insights(analysis)
 
         if self.metrics_provider:
-            analysis["observability_metrics"] = self.metrics_provider.collect()
+            analysis["observability_metrics"] = self._metrics()
 
         return analysis
 
@@ -250,6 +273,8 @@ class Reflector:
 
     # ------------------------------------------------------------------
     def _load_tasks(self) -> List[Dict]:
+        if self.task_store is not None:
+            return [task_to_row(t) for t in self.task_store.load_tasks()]
         try:
             with open(self.tasks_path, "r") as f:
                 return yaml.safe_load(f) or []
@@ -262,7 +287,10 @@ class Reflector:
 
     # ------------------------------------------------------------------
     def _save_tasks(self, tasks: List[Dict]) -> None:
-        with open(self.tasks_path, "w") as f:
+        if self.task_store is not None:
+            self.task_store.save_tasks([task_from_row(t) for t in tasks])
+            return
+        with atomic_open(self.tasks_path) as f:
             yaml.dump(tasks, f, default_flow_style=False, sort_keys=False)
 
     # ------------------------------------------------------------------
@@ -308,9 +336,16 @@ class Reflector:
             return "medium"
         return "low"
 
+    # ------------------------------------------------------------------
+    def _metrics(self) -> Dict:
+        """Return the current cycle's metrics, collecting them outside a cycle."""
+        if self._cycle_metrics is not None:
+            return self._cycle_metrics
+        return self.metrics_provider.collect() if self.metrics_provider else {}
+
     # ------------------------------------------------------------------
     def _analyze_system_health(self) -> Dict:
-        metrics = self.metrics_provider.collect() if self.metrics_provider else {}
+        metrics = self._metrics()
 
         health = {
             "architectural_issues": [],
@@ -329,7 +364,7 @@ class Reflector:
 
     # ------------------------------------------------------------------
     def _analyze_evolution_trends(self) -> Dict:
-        metrics = self.metrics_provider.collect() if self.metrics_provider else {}
+        metrics = self._metrics()
 
         history = metrics.get("complexity_history", [])
         complexity_trend = self._calc_complexity_trend(history)
@@ -552,5 +587,3 @@ class Reflector:
             "status": "pending",
             "metadata": {"type": "process", "generated_by": "Reflector", "decision_type": decision["type"]},
         }
-
-
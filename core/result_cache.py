@@ -0,0 +1,187 @@
+"""Content-addressed cache for deterministic task command results.
+
+Entries are keyed by the command string plus a digest of the declared input
+files and environment variables. Results live in a small SQLite database with
+least-recently-used eviction once the stored output exceeds ``max_bytes``.
+
+Only tasks that opt in are cached (see :func:`cacheable`): a command that
+declares nothing about its inputs may have side effects and must run every
+time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+try:
+    from opentelemetry import metrics
+except Exception:  # pragma: no cover - optional dependency
+    metrics = None
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """Store command results on disk keyed by their inputs."""
+
+    def __init__(
+        self, path: str | Path = ".cache/results.db", max_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stdout TEXT, "
+            "stderr TEXT, exit_code INTEGER, size INTEGER, last_access REAL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_access ON results(last_access)"
+        )
+        conn.commit()
+        conn.close()
+        if metrics:
+            meter = metrics.get_meter_provider().get_meter(__name__)
+            self._hit_counter = meter.create_counter(
+                "result_cache_hits_total",
+                description="Command results served from cache",
+            )
+            self._miss_counter = meter.create_counter(
+                "result_cache_misses_total",
+                description="Command results not found in cache",
+            )
+        else:  # pragma: no cover - metrics optional
+            self._hit_counter = None
+            self._miss_counter = None
+
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key(
+        command: Union[str, Sequence[str]],
+        inputs: Iterable[str | Path] = (),
+        env: Iterable[str] = (),
+        root: str | Path | None = None,
+    ) -> str:
+        """Return the cache key for ``command``.
+
+        ``inputs`` are file paths (relative to ``root`` when given) whose
+        contents are hashed. ``env`` names environment variables whose values
+        are part of the key. Missing files and unset variables are recorded as
+        such so that creating them later changes the key.
+        """
+        h = hashlib.sha256()
+        cmd = command if isinstance(command, str) else json.dumps(list(command))
+        h.update(cmd.encode())
+        base = Path(root) if root is not None else None
+        for item in sorted(str(i) for i in inputs):
+            path = base / item if base is not None else Path(item)
+            h.update(b"\0file:" + item.encode())
+            try:
+                with path.open("rb") as fh:
+                    for chunk in iter(lambda: fh.read(65536), b""):
+                        h.update(chunk)
+            except OSError:
+                h.update(b"\0missing")
+        for name in sorted(env):
+            value = os.environ.get(name)
+            h.update(b"\0env:" + name.encode())
+            h.update(b"\0unset" if value is None else value.encode())
+        return h.hexdigest()
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Dict[str, Union[str, int]]]:
+        """Return the stored result for ``key`` or ``None``."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT stdout, stderr, exit_code FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+        conn.close()
+        if not row:
+            self.misses += 1
+            if self._miss_counter:
+                self._miss_counter.add(1)
+            return None
+        self.hits += 1
+        if self._hit_counter:
+            self._hit_counter.add(1)
+        return {"stdout": row[0], "stderr": row[1], "exit_code": row[2]}
+
+    # ------------------------------------------------------------------
+    def put(self, key: str, stdout: str, stderr: str, exit_code: int) -> None:
+        """Store a result and evict least recently used entries if needed."""
+        size = len(stdout.encode()) + len(stderr.encode())
+        if size > self.max_bytes:
+            logger.debug("Result for %s exceeds cache size; not stored", key)
+            return
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO results "
+            "(key, stdout, stderr, exit_code, size, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, stdout, stderr, exit_code, size, time.time()),
+        )
+        self._evict(conn)
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT key, size FROM results ORDER BY last_access"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        conn = self._connect()
+        count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        conn.close()
+        return int(count)
+
+
+def cacheable(metadata: Optional[dict]) -> bool:
+    """Return ``True`` if a task with ``metadata`` may be served from cache.
+
+    An explicit ``cacheable`` entry decides; otherwise the task must declare
+    the ``inputs`` files or ``env`` variables its result depends on.
+    """
+    meta = metadata or {}
+    if "cacheable" in meta:
+        return bool(meta["cacheable"])
+    return bool(meta.get("inputs") or meta.get("env"))
+
+
+def cache_from_config(cfg: dict) -> Optional[ResultCache]:
+    """Return a :class:`ResultCache` when ``cache.enabled`` is set in ``cfg``."""
+    cache_cfg = cfg.get("cache", {})
+    if not cache_cfg.get("enabled"):
+        return None
+    return ResultCache(
+        cache_cfg.get("path", ".cache/results.db"),
+        int(cache_cfg.get("max_bytes", 64 * 1024 * 1024)),
+    )
@@ -3,30 +3,49 @@
 from __future__ import annotations
 
 import ast
+import hashlib
+import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import radon
 from radon.complexity import cc_visit, cc_rank
 from radon.metrics import mi_visit, mi_rank
 
 from .log_utils import configure_logging
 
 
+# Bump when the layout of cached metrics changes.
+CACHE_VERSION = 1
+
+
 class SelfAuditor:
-    """Evaluate metrics and produce refactor tasks when thresholds are exceeded."""
+    """Evaluate metrics and produce refactor tasks when thresholds are exceeded.
+
+    With ``cache_file`` set, per-file metrics are persisted together with a
+    hash of the file content and only files whose hash changed are analysed
+    again. The cache is discarded when the thresholds or the radon version
+    change. Wily history depends on the repository rather than the file
+    content, so the cache is bypassed when ``use_wily`` is enabled.
+    """
 
     def __init__(
         self,
         complexity_threshold: int = 15,
         maintainability_threshold: str = "B",
         use_wily: bool = False,
+        cache_file: str | Path | None = None,
     ) -> None:
         configure_logging()
         self.complexity_threshold = complexity_threshold
         self.maintainability_threshold = maintainability_threshold
         self.use_wily = use_wily
+        self.cache_file = Path(cache_file) if cache_file else None
         self.logger = logging.getLogger(__name__)
+        self._cache: Optional[Dict[str, Dict]] = None
+        self.last_analyzed = 0
 
     # ------------------------------------------------------------------
     def analyze(self, paths: List[Path]) -> Dict[str, Dict]:
@@ -74,6 +93,85 @@ class SelfAuditor:
 
         return results
 
+    # ------------------------------------------------------------------
+    def _cache_key(self) -> Dict:
+        return {
+            "version": CACHE_VERSION,
+            "radon": getattr(radon, "__version__", ""),
+            "complexity_threshold": self.complexity_threshold,
+            "maintainability_threshold": self.maintainability_threshold,
+        }
+
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self._cache is not None:
+            return self._cache
+        self._cache = {}
+        if self.cache_file and self.cache_file.exists():
+            try:
+                data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                self.logger.warning(
+                    "Ignoring unreadable audit cache %s: %s", self.cache_file, exc
+                )
+                return self._cache
+            if isinstance(data, dict) and data.get("key") == self._cache_key():
+                self._cache = data.get("files", {})
+        return self._cache
+
+    # ------------------------------------------------------------------
+    def _save_cache(self, files: Dict[str, Dict]) -> None:
+        self._cache = files
+        data = {"key": self._cache_key(), "files": files}
+        tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.cache_file)
+        except OSError as exc:  # pragma: no cover - IO issues
+            self.logger.warning(
+                "Could not write audit cache %s: %s", self.cache_file, exc
+            )
+
+    # ------------------------------------------------------------------
+    def analyze_incremental(self, paths: List[Path]) -> Dict[str, Dict]:
+        """Return metrics for ``paths`` reusing cached results of unchanged files.
+
+        Without a ``cache_file`` (or with wily enabled) this is equivalent
+        to :meth:`analyze`.
+        """
+        if not self.cache_file or self.use_wily:
+            self.last_analyzed = len(paths)
+            return self.analyze(paths)
+
+        cache = self._load_cache()
+        digests: Dict[str, str] = {}
+        for path in paths:
+            if path.suffix != ".py":
+                continue
+            try:
+                digests[str(path)] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                continue
+
+        changed = {
+            key for key, digest in digests.items()
+            if cache.get(key, {}).get("sha256") != digest
+        }
+        fresh = self.analyze([Path(key) for key in digests if key in changed])
+        files: Dict[str, Dict] = {}
+        results: Dict[str, Dict] = {}
+        for key, digest in digests.items():
+            if key in changed:
+                files[key] = {"sha256": digest, "metrics": fresh.get(key)}
+            else:
+                files[key] = cache[key]
+            if files[key]["metrics"] is not None:
+                results[key] = files[key]["metrics"]
+        self.last_analyzed = len(changed)
+        if changed or files.keys() != cache.keys():
+            self._save_cache(files)
+        return results
+
     # ------------------------------------------------------------------
     def _analyze_file(self, filepath: str, content: str) -> Dict:
         try:
@@ -226,12 +324,13 @@ class SelfAuditor:
         A task is generated when either the cyclomatic complexity or
         maintainability index of a module exceeds the configured
         thresholds. Existing refactor tasks are ignored to avoid
-        duplicates.
+        duplicates. With a ``cache_file`` only files changed since the
+        previous audit are analysed again.
         """
 
         python_files = [f for f in Path(".").rglob("*.py") if "__pycache__" not in str(f)]
 
-        metrics = self.analyze(python_files)
+        metrics = self.analyze_incremental(python_files)
         new_tasks: List[Dict] = []
         existing_refactor_files = self._get_existing_refactor_files(existing_tasks)
 
@@ -0,0 +1,195 @@
+"""Binary snapshot format for :class:`~core.memory.Memory` state.
+
+A snapshot stores each top-level key of the state as a separate section, so
+readers only decode the sections they use. The file is memory-mapped and a
+section is decoded on first access. Layout, all integers little endian::
+
+    header    magic  b"AISS"
+              u16    format version (:data:`VERSION`)
+              u16    flags (bit 0: the state is a single non-mapping value)
+              u32    number of sections
+              u8     major version of the writing Python
+              u8     minor version of the writing Python
+              u16    reserved
+    index     per section:
+              u16    key length
+              u8     codec (0 = JSON, 1 = marshal)
+              u8     reserved
+              u64    payload offset from the start of the file
+              u64    payload length
+              u32    CRC-32 of the payload
+              bytes  UTF-8 key
+    payloads  section data
+
+Sections use the portable JSON codec by default. The ``marshal`` codec
+decodes several times faster, but its format may change between Python
+versions and it must only be read from trusted locations. A snapshot with
+marshal sections written by a different Python version raises
+:class:`StaleSnapshotError`, which :class:`~core.memory.Memory` treats like a
+missing state file.
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+import mmap
+import struct
+import sys
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from .atomic_write import atomic_open
+
+MAGIC = b"AISS"
+VERSION = 2
+CODECS = {"json": 0, "marshal": 1}
+
+_HEADER = struct.Struct("<4sHHIBBxx")
+_ENTRY = struct.Struct("<HBxQQI")
+_ROOT_VALUE = 1
+_ROOT_KEY = ""
+
+
+class StaleSnapshotError(ValueError):
+    """Raised for marshal sections written by a different Python version."""
+
+
+def _encode(value: Any, codec: int) -> bytes:
+    if codec == CODECS["marshal"]:
+        return marshal.dumps(value, 4)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _decode(payload: memoryview, codec: int) -> Any:
+    if codec == CODECS["marshal"]:
+        return marshal.loads(payload)
+    if codec == CODECS["json"]:
+        return json.loads(bytes(payload))
+    raise ValueError(f"Unknown snapshot codec {codec}")
+
+
+def is_snapshot(path: str | Path) -> bool:
+    """Return ``True`` if ``path`` starts with the snapshot magic bytes."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(path: str | Path, data: Any, codec: str = "json") -> None:
+    """Atomically write ``data`` to ``path`` as a snapshot."""
+    codec_id = CODECS[codec]
+    if isinstance(data, Mapping):
+        flags, items = 0, list(data.items())
+    else:
+        flags, items = _ROOT_VALUE, [(_ROOT_KEY, data)]
+    keys = [str(key).encode() for key, _ in items]
+    payloads = [_encode(value, codec_id) for _, value in items]
+    offset = _HEADER.size + sum(_ENTRY.size + len(k) for k in keys)
+    with atomic_open(path, "wb") as fh:
+        major, minor = sys.version_info[:2]
+        fh.write(_HEADER.pack(MAGIC, VERSION, flags, len(items), major, minor))
+        for key, payload in zip(keys, payloads):
+            fh.write(
+                _ENTRY.pack(
+                    len(key), codec_id, offset, len(payload), zlib.crc32(payload)
+                )
+            )
+            fh.write(key)
+            offset += len(payload)
+        for payload in payloads:
+            fh.write(payload)
+
+
+class Snapshot(Mapping):
+    """Read-only mapping over a memory-mapped snapshot file.
+
+    Sections are decoded and checked against their CRC on first access and
+    cached afterwards. Call :meth:`close` (or use the snapshot as a context
+    manager) to release the mapping; values already decoded stay usable.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections, self.root_value = self._read_index()
+        except Exception:
+            self._map.close()
+            raise
+        self._cache: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    def _read_index(self) -> Tuple[Dict[str, Tuple[int, int, int, int]], bool]:
+        view = self._map
+        if len(view) < _HEADER.size:
+            raise ValueError(f"{self.path} is not a snapshot")
+        magic, version, flags, count, major, minor = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} in {self.path}")
+        sections = {}
+        pos = _HEADER.size
+        for _ in range(count):
+            key_len, codec, offset, length, crc = _ENTRY.unpack_from(view, pos)
+            pos += _ENTRY.size
+            key = bytes(view[pos : pos + key_len]).decode()
+            pos += key_len
+            if offset + length > len(view):
+                raise ValueError(f"Truncated snapshot section {key!r} in {self.path}")
+            sections[key] = (codec, offset, length, crc)
+        marshalled = any(s[0] == CODECS["marshal"] for s in sections.values())
+        if marshalled and (major, minor) != sys.version_info[:2]:
+            raise StaleSnapshotError(
+                f"{self.path} holds marshal data from Python {major}.{minor}"
+            )
+        return sections, bool(flags & _ROOT_VALUE)
+
+    # ------------------------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            return self._cache[key]
+        codec, offset, length, crc = self._sections[key]
+        with memoryview(self._map) as view:
+            payload = view[offset : offset + length]
+            try:
+                if zlib.crc32(payload) != crc:
+                    raise ValueError(f"Corrupt snapshot section {key!r} in {self.path}")
+                value = _decode(payload, codec)
+            finally:
+                payload.release()
+        self._cache[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    # ------------------------------------------------------------------
+    def section_size(self, key: str) -> int:
+        """Return the encoded size of section ``key`` in bytes."""
+        return self._sections[key][2]
+
+    def value(self) -> Any:
+        """Return the whole state: a dict, or the stored non-mapping value."""
+        if self.root_value:
+            return self[_ROOT_KEY]
+        return {key: self[key] for key in self._sections}
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
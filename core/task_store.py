@@ -0,0 +1,225 @@
+"""SQLite-backed task store.
+
+:class:`~core.memory.Memory` keeps every task in one YAML file that is
+rewritten on each change, and every query scans the full list.
+:class:`TaskStore` keeps tasks in a SQLite database instead:
+
+* one row per task holding the task file row as JSON, plus indexed
+  ``status``, ``priority``, ``component`` and ``epic`` columns,
+* a ``position`` column preserving list order, which the planner uses to
+  break priority ties.
+
+:meth:`TaskStore.load_tasks` and :meth:`TaskStore.save_tasks` mirror the
+``Memory`` methods, so the store can be handed to the orchestrator in place of
+``Memory``. ``save_tasks`` only writes rows that changed, and
+:meth:`TaskStore.update_task` writes a single row. The database uses
+write-ahead logging, so readers always see the last committed state while
+a writer is active.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .memory import (
+    _validate_tasks,
+    load_task_file,
+    save_task_file,
+    task_from_row,
+    task_to_row,
+)
+from .task import Task
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("status", "priority", "component", "epic")
+
+
+class TaskStore:
+    """Persist tasks in the SQLite database at ``path``.
+
+    The ``tasks_file`` arguments of :meth:`load_tasks` and :meth:`save_tasks`
+    are accepted for compatibility with ``Memory`` and ignored; use
+    :meth:`import_yaml` and :meth:`export_yaml` to move tasks between the
+    store and a task file.
+    """
+
+    def __init__(self, path: str | Path = "tasks.sqlite") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._validated: Dict[int, dict] = {}
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, "
+            "position INTEGER NOT NULL, status TEXT, priority INTEGER, "
+            "component TEXT, epic TEXT, data TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_position ON tasks(position)")
+        for column in _COLUMNS:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_tasks_{column} ON tasks({column})"
+            )
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _values(row: dict, position: int) -> tuple:
+        return (
+            row["id"],
+            position,
+            row.get("status"),
+            row.get("priority"),
+            row.get("component"),
+            row.get("epic"),
+            json.dumps(row, sort_keys=True),
+        )
+
+    # ------------------------------------------------------------------
+    def _select(
+        self, where: str = "", params: Iterable = (), order: str = "position"
+    ) -> List[Task]:
+        conn = self._connect()
+        rows = conn.execute(
+            f"SELECT data FROM tasks {where} ORDER BY {order}", tuple(params)
+        ).fetchall()
+        conn.close()
+        return [task_from_row(json.loads(data)) for (data,) in rows]
+
+    # ------------------------------------------------------------------
+    def load_tasks(self, tasks_file: Optional[str] = None) -> List[Task]:
+        """Return all tasks in list order."""
+        return self._select()
+
+    # ------------------------------------------------------------------
+    def save_tasks(self, tasks: List[Task], tasks_file: Optional[str] = None) -> None:
+        """Make the store hold exactly ``tasks`` in the given order.
+
+        Rows whose content and position are unchanged are left untouched.
+        """
+        rows = [task_to_row(t) for t in tasks]
+        _validate_tasks(rows, self._validated)
+        values = [self._values(row, pos) for pos, row in enumerate(rows)]
+        conn = self._connect()
+        with conn:
+            stored = {
+                task_id: (position, data)
+                for task_id, position, data in conn.execute(
+                    "SELECT id, position, data FROM tasks"
+                )
+            }
+            changed = [v for v in values if stored.get(v[0]) != (v[1], v[-1])]
+            removed = stored.keys() - {v[0] for v in values}
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(i,) for i in removed])
+            conn.executemany(
+                "INSERT OR REPLACE INTO tasks "
+                "(id, position, status, priority, component, epic, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                changed,
+            )
+        conn.close()
+
+    # ------------------------------------------------------------------
+    def update_task(self, task: Task) -> None:
+        """Write ``task`` to its row, appending it if it is new."""
+        row = task_to_row(task)
+        _validate_tasks([row], self._validated)
+        conn = self._connect()
+        with conn:
+            found = conn.execute(
+                "SELECT position FROM tasks WHERE id = ?", (row["id"],)
+            ).fetchone()
+            if found is None:
+                found = conn.execute(
+                    "SELECT COALESCE(MAX(position) + 1, 0) FROM tasks"
+                ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO tasks "
+                "(id, position, status, priority, component, epic, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._values(row, found[0]),
+            )
+        conn.close()
+
+    # ------------------------------------------------------------------
+    def get(self, task_id: int) -> Optional[Task]:
+        """Return the task with ``task_id`` or ``None``."""
+        found = self._select("WHERE id = ?", (task_id,))
+        return found[0] if found else None
+
+    # ------------------------------------------------------------------
+    def find(
+        self,
+        status: Optional[str] = None,
+        component: Optional[str] = None,
+        epic: Optional[str] = None,
+        by_priority: bool = False,
+    ) -> List[Task]:
+        """Return tasks matching all given filters.
+
+        Results are in list order, or by descending priority and then list
+        order when ``by_priority`` is set.
+        """
+        filters = {"status": status, "component": component, "epic": epic}
+        clauses = [
+            f"{name} = ?" for name, value in filters.items() if value is not None
+        ]
+        params = [value for value in filters.values() if value is not None]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "priority DESC, position" if by_priority else "position"
+        return self._select(where, params, order)
+
+    # ------------------------------------------------------------------
+    def count(self, status: Optional[str] = None) -> int:
+        """Return the number of tasks, optionally only those with ``status``."""
+        conn = self._connect()
+        if status is None:
+            total = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        else:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status = ?", (status,)
+            ).fetchone()[0]
+        conn.close()
+        return int(total)
+
+    # ------------------------------------------------------------------
+    def import_yaml(self, tasks_file: str | Path) -> int:
+        """Replace the stored tasks with those in ``tasks_file``; return the count."""
+        tasks = load_task_file(tasks_file)
+        self.save_tasks(tasks)
+        return len(tasks)
+
+    # ------------------------------------------------------------------
+    def export_yaml(self, tasks_file: str | Path) -> int:
+        """Write the stored tasks to ``tasks_file``; return the count."""
+        tasks = self.load_tasks()
+        save_task_file(tasks, tasks_file)
+        return len(tasks)
+
+
+def task_store_from_config(
+    cfg: dict, tasks_file: str = "tasks.yml"
+) -> Optional[TaskStore]:
+    """Return a :class:`TaskStore` when ``task_store.backend`` is ``sqlite``.
+
+    A new, empty store is seeded from ``tasks_file`` if that file exists.
+    """
+    store_cfg = cfg.get("task_store", {})
+    if store_cfg.get("backend", "yaml") != "sqlite":
+        return None
+    store = TaskStore(store_cfg.get("path", "tasks.sqlite"))
+    if store.count() == 0 and Path(tasks_file).exists():
+        imported = store.import_yaml(tasks_file)
+        logger.info(
+            "Imported %d tasks from %s into %s", imported, tasks_file, store.path
+        )
+    return store
@@ -9,6 +9,7 @@ import subprocess
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from .atomic_write import atomic_open
 from .config import load_config
 
 
@@ -44,8 +45,8 @@ class ToolRegistry:
 
     def _save(self) -> None:
         data = {"tools": {cmd: asdict(tool) for cmd, tool in self.tools.items()}}
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self._orig_open(self.path, "w") as fh:
+        # atomic_open uses os.fdopen, so a hooked ``open`` is not involved.
+        with atomic_open(self.path) as fh:
             json.dump(data, fh, indent=2)
 
     def register(self, command: str, description: str = "") -> None:
@@ -1,17 +1,69 @@
 from __future__ import annotations
 
+import os
 import shlex
+import signal
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Sequence
+from typing import Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .python_pool import PythonPool
+
+
+class ToolResult(subprocess.CompletedProcess):
+    """``CompletedProcess`` extended with timeout and cancellation details."""
+
+    def __init__(
+        self,
+        args,
+        returncode: int,
+        stdout: str = "",
+        stderr: str = "",
+        timed_out: bool = False,
+        duration: float = 0.0,
+        cancelled: bool = False,
+    ) -> None:
+        super().__init__(args, returncode, stdout, stderr)
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+        self.duration = duration
+
+
+def kill_process_group(proc) -> None:
+    """Kill ``proc`` and every process in its process group."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:  # pragma: no cover - non-POSIX platforms
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
 
 
 class ToolRunner:
-    """Execute shell commands within a sandbox."""
+    """Execute shell commands within a sandbox.
+
+    An optional :class:`~core.python_pool.PythonPool` runs plain Python
+    commands in warm interpreters rooted at ``sandbox_root``.
+    """
+
+    # Interval used to poll ``cancel_event`` while a command runs.
+    _POLL_INTERVAL = 0.1
 
-    def __init__(self, sandbox_root: str | Path, allowed_commands: Sequence[str] | None = None) -> None:
+    def __init__(
+        self,
+        sandbox_root: str | Path,
+        allowed_commands: Sequence[str] | None = None,
+        timeout: float | None = None,
+        python_pool: "PythonPool | None" = None,
+    ) -> None:
         self.sandbox_root = Path(sandbox_root).resolve()
         self.allowed_commands = set(allowed_commands or [])
+        self.timeout = timeout
+        self.python_pool = python_pool
         self.sandbox_root.mkdir(parents=True, exist_ok=True)
 
     def _validate_args(self, args: Sequence[str]) -> None:
@@ -22,11 +74,88 @@ class ToolRunner:
             if p.is_absolute() or ".." in p.parts:
                 raise PermissionError("Absolute paths and parent references are not allowed")
 
-    def run(self, command: str | Sequence[str]) -> subprocess.CompletedProcess:
-        """Run ``command`` inside the sandbox and return the result."""
+    def run(
+        self,
+        command: str | Sequence[str],
+        timeout: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> ToolResult:
+        """Run ``command`` inside the sandbox and return the result.
+
+        The command runs in its own process group so that the whole process
+        tree is killed once ``timeout`` seconds (defaulting to the runner's
+        ``timeout``) elapse or ``cancel_event`` is set. The returned
+        :class:`ToolResult` reports ``timed_out``, ``cancelled`` and the
+        elapsed ``duration``.
+        """
         args = shlex.split(command) if isinstance(command, str) else list(command)
         if not args:
             raise ValueError("No command provided")
         self._validate_args(args)
-        return subprocess.run(args, cwd=self.sandbox_root, capture_output=True, text=True)
+        timeout = self.timeout if timeout is None else timeout
+        if self.python_pool and self.python_pool.accepts(args):
+            res = self.python_pool.run(args, self.sandbox_root, timeout, cancel_event)
+            return ToolResult(
+                args,
+                res["exit_code"],
+                res["stdout"],
+                res["stderr"],
+                timed_out=res["timed_out"],
+                duration=res["duration"],
+                cancelled=res["cancelled"],
+            )
+
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            args,
+            cwd=self.sandbox_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        timed_out = cancelled = False
+        try:
+            stdout, stderr = self._communicate(proc, start, timeout, cancel_event)
+        except subprocess.TimeoutExpired:
+            cancelled = bool(cancel_event and cancel_event.is_set())
+            timed_out = not cancelled
+            kill_process_group(proc)
+            stdout, stderr = proc.communicate()
+        except BaseException:
+            kill_process_group(proc)
+            proc.wait()
+            raise
+        return ToolResult(
+            args,
+            proc.returncode,
+            stdout or "",
+            stderr or "",
+            timed_out=timed_out,
+            duration=time.perf_counter() - start,
+            cancelled=cancelled,
+        )
 
+    def _communicate(
+        self,
+        proc: subprocess.Popen,
+        start: float,
+        timeout: float | None,
+        cancel_event: threading.Event | None,
+    ) -> tuple[str, str]:
+        """Wait for ``proc`` while honouring ``timeout`` and ``cancel_event``."""
+        if cancel_event is None:
+            return proc.communicate(timeout=timeout)
+        while True:
+            if cancel_event.is_set():
+                raise subprocess.TimeoutExpired(proc.args, time.perf_counter() - start)
+            step = self._POLL_INTERVAL
+            if timeout is not None:
+                remaining = timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                step = min(step, remaining)
+            try:
+                return proc.communicate(timeout=step)
+            except subprocess.TimeoutExpired:
+                continue
@@ -104,7 +104,7 @@ class PPOAgent:
             self.ewc.update_importance(params, batch=self.last_batch)
 
     def train_step(self, metrics: Dict[str, float]) -> None:
-        state = self.state_builder.build()
+        state = self.state_builder.build(metrics)
         reward_metrics = metrics.copy()
         if self.docs_agent:
             _reports, coverage = self.docs_agent.run()
@@ -6,6 +6,8 @@ from pathlib import Path
 import json
 import random
 
+from core.atomic_write import atomic_open
+
 
 @dataclass
 class ReplayBuffer:
@@ -57,8 +59,7 @@ class ReplayBuffer:
         if not self.path:
             return
         try:
-            self.path.parent.mkdir(parents=True, exist_ok=True)
-            with self.path.open("w", encoding="utf-8") as fh:
+            with atomic_open(self.path) as fh:
                 json.dump(self.buffer, fh)
         except Exception:  # pragma: no cover - IO errors
             pass
@@ -105,7 +105,7 @@ class PPOAgent:
 
     def train_step(self, metrics: Dict[str, float]) -> None:
         """Update policy using ``metrics`` and the current state."""
-        state = self.state_builder.build()
+        state = self.state_builder.build(metrics)
         self._update_from_state(state, metrics)
         if self.history_loader:
             for hist in self.history_loader.sample(self.update_batch_size):
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
 from core.observability import MetricsProvider
 
@@ -11,9 +11,14 @@ class StateBuilder:
     def __init__(self, metrics_provider: MetricsProvider) -> None:
         self.metrics_provider = metrics_provider
 
-    def build(self) -> Dict[str, float]:
-        """Return numeric metrics of interest with defaults."""
-        metrics = self.metrics_provider.collect()
+    def build(self, metrics: Optional[Dict] = None) -> Dict[str, float]:
+        """Return numeric metrics of interest with defaults.
+
+        ``metrics`` already collected by the caller are used instead of
+        collecting them again.
+        """
+        if metrics is None:
+            metrics = self.metrics_provider.collect()
         cpu = float(metrics.get("cpu", 0))
         memory = float(metrics.get("memory", 0))
         error_rate = float(metrics.get("error_rate", 0))
@@ -0,0 +1,156 @@
+"""Time ``Memory.load_tasks`` caching and JSON versus snapshot state loading."""
+
+import argparse
+import logging
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+from jsonschema import validate
+
+from core import memory as memory_mod
+from core.log_utils import configure_logging
+from core.memory import TASK_SCHEMA, Memory
+
+
+def _uncached_load(path: Path) -> list:
+    """Load ``path`` the way ``Memory.load_tasks`` did before caching."""
+    with path.open("r") as fh:
+        data = yaml.safe_load(fh) or []
+    validate(instance=data, schema=TASK_SCHEMA)
+    return data
+
+
+def _time(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+def benchmark(tasks_file: str, calls: int = 20) -> dict:
+    """Return seconds per load for each loading strategy.
+
+    The file is copied to a temporary directory so the edit scenario does
+    not touch ``tasks_file``. The copy keeps the original modification time;
+    files modified within the last two seconds are never cached.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tasks.yml"
+        shutil.copy2(tasks_file, path)
+        mem = Memory(Path(tmp) / "state.json")
+
+        uncached = _time(lambda: _uncached_load(path), calls)
+
+        def cold():
+            memory_mod._task_cache.clear()
+            mem.load_tasks(path)
+
+        cold_time = _time(cold, calls)
+        mem.load_tasks(path)
+        warm = _time(lambda: mem.load_tasks(path), calls)
+
+        tasks = mem.load_tasks(path)
+
+        edited = 0.0
+        for _ in range(calls):
+            tasks[0].priority = tasks[0].priority % 5 + 1
+            mem.save_tasks(tasks, path)
+            # The file was just written, so the reload parses it again; only
+            # the edited row is validated.
+            start = time.perf_counter()
+            mem.load_tasks(path)
+            edited += time.perf_counter() - start
+        edited /= calls
+        return {
+            "tasks": len(tasks),
+            "uncached": uncached,
+            "cold": cold_time,
+            "warm": warm,
+            "edit": edited,
+        }
+
+
+def make_state(num_records: int, seed: int = 0) -> dict:
+    """Return a state dict with a large history and a few small sections."""
+    rng = random.Random(seed)
+    return {
+        "history": [
+            {
+                "id": i,
+                "status": "done",
+                "score": rng.random(),
+                "notes": "x" * 40,
+                "tags": ["a", "b"],
+            }
+            for i in range(num_records)
+        ],
+        "embeddings": {
+            str(i): [rng.random() for _ in range(16)] for i in range(num_records // 10)
+        },
+        "counters": {"runs": 5, "tasks": num_records},
+    }
+
+
+def benchmark_state(num_records: int, calls: int = 5) -> dict:
+    """Return file sizes and seconds per load for JSON and snapshot state."""
+    state = make_state(num_records)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_mem = Memory(Path(tmp) / "state.json")
+        snap_mem = Memory(Path(tmp) / "state.snap", snapshot=True)
+        marshal_mem = Memory(
+            Path(tmp) / "state.msnap", snapshot=True, snapshot_codec="marshal"
+        )
+        json_mem.save(state)
+        snap_mem.save(state)
+        marshal_mem.save(state)
+        return {
+            "json_bytes": json_mem.path.stat().st_size,
+            "snapshot_bytes": snap_mem.path.stat().st_size,
+            "marshal_bytes": marshal_mem.path.stat().st_size,
+            "json": _time(json_mem.load, calls),
+            "snapshot": _time(snap_mem.load, calls),
+            "marshal": _time(marshal_mem.load, calls),
+            "section": _time(lambda: snap_mem.load_section("counters"), calls),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark task file loading")
+    parser.add_argument("--tasks-file", default="tasks.yml")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument(
+        "--state-records",
+        type=int,
+        default=60_000,
+        help="history entries in the state benchmark",
+    )
+    args = parser.parse_args()
+    configure_logging()
+    result = benchmark(args.tasks_file, args.calls)
+    logging.info("%d tasks from %s", result["tasks"], args.tasks_file)
+    logging.info(
+        "uncached (safe_load + validate): %.1f ms/load", result["uncached"] * 1e3
+    )
+    logging.info("cold cache: %.1f ms/load", result["cold"] * 1e3)
+    logging.info("warm cache: %.2f ms/load", result["warm"] * 1e3)
+    logging.info("reload after a one-row edit: %.1f ms/load", result["edit"] * 1e3)
+
+    state = benchmark_state(args.state_records)
+    logging.info(
+        "state: JSON %.1f MB, snapshot %.1f MB, marshal snapshot %.1f MB",
+        state["json_bytes"] / 1e6,
+        state["snapshot_bytes"] / 1e6,
+        state["marshal_bytes"] / 1e6,
+    )
+    logging.info("state JSON load: %.1f ms", state["json"] * 1e3)
+    logging.info("state snapshot load: %.1f ms", state["snapshot"] * 1e3)
+    logging.info("state marshal snapshot load: %.1f ms", state["marshal"] * 1e3)
+    logging.info("state snapshot single small section: %.3f ms", state["section"] * 1e3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare the stateless and incremental planners on large task lists."""
+
+import argparse
+import logging
+import random
+import time
+
+from core.log_utils import configure_logging
+from core.planner import Planner
+from core.task import Task
+
+
+def make_tasks(num_tasks: int, seed: int = 0) -> list[Task]:
+    """Return a random DAG where each task depends on up to three earlier ones."""
+    rng = random.Random(seed)
+    return [
+        Task(
+            id=i,
+            description="",
+            dependencies=rng.sample(
+                range(max(0, i - 1000), i), k=min(i, rng.randint(0, 3))
+            ),
+            priority=rng.randint(0, 10),
+            status="pending",
+        )
+        for i in range(num_tasks)
+    ]
+
+
+def _complete(planner: Planner, task: Task) -> None:
+    task.status = "done"
+    planner.task_updated(task)
+
+
+def benchmark(num_tasks: int, calls: int = 1, stateless: bool = True) -> dict:
+    """Return seconds per plan call for both planners.
+
+    The stateless planner is sampled over ``calls`` calls because each call
+    already scans the list quadratically; the incremental planner drains the
+    whole list.
+    """
+    expected = []
+    stateless_per_call = None
+    if stateless:
+        planner = Planner(budget=0, incremental=False)
+        tasks = make_tasks(num_tasks)
+        start = time.perf_counter()
+        for _ in range(calls):
+            task = planner.plan(tasks)
+            expected.append(task.id)
+            _complete(planner, task)
+        stateless_per_call = (time.perf_counter() - start) / calls
+
+    incremental = Planner(budget=0, incremental=True)
+    tasks = make_tasks(num_tasks)
+    start = time.perf_counter()
+    planned = []
+    while (task := incremental.plan(tasks)) is not None:
+        planned.append(task.id)
+        _complete(incremental, task)
+    total = time.perf_counter() - start
+    if planned[: len(expected)] != expected or len(planned) != num_tasks:
+        raise RuntimeError("incremental planner diverged from the stateless planner")
+    return {
+        "stateless_per_call": stateless_per_call,
+        "incremental_total": total,
+        "incremental_per_call": total / num_tasks,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark planner scaling")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--calls", type=int, default=1, help="stateless plan calls to sample"
+    )
+    parser.add_argument(
+        "--stateless-max",
+        type=int,
+        default=20_000,
+        help="largest task list timed with the stateless planner",
+    )
+    args = parser.parse_args()
+    configure_logging()
+    for num_tasks in args.tasks:
+        result = benchmark(
+            num_tasks, args.calls, stateless=num_tasks <= args.stateless_max
+        )
+        if result["stateless_per_call"] is not None:
+            logging.info(
+                "%d tasks: stateless %.1f ms/plan",
+                num_tasks,
+                result["stateless_per_call"] * 1e3,
+            )
+        logging.info(
+            "%d tasks: incremental %.1f us/plan (full run %.2fs)",
+            num_tasks,
+            result["incremental_per_call"] * 1e6,
+            result["incremental_total"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time the near-duplicate stage of ``Memory.reconcile_tasks``."""
+
+import argparse
+import logging
+import random
+import time
+
+from core.log_utils import configure_logging
+from core.memory import Memory
+from core.task import Task
+
+
+def make_tasks(
+    num_tasks: int, duplicate_rate: float = 0.2, seed: int = 0
+) -> tuple[list[Task], int]:
+    """Return tasks and the number of reworded duplicates among them.
+
+    Descriptions are twelve words from a 5000-word vocabulary. A duplicate
+    copies an earlier description with one word replaced.
+    """
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(5000)]
+    descriptions: list[str] = []
+    duplicates = 0
+    for i in range(num_tasks):
+        if descriptions and rng.random() < duplicate_rate:
+            words = rng.choice(descriptions).split()
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+            duplicates += 1
+        else:
+            words = rng.choices(vocab, k=12)
+        descriptions.append(" ".join(words))
+    tasks = [
+        Task(id=i, description=d, dependencies=[], priority=1, status="pending")
+        for i, d in enumerate(descriptions)
+    ]
+    return tasks, duplicates
+
+
+def benchmark(num_tasks: int, threshold: float = 0.7) -> dict:
+    """Return the reconcile time and how many injected duplicates were merged."""
+    tasks, duplicates = make_tasks(num_tasks)
+    mem = Memory("state.json")
+    start = time.perf_counter()
+    result = mem.reconcile_tasks(tasks, [], {}, near_duplicate_threshold=threshold)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "duplicates": duplicates,
+        "merged": num_tasks - len(result),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark near-duplicate reconciliation"
+    )
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+    configure_logging()
+    for num_tasks in args.tasks:
+        result = benchmark(num_tasks, args.threshold)
+        logging.info(
+            "%d tasks: %.2fs (%.1f us/task), merged %d of %d reworded duplicates",
+            num_tasks,
+            result["seconds"],
+            result["seconds"] / num_tasks * 1e6,
+            result["merged"],
+            result["duplicates"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare autoscaling policies on an arrival trace without touching production."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from core.log_utils import configure_logging
+from worker.scaling import PredictivePolicy, QueueLengthPolicy
+from worker.simulator import AutoscalingSimulator, poisson_trace, service_time_sampler
+
+
+def build_policies(
+    max_workers: int, target_wait: float, cooldown: float, min_workers: int
+) -> dict:
+    return {
+        "queue": lambda: QueueLengthPolicy(
+            max_workers=max_workers, min_workers=min_workers
+        ),
+        "predictive": lambda: PredictivePolicy(
+            max_workers=max_workers,
+            min_workers=min_workers,
+            target_wait=target_wait,
+            scale_down_cooldown=cooldown,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--trace", type=Path, help="JSON list of {time, service_time} arrivals"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=2.0,
+        help="Poisson arrival rate when no trace is given",
+    )
+    parser.add_argument("--duration", type=float, default=600.0)
+    parser.add_argument(
+        "--service",
+        choices=["constant", "exponential", "lognormal"],
+        default="exponential",
+    )
+    parser.add_argument("--mean-service", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--startup-delay", type=float, default=1.0)
+    parser.add_argument("--max-workers", type=int, default=16)
+    parser.add_argument("--min-workers", type=int, default=0)
+    parser.add_argument("--target-wait", type=float, default=5.0)
+    parser.add_argument("--cooldown", type=float, default=30.0)
+    parser.add_argument("--policy", action="append", choices=["queue", "predictive"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    configure_logging()
+
+    trace = (
+        None if args.trace else poisson_trace(args.rate, args.duration, seed=args.seed)
+    )
+    policies = build_policies(
+        args.max_workers, args.target_wait, args.cooldown, args.min_workers
+    )
+    results = {}
+    for name in args.policy or list(policies):
+        sim = AutoscalingSimulator(
+            workload_path=args.trace,
+            trace=trace,
+            service_time=service_time_sampler(args.service, args.mean_service),
+            interval=args.interval,
+            startup_delay=args.startup_delay,
+            max_workers=args.max_workers,
+            seed=args.seed,
+        )
+        results[name] = sim.run(policies[name]()).to_dict()
+    logging.info(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
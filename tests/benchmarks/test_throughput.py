@@ -1,6 +1,7 @@
 import asyncio
 import time
 from core.async_runner import AsyncRunner
+from core.python_pool import PythonPool
 
 async def run_benchmark(num_tasks: int = 5) -> float:
     runner = AsyncRunner()
@@ -13,3 +14,25 @@ async def run_benchmark(num_tasks: int = 5) -> float:
 def test_async_runner_throughput():
     tps = asyncio.run(run_benchmark())
     assert tps > 10, f"throughput too low: {tps:.2f} tps"
+
+
+async def run_short_commands(runner: AsyncRunner, num_tasks: int = 20) -> float:
+    cmd = ["python", "-c", "pass"]
+    start = time.perf_counter()
+    for _ in range(num_tasks):
+        await runner.run(cmd)
+    duration = time.perf_counter() - start
+    return num_tasks / duration
+
+
+def test_python_pool_throughput_gain():
+    cold = asyncio.run(run_short_commands(AsyncRunner()))
+    with PythonPool(size=2) as pool:
+        warm = asyncio.run(run_short_commands(AsyncRunner(python_pool=pool)))
+    print(
+        f"python -c throughput: cold {cold:.1f} tps, warm {warm:.1f} tps "
+        f"({warm / cold:.1f}x)"
+    )
+    assert (
+        warm > cold
+    ), f"warm pool slower than cold start: {warm:.2f} vs {cold:.2f} tps"
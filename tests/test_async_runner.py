@@ -1,9 +1,18 @@
 import asyncio
 import unittest
+from pathlib import Path
 
 from core.async_runner import AsyncRunner
 
 
+def _is_running(pid: int) -> bool:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
 class TestAsyncRunner(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
         self.runner = AsyncRunner()
@@ -25,6 +34,26 @@ class TestAsyncRunner(unittest.IsolatedAsyncioTestCase):
         duration = asyncio.get_event_loop().time() - start
         self.assertLess(duration, 1.0)
 
+    async def test_timeout_kills_process_group(self):
+        runner = AsyncRunner(timeout=0.5)
+        result = await runner.run(["sh", "-c", "sleep 30 & echo $!; wait"])
+        self.assertTrue(result["timed_out"])
+        self.assertLess(result["duration"], 5)
+        child = int(result["stdout"].split()[0])
+        self.assertFalse(_is_running(child))
+
+    async def test_per_call_timeout_overrides_default(self):
+        result = await self.runner.run(["sleep", "30"], timeout=0.2)
+        self.assertTrue(result["timed_out"])
+        self.assertNotEqual(result["exit_code"], 0)
+
+    async def test_cancellation_kills_child(self):
+        task = asyncio.create_task(self.runner.run(["sh", "-c", "sleep 30"]))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+
+import pytest
+
+from core import atomic_write as aw
+from core.atomic_write import GroupCommit, atomic_open, atomic_write, configure_fsync
+from core.memory import Memory
+from core.reflector import Reflector
+from core.status_journal import StatusJournal
+from core.task import Task
+
+
+@pytest.fixture(autouse=True)
+def _reset_policy():
+    yield
+    configure_fsync("always")
+
+
+def _count_fsyncs(monkeypatch):
+    calls = []
+    real = os.fsync
+    monkeypatch.setattr(aw.os, "fsync", lambda fd: calls.append(fd) or real(fd))
+    return calls
+
+
+def test_failed_write_leaves_original(tmp_path):
+    path = tmp_path / "state.json"
+    atomic_write(path, "old")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as fh:
+            fh.write("partial")
+            raise RuntimeError("crash")
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["state.json"]
+
+
+def test_preserves_mode_and_writes_bytes(tmp_path):
+    path = tmp_path / "data.bin"
+    atomic_write(path, b"\x00\x01")
+    os.chmod(path, 0o640)
+    atomic_write(path, b"\x02")
+    assert path.read_bytes() == b"\x02"
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_readers_never_see_partial_content(tmp_path):
+    path = tmp_path / "state.json"
+    mem = Memory(path)
+    mem.save({"n": 0, "pad": "x" * 100_000})
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                json.loads(path.read_text())
+            except ValueError as exc:
+                errors.append(exc)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(50):
+            mem.save({"n": i, "pad": "x" * 100_000})
+    finally:
+        stop.set()
+        reader.join()
+    assert errors == []
+
+
+def test_policies_control_fsync(tmp_path, monkeypatch):
+    calls = _count_fsyncs(monkeypatch)
+    atomic_write(tmp_path / "a", "1")
+    assert len(calls) == 2  # file and directory
+
+    calls.clear()
+    atomic_write(tmp_path / "a", "2", fsync="never")
+    assert calls == []
+
+    with pytest.raises(ValueError):
+        configure_fsync("sometimes")
+
+
+def test_group_commit_batches_syncs(tmp_path, monkeypatch):
+    calls = _count_fsyncs(monkeypatch)
+    configure_fsync("group", group_interval=60)
+    for i in range(20):
+        atomic_write(tmp_path / f"f{i % 4}", str(i))
+    # Content is visible before it is synced.
+    assert (tmp_path / "f3").read_text() == "19"
+    assert calls == []
+    assert aw.group_commit().flush() == 4
+    assert len(calls) == 5  # four files and their directory
+    assert aw.group_commit().flush() == 0
+
+
+def test_group_commit_flushes_in_background(tmp_path):
+    group = GroupCommit(interval=0.01)
+    path = tmp_path / "f"
+    path.write_text("x")
+    group.add(path)
+    for _ in range(200):
+        if group.commits:
+            break
+        threading.Event().wait(0.01)
+    assert group.commits == 1
+
+
+def test_journal_compaction_and_reflector_use_atomic_writes(tmp_path, monkeypatch):
+    calls = _count_fsyncs(monkeypatch)
+    tasks_file = tmp_path / "tasks.yml"
+    task = Task(id=1, description="a", dependencies=[], priority=1, status="done")
+    journal = StatusJournal(
+        str(tasks_file), Memory(tmp_path / "state.json"), compact_every=1
+    )
+    journal.record(task, [task])
+    assert journal.compactions == 1
+    Reflector(tasks_path=tasks_file)._save_tasks([{"id": 1, "description": "b"}])
+    # The file and its directory are synced once per replacement.
+    assert len(calls) == 4
+    assert os.listdir(tmp_path) == ["tasks.yml"]
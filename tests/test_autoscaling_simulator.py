@@ -0,0 +1,85 @@
+import json
+import time
+
+import pytest
+
+from core.production_simulator import SimulationMetricsProvider
+from worker.scaling import PredictivePolicy, QueueLengthPolicy, ScalingPolicy
+from worker.simulator import AutoscalingSimulator, poisson_trace, service_time_sampler
+
+
+class Fixed(ScalingPolicy):
+    def __init__(self, workers):
+        self.workers = workers
+
+    def decide(self, sample, current):
+        return self.workers
+
+
+def test_fixed_pool_waits_and_worker_seconds():
+    trace = [{"time": 0.0, "service_time": 2.0} for _ in range(4)]
+    sim = AutoscalingSimulator(trace=trace, interval=1.0)
+    report = sim.run(Fixed(2))
+    assert report.completed == 4
+    # Two tasks start at once, the other two wait for a free slot.
+    assert sorted([report.wait_p50, report.wait_max]) == [0.0, 2.0]
+    assert report.scale_ups == 2 and report.scale_downs == 0
+    assert report.worker_seconds == pytest.approx(2 * report.duration)
+
+
+def test_startup_delay_adds_wait():
+    trace = [{"time": 0.0, "service_time": 1.0}]
+    report = AutoscalingSimulator(trace=trace, startup_delay=3.0).run(Fixed(1))
+    assert report.wait_max == 3.0
+
+
+def test_trace_loaded_from_file_in_order(tmp_path):
+    path = tmp_path / "trace.json"
+    path.write_text(json.dumps([{"time": 5.0}, {"time": 1.0}, {"time": 3.0}]))
+    sim = AutoscalingSimulator(workload_path=path, seed=1)
+    assert [e["time"] for e in sim.workload] == [1.0, 3.0, 5.0]
+
+
+def test_runs_are_reproducible():
+    trace = poisson_trace(3.0, 120, seed=7)
+    runs = [
+        AutoscalingSimulator(
+            trace=trace, service_time=service_time_sampler("lognormal", 0.8), seed=3
+        )
+        .run(PredictivePolicy(max_workers=8, scale_down_cooldown=10))
+        .to_dict()
+        for _ in range(2)
+    ]
+    assert runs[0] == runs[1]
+
+
+def test_compare_policies_faster_than_real_time():
+    trace = poisson_trace(5.0, 3600, seed=11)
+    sampler = service_time_sampler("exponential", 1.0)
+    start = time.perf_counter()
+    legacy = AutoscalingSimulator(
+        trace=trace, service_time=sampler, startup_delay=1.0, seed=2
+    ).run(QueueLengthPolicy(max_workers=16))
+    predictive = AutoscalingSimulator(
+        trace=trace, service_time=sampler, startup_delay=1.0, seed=2
+    ).run(PredictivePolicy(max_workers=16, scale_down_cooldown=30))
+    assert time.perf_counter() - start < 30
+    assert legacy.completed == predictive.completed == len(trace)
+    assert predictive.churn < legacy.churn
+    assert predictive.wait_p95 < 5.0
+
+
+def test_starved_policy_stops_after_drain_timeout():
+    trace = [{"time": 0.0, "service_time": 1.0}]
+    report = AutoscalingSimulator(trace=trace).run(Fixed(0), drain_timeout=10)
+    assert report.completed == 0
+    assert report.duration >= 10
+
+
+def test_metrics_provider_exposes_report():
+    sim = AutoscalingSimulator(trace=[{"time": 0.0, "service_time": 1.0}])
+    sim.run(Fixed(1))
+    metrics = SimulationMetricsProvider(sim).collect()
+    assert metrics["events_processed"] == 1
+    assert metrics["completed"] == 1
+    assert metrics["churn"] == 1
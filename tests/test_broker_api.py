@@ -52,6 +52,12 @@ def test_create_task_with_metadata(tmp_path):
     assert resp.status_code == 200
     data = resp.json()
     assert data["metadata"] == {"foo": "bar"}
+    assert client.get(f"/tasks/{data['id']}", headers=headers).json()["metadata"] == {
+        "foo": "bar"
+    }
+    assert client.get("/tasks/next", headers=headers).json()["metadata"] == {
+        "foo": "bar"
+    }
 
     os.environ.pop("API_TOKENS")
 
@@ -190,6 +196,128 @@ def test_result_requires_auth(tmp_path):
     os.environ.pop("API_TOKENS")
 
 
+def test_bulk_results(tmp_path):
+    os.environ["DB_PATH"] = str(tmp_path / "api.db")
+    os.environ["METRICS_PORT"] = "0"
+    os.environ["API_TOKENS"] = "admintoken:admin:admin,workertoken:worker:worker"
+    broker = reload(__import__("broker.main", fromlist=["app", "init_db"]))
+    client = TestClient(broker.app)
+
+    admin = {"Authorization": "Bearer admintoken"}
+    ids = [
+        client.post("/tasks", json={"description": f"t{i}"}, headers=admin).json()["id"]
+        for i in range(3)
+    ]
+    payload = [
+        {"task_id": task_id, "stdout": str(task_id), "stderr": "", "exit_code": 0}
+        for task_id in ids
+    ]
+    payload.append({"task_id": 999, "stdout": "", "stderr": "", "exit_code": 1})
+
+    resp = client.post("/tasks/results", json=payload)
+    assert resp.status_code == 401
+
+    resp = client.post(
+        "/tasks/results", json=payload, headers={"Authorization": "Bearer workertoken"}
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["saved"] == ids
+    assert data["missing"] == [999]
+    for task_id in ids:
+        assert client.get(f"/tasks/{task_id}", headers=admin).json()["status"] == "done"
+
+    os.environ.pop("API_TOKENS")
+
+
+def test_stats_endpoint(tmp_path):
+    os.environ["DB_PATH"] = str(tmp_path / "api.db")
+    os.environ["METRICS_PORT"] = "0"
+    os.environ["API_TOKENS"] = "admintoken:admin:admin,workertoken:worker:worker"
+    broker = reload(__import__("broker.main", fromlist=["app", "init_db"]))
+    client = TestClient(broker.app)
+
+    admin = {"Authorization": "Bearer admintoken"}
+    worker = {"Authorization": "Bearer workertoken"}
+    for i in range(3):
+        client.post("/tasks", json={"description": f"t{i}"}, headers=admin)
+    task = client.get("/tasks/next", headers=worker).json()
+    client.post(
+        f"/tasks/{task['id']}/result",
+        json={"stdout": "", "stderr": "", "exit_code": 0},
+        headers=worker,
+    )
+    client.get("/tasks/next", headers=worker)
+
+    assert client.get("/stats").status_code == 401
+    resp = client.get("/stats", headers=worker)
+    assert resp.status_code == 200
+    stats = resp.json()
+    assert stats["queue_depth"] == 1
+    assert stats["in_flight"] == 1
+    assert stats["created_total"] == 3
+    assert stats["completed_total"] == 1
+    assert stats["arrival_rate"] == 3 / stats["window"]
+    assert stats["service_time"] >= 0
+
+    os.environ.pop("API_TOKENS")
+
+
+def test_bulk_create_and_result_feed(tmp_path):
+    os.environ["DB_PATH"] = str(tmp_path / "api.db")
+    os.environ["METRICS_PORT"] = "0"
+    os.environ["API_TOKENS"] = "admintoken:admin:admin,workertoken:worker:worker"
+    broker = reload(__import__("broker.main", fromlist=["app", "init_db"]))
+    client = TestClient(broker.app)
+
+    admin = {"Authorization": "Bearer admintoken"}
+    worker = {"Authorization": "Bearer workertoken"}
+    tasks = [{"description": f"t{i}", "command": f"echo {i}"} for i in range(3)]
+    assert client.post("/tasks/bulk", json=tasks, headers=worker).status_code == 403
+    resp = client.post("/tasks/bulk", json=tasks, headers=admin)
+    assert resp.status_code == 200
+    ids = [t["id"] for t in resp.json()]
+    assert len(set(ids)) == 3
+    assert [t["command"] for t in client.get("/tasks", headers=admin).json()] == [
+        "echo 0",
+        "echo 1",
+        "echo 2",
+    ]
+
+    cursor = client.get("/tasks/results", headers=worker).json()["cursor"]
+    assert (
+        client.get("/tasks/results", params={"since": cursor}, headers=worker).json()[
+            "results"
+        ]
+        == []
+    )
+    client.post(
+        "/tasks/results",
+        json=[
+            {"task_id": ids[0], "stdout": "0", "stderr": "", "exit_code": 0},
+            {"task_id": ids[2], "stdout": "", "stderr": "boom", "exit_code": 1},
+        ],
+        headers=worker,
+    )
+    feed = client.get(
+        "/tasks/results", params={"since": cursor, "wait": 1}, headers=worker
+    ).json()
+    assert [(r["task_id"], r["exit_code"], r["status"]) for r in feed["results"]] == [
+        (ids[0], 0, "done"),
+        (ids[2], 1, "done"),
+    ]
+    filtered = client.get(
+        "/tasks/results", params={"since": cursor, "ids": [ids[2]]}, headers=worker
+    ).json()
+    assert [r["task_id"] for r in filtered["results"]] == [ids[2]]
+    again = client.get(
+        "/tasks/results", params={"since": feed["cursor"]}, headers=worker
+    ).json()
+    assert again == {"cursor": feed["cursor"], "results": []}
+
+    os.environ.pop("API_TOKENS")
+
+
 def _docker_ready() -> bool:
     docker = shutil.which("docker")
     if not docker:
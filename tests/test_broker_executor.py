@@ -0,0 +1,229 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.broker_executor import BrokerExecutor
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeBroker:
+    """In-memory stand-in for the broker's bulk and result feed endpoints."""
+
+    def __init__(self, work=True, post_delay=0.0):
+        self.headers = {}
+        self.cond = threading.Condition()
+        self.pending = []
+        self.results = []
+        self.bulk_sizes = []
+        self.attempts = {}
+        self.post_delay = post_delay
+        self.next_id = 1
+        self.stopped = False
+        if work:
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def post(self, url, json, timeout):
+        assert url.endswith("/tasks/bulk")
+        with self.cond:
+            created = []
+            for item in json:
+                created.append({**item, "id": self.next_id})
+                self.pending.append((self.next_id, item["command"]))
+                self.next_id += 1
+            self.bulk_sizes.append(len(json))
+            self.cond.notify_all()
+        time.sleep(self.post_delay)
+        return FakeResponse(created)
+
+    def get(self, url, params, timeout):
+        assert url.endswith("/tasks/results")
+        with self.cond:
+            if "since" not in params:
+                return FakeResponse({"cursor": len(self.results), "results": []})
+            since = params["since"]
+            ids = set(params.get("ids") or [])
+            deadline = time.monotonic() + params["wait"]
+
+            def rows():
+                return [
+                    r for seq, r in enumerate(self.results, 1)
+                    if seq > since and (not ids or r["task_id"] in ids)
+                ]
+
+            while not rows() and time.monotonic() < deadline:
+                self.cond.wait(deadline - time.monotonic())
+            found = rows()
+            cursor = self.results.index(found[-1]) + 1 if found else since
+            return FakeResponse({"cursor": cursor, "results": found})
+
+    def complete(self, task_id, command):
+        attempt = self.attempts.get(command, 0)
+        self.attempts[command] = attempt + 1
+        failed = command == "false" or (command == "flaky" and attempt == 0)
+        with self.cond:
+            self.results.append(
+                {
+                    "task_id": task_id,
+                    "status": "done",
+                    "stdout": command,
+                    "stderr": "",
+                    "exit_code": int(failed),
+                }
+            )
+            self.cond.notify_all()
+
+    def close(self):
+        self.stopped = True
+
+    def _work(self):
+        while not self.stopped:
+            with self.cond:
+                while not self.pending and not self.stopped:
+                    self.cond.wait(0.1)
+                if not self.pending:
+                    continue
+                task_id, command = self.pending.pop(0)
+            time.sleep(0.01)
+            self.complete(task_id, command)
+
+
+def _task(i, command="echo"):
+    return Task(
+        id=i,
+        description=str(i),
+        dependencies=[],
+        priority=1,
+        status="pending",
+        command=command,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _logs_in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_orchestrator_dispatches_ready_tasks_in_bulk():
+    broker = FakeBroker()
+    executor = BrokerExecutor("http://broker", session=broker, poll_wait=1)
+    tasks = [_task(i, f"echo {i}") for i in range(8)] + [_task(8, "flaky")]
+    memory = MagicMock(spec=Memory)
+    memory.load_tasks.return_value = tasks
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    orch = Orchestrator(
+        Planner(budget=0), executor, reflector, memory, auditor, parallelism=9
+    )
+    # Keep this run's counts out of the process-wide Prometheus registry.
+    orch._runs = orch._tasks_executed = orch._step_duration = MagicMock()
+    try:
+        orch.run("tasks.yml")
+    finally:
+        executor.close()
+
+    assert all(t.status == "done" for t in tasks)
+    # A failed result completes the task like a local run; it is not resubmitted.
+    assert broker.attempts["flaky"] == 1
+    assert sum(broker.bulk_sizes) == 9
+    assert max(broker.bulk_sizes) > 1
+
+
+def test_failed_result_is_logged_not_raised(tmp_path):
+    broker = FakeBroker()
+    executor = BrokerExecutor("http://broker", session=broker, poll_wait=1)
+    try:
+        executor.execute(_task(1, "flaky"))
+    finally:
+        executor.close()
+    assert broker.attempts["flaky"] == 1
+    logs = list((tmp_path / "logs").glob("task-1-*.log"))
+    assert logs and logs[0].read_text() == "flaky"
+
+
+def test_always_failing_task_is_submitted_once():
+    broker = FakeBroker()
+    executor = BrokerExecutor("http://broker", session=broker, poll_wait=1)
+    tasks = [_task(1, "false")]
+    memory = MagicMock(spec=Memory)
+    memory.load_tasks.return_value = tasks
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    orch = Orchestrator(
+        Planner(budget=0), executor, reflector, memory, auditor, parallelism=2
+    )
+    orch._runs = orch._tasks_executed = orch._step_duration = MagicMock()
+    try:
+        orch.run("tasks.yml")
+    finally:
+        executor.close()
+    assert broker.attempts["false"] == 1
+    assert tasks[0].status == "done"
+
+
+def test_task_without_command_is_not_submitted():
+    broker = FakeBroker(work=False)
+    executor = BrokerExecutor("http://broker", session=broker)
+    executor.execute(_task(1, command=None))
+    assert broker.bulk_sizes == []
+
+
+def test_timeout_raises_runtime_error():
+    broker = FakeBroker(work=False)
+    executor = BrokerExecutor(
+        "http://broker", session=broker, poll_wait=0.1, task_timeout=0.2
+    )
+    try:
+        with pytest.raises(RuntimeError, match="did not finish"):
+            executor.execute(_task(1))
+        assert executor._waiting == {} and executor._queued == []
+    finally:
+        executor.close()
+
+
+def test_result_arriving_before_registration_is_not_lost():
+    broker = FakeBroker(work=False, post_delay=0.2)
+    executor = BrokerExecutor(
+        "http://broker", session=broker, poll_wait=1, task_timeout=5
+    )
+    first = threading.Thread(target=executor.execute, args=(_task(1, "slow"),))
+    first.start()
+    while not executor._waiting:
+        time.sleep(0.01)
+
+    def finish_second_early():
+        # Complete task 2 while its bulk request is still in flight, so the
+        # follower sees the result before the task is registered.
+        while broker.next_id < 3:
+            time.sleep(0.01)
+        broker.complete(2, "fast")
+
+    threading.Thread(target=finish_second_early).start()
+    try:
+        executor.execute(_task(2, "fast"))
+        broker.complete(1, "slow")
+        first.join(timeout=5)
+    finally:
+        executor.close()
+    assert not first.is_alive()
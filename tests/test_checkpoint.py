@@ -0,0 +1,112 @@
+import time
+from unittest.mock import MagicMock
+
+from core.checkpoint import RunCheckpoint
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+
+
+def _write_tasks(path, statuses):
+    tasks = [
+        Task(id=i, description=f"t{i}", dependencies=[], priority=1, status=s)
+        for i, s in enumerate(statuses)
+    ]
+    Memory(str(path.with_suffix(".json"))).save_tasks(tasks, str(path))
+
+
+def _orchestrator(memory, budget=0):
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    return Orchestrator(
+        Planner(budget=budget), MagicMock(), reflector, memory, auditor, checkpoint=True
+    )
+
+
+def test_checkpoint_roundtrip_and_throttling(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path / "tasks.yml"), interval=3600)
+    assert checkpoint.load() is None
+    assert checkpoint.update(cost_used=1)
+    assert not checkpoint.update(cost_used=2)
+    assert checkpoint.update(force=True, in_flight=[3])
+    assert checkpoint.writes == 2
+
+    state = RunCheckpoint(str(tmp_path / "tasks.yml")).load()
+    assert state["cost_used"] == 2 and state["in_flight"] == [3]
+    assert not (tmp_path / "tasks.yml.checkpoint.tmp").exists()
+
+
+def test_unreadable_checkpoint_is_ignored(tmp_path):
+    (tmp_path / "tasks.yml.checkpoint").write_text('{"version": 1, "cost')
+    assert RunCheckpoint(str(tmp_path / "tasks.yml")).load() is None
+    (tmp_path / "tasks.yml.checkpoint").write_text('{"version": 99}')
+    assert RunCheckpoint(str(tmp_path / "tasks.yml")).load() is None
+
+
+def test_resume_skips_recent_reflection_and_keeps_budget(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, ["pending", "pending"])
+    memory = Memory(str(tmp_path / "mem.json"))
+
+    first = _orchestrator(memory, budget=10)
+    first.run(str(tasks_file))
+    assert first.reflector.run_cycle.call_count == 1
+    assert first.planner.cost_used == 2
+
+    _write_tasks(tasks_file, ["done", "done", "pending"])
+    second = _orchestrator(memory, budget=10)
+    second.run(str(tasks_file))
+    assert second.resumed
+    second.reflector.run_cycle.assert_not_called()
+    second.auditor.audit.assert_called_once()
+    assert second.planner.cost_used == 3
+
+
+def test_stale_reflection_runs_again(tmp_path, monkeypatch):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, ["pending"])
+    memory = Memory(str(tmp_path / "mem.json"))
+    _orchestrator(memory).run(str(tasks_file))
+
+    RunCheckpoint(str(tasks_file)).update(last_reflection=time.time() - 7200)
+    again = _orchestrator(memory)
+    again.run(str(tasks_file))
+    again.reflector.run_cycle.assert_called_once()
+
+
+def test_interrupted_tasks_are_resumed(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, ["done", "in_progress", "in_progress"])
+    memory = Memory(str(tmp_path / "mem.json"))
+    # Task 2 was dispatched by another process and is left alone.
+    RunCheckpoint(str(tasks_file)).update(in_flight=[1], last_reflection=time.time())
+
+    orch = _orchestrator(memory)
+    orch.run(str(tasks_file))
+
+    executed = [call.args[0].id for call in orch.executor.execute.call_args_list]
+    assert executed == [1]
+    assert [t.status for t in memory.load_tasks(str(tasks_file))] == [
+        "done",
+        "done",
+        "in_progress",
+    ]
+    assert RunCheckpoint(str(tasks_file)).load()["in_flight"] == []
+
+
+def test_pipeline_resume_skips_recent_reflection(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, ["pending"])
+    memory = Memory(str(tmp_path / "mem.json"))
+    RunCheckpoint(str(tasks_file)).update(last_reflection=time.time())
+
+    orch = _orchestrator(memory)
+    orch.mode = "pipeline"
+    orch.run(str(tasks_file))
+    orch.reflector.run_cycle.assert_not_called()
+    orch.executor.execute.assert_called_once()
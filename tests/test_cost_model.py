@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock
+
+from core.cost_model import DurationCostModel, cost_model_from_config
+from core.executor import Executor
+from core.planner import Planner
+from core.result_cache import ResultCache
+from core.task import Task
+from core.tool_runner import ToolResult
+
+
+def _task(task_id, command=None, component=None, priority=1, cost=1):
+    return Task(
+        id=task_id,
+        description="",
+        dependencies=[],
+        priority=priority,
+        status="pending",
+        cost=cost,
+        component=component,
+        command=command,
+    )
+
+
+def test_command_families():
+    family = DurationCostModel.family
+    assert family(_task(1, "python -m pytest -q tests")) == "python -m pytest"
+    assert (
+        family(_task(2, "/usr/bin/python3 scripts/build.py --fast"))
+        == "python3 scripts/build.py"
+    )
+    assert family(_task(3, "echo 'unterminated")) == "echo"
+    assert family(_task(4)) is None
+
+
+def test_estimates_fall_back_from_command_to_component_to_all(tmp_path):
+    model = DurationCostModel(tmp_path / "model.json")
+    model.record(_task(1, "python -m pytest", component="core"), 4.0)
+    model.record(_task(2, "echo hi", component="docs"), 2.0)
+
+    assert model.estimate(_task(3, "python -m pytest -x", component="docs")) == 4.0
+    assert model.estimate(_task(4, "make", component="docs")) == 2.0
+    assert model.estimate(_task(5, "make")) == 3.0
+    assert DurationCostModel(None).cost(_task(6, cost=7)) == 7
+
+
+def test_mean_follows_recent_runs_after_window():
+    model = DurationCostModel(None, window=2)
+    for seconds in (1.0, 1.0, 9.0, 9.0, 9.0):
+        model.record(_task(1, "make"), seconds)
+    assert model.estimate(_task(1, "make")) == 8.0
+
+
+def test_statistics_persist_and_bad_file_is_ignored(tmp_path):
+    path = tmp_path / "model.json"
+    model = DurationCostModel(path, save_every=2)
+    model.record(_task(1, "make"), 3.0)
+    assert not path.exists()
+    model.record(_task(1, "make"), 5.0)
+    assert DurationCostModel(path).estimate(_task(2, "make")) == 4.0
+
+    path.write_text("{broken")
+    assert DurationCostModel(path).stats == {}
+    assert cost_model_from_config({"cost_model": {"enabled": False}}) is None
+
+
+def test_executor_records_command_durations(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = DurationCostModel(None)
+    executor = Executor(cost_model=model)
+    executor.execute(_task(1, "echo hello"))
+    executor.execute(_task(2))
+    assert model.stats["command:echo"][0] == 1
+    assert model.stats["*"][0] == 1
+
+
+def test_cache_hits_and_timeouts_are_not_recorded(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    model = DurationCostModel(None)
+    executor = Executor(
+        cost_model=model, result_cache=ResultCache(tmp_path / "cache.db")
+    )
+    task = _task(1, "echo hello")
+    task.metadata = {"cacheable": True}
+    executor.execute(task)
+    executor.execute(task)
+    assert model.stats["command:echo"][0] == 1
+
+    executor.tool_runner = MagicMock()
+    executor.tool_runner.run.return_value = ToolResult(
+        "sleep 9", -9, "", "", timed_out=True
+    )
+    executor.execute(_task(2, "sleep 9"))
+    assert "command:sleep" not in model.stats
+
+
+def test_planner_budgets_estimated_seconds():
+    model = DurationCostModel(None)
+    model.record(_task(0, "slow"), 5.0)
+    model.record(_task(0, "fast"), 1.0)
+    tasks = [
+        _task(1, "slow", priority=3),
+        _task(2, "fast", priority=2),
+        _task(3, "fast", priority=2),
+    ]
+
+    planner = Planner(budget=6, cost_model=model)
+    assert planner.plan(tasks).id == 1
+    tasks[0].status = "done"
+    assert planner.plan(tasks).id == 2
+    tasks[1].status = "done"
+    assert planner.plan(tasks) is None
+    assert planner.cost_used == 6.0
+
+    batch = Planner(budget=3, cost_model=model).plan_batch(
+        [
+            _task(1, "slow", priority=3),
+            _task(2, "fast", priority=2),
+            _task(3, "fast", priority=2),
+        ],
+        3,
+    )
+    assert [t.id for t in batch.tasks] == [2, 3]
+    assert batch.unused_budget == 1.0
+
+
+def test_critical_paths_follow_new_estimates():
+    model = DurationCostModel(None)
+    gate = _task(1, "short")
+    tasks = [
+        gate,
+        Task(
+            id=2,
+            description="",
+            dependencies=[1],
+            priority=1,
+            status="pending",
+            command="long",
+        ),
+    ]
+    planner = Planner(budget=0, cost_model=model, mode="critical_path")
+    planner.plan(tasks)
+    assert planner._paths[id(gate)] == 2
+    model.record(_task(0, "long"), 10.0)
+    planner.plan(tasks)
+    assert planner._paths[id(gate)] == 20.0
@@ -1,3 +1,5 @@
+import os
+
 from core.memory import Memory  # noqa: E402
 from core.task import Task
 import pytest
@@ -152,3 +154,92 @@ def test_invalid_metadata_fails(tmp_path):
     mem = Memory(tmp_path / "state.json")
     with pytest.raises(ValidationError):
         mem.load_tasks(tasks_file)
+
+
+def _write_rows(path, rows, mtime_ns=10**18):
+    """Write ``rows``; files are backdated so that the task cache keeps them."""
+    path.write_text(yaml.safe_dump(rows))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _row(i, **extra):
+    return {
+        "id": i,
+        "description": str(i),
+        "dependencies": [],
+        "priority": 1,
+        "status": "pending",
+        **extra,
+    }
+
+
+def test_load_tasks_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    from core import memory as memory_mod
+
+    tasks_file = tmp_path / "tasks.yml"
+    _write_rows(tasks_file, [_row(1), _row(2)])
+    mem = Memory(tmp_path / "state.json")
+    first = mem.load_tasks(tasks_file)
+
+    calls = []
+    real_load = yaml.load
+    monkeypatch.setattr(
+        memory_mod.yaml, "load", lambda *a, **k: calls.append(1) or real_load(*a, **k)
+    )
+    first[0].status = "done"
+    first[0].dependencies.append(2)
+    second = Memory(tmp_path / "other.json").load_tasks(tasks_file)
+    assert calls == []
+    # Callers get their own objects, so earlier edits do not leak.
+    assert second[0].status == "pending" and second[0].dependencies == []
+
+    _write_rows(tasks_file, [_row(1), _row(2), _row(3)])
+    assert [t.id for t in mem.load_tasks(tasks_file)] == [1, 2, 3]
+    assert calls == [1]
+
+
+def test_unchanged_rows_skip_validation(tmp_path, monkeypatch):
+    from core import memory as memory_mod
+
+    tasks_file = tmp_path / "tasks.yml"
+    _write_rows(tasks_file, [_row(1), _row(2)])
+    mem = Memory(tmp_path / "state.json")
+    mem.load_tasks(tasks_file)
+
+    checked = []
+    real = memory_mod._ITEM_VALIDATOR
+
+    class Recording:
+        def iter_errors(self, row):
+            checked.append(row["id"])
+            return real.iter_errors(row)
+
+    monkeypatch.setattr(memory_mod, "_ITEM_VALIDATOR", Recording())
+    _write_rows(tasks_file, [_row(1), _row(2, priority=3), _row(3)])
+    mem.load_tasks(tasks_file)
+    assert checked == [2, 3]
+
+    _write_rows(tasks_file, [_row(1), _row(2, priority=9)])
+    with pytest.raises(ValidationError) as exc:
+        mem.load_tasks(tasks_file)
+    assert list(exc.value.path) == [1, "priority"]
+
+
+def test_recent_files_are_not_cached(tmp_path):
+    from core import memory as memory_mod
+
+    tasks_file = tmp_path / "tasks.yml"
+    mem = Memory(tmp_path / "state.json")
+    _write_rows(tasks_file, [_row(1, priority=1)], mtime_ns=None)
+    mtime = tasks_file.stat().st_mtime_ns
+    assert mem.load_tasks(tasks_file)[0].priority == 1
+    # A same-size rewrite within one timestamp tick leaves the stat key as is.
+    _write_rows(tasks_file, [_row(1, priority=2)], mtime_ns=mtime)
+    assert mem.load_tasks(tasks_file)[0].priority == 2
+
+    tmp_file = tmp_path / "tasks.yml.tmp"
+    mem.save_tasks(mem.load_tasks(tasks_file), tmp_file)
+    os.replace(tmp_file, tasks_file)
+    mem.save_tasks(mem.load_tasks(tasks_file), tasks_file)
+    assert tmp_file.resolve() not in memory_mod._task_cache.validated
@@ -41,3 +41,72 @@ def test_reconcile_merges_by_title(tmp_path):
     assert set(merged.dependencies) == {1, 2}
     assert merged.description == "b"
 
+
+def test_reconcile_merges_reworded_descriptions(tmp_path):
+    mem = Memory(Path(tmp_path / "state.json"))
+    existing = [
+        Task(
+            id=1,
+            description="Refactor the planner module to reduce cyclomatic complexity",
+            dependencies=[],
+            priority=2,
+            status="pending",
+        ),
+        Task(
+            id=2,
+            description="Add retry logging to the broker worker",
+            dependencies=[1],
+            priority=1,
+            status="pending",
+        ),
+    ]
+    incoming = [
+        Task(
+            id=3,
+            description=(
+                "Refactor the planner module to reduce the cyclomatic complexity"
+            ),
+            dependencies=[],
+            priority=4,
+            status="pending",
+            epic="E",
+        ),
+        Task(
+            id=4,
+            description="Write documentation for the plugin marketplace",
+            dependencies=[3],
+            priority=1,
+            status="pending",
+        ),
+    ]
+    critiques = {1: {"existing": 5}, 3: {"new": 2}}
+
+    assert len(mem.reconcile_tasks(list(existing), list(incoming), critiques)) == 4
+
+    result = mem.reconcile_tasks(
+        existing, incoming, critiques, near_duplicate_threshold=0.7
+    )
+    assert [t.id for t in result] == [1, 2, 4]
+    merged = result[0]
+    # The higher scored variant is kept and takes the other's fields.
+    assert merged.description.endswith("reduce cyclomatic complexity")
+    assert merged.priority == 4 and merged.epic == "E"
+    # Dependencies on the merged-away task point at the survivor.
+    assert result[2].dependencies == [1]
+
+
+def test_lsh_finds_similar_text_and_rejects_unrelated():
+    from core.near_duplicates import MinHashLSH, choose_bands
+
+    index = MinHashLSH(threshold=0.6)
+    assert index.bands * index.rows <= index.num_perm
+    assert (1 / index.bands) ** (1 / index.rows) <= 0.6
+    assert choose_bands(64, 0.7) == 10
+
+    index.add("a", "Improve test coverage for the executor retry path")
+    index.add("b", "Document the configuration environment variables")
+    key, similarity = index.query("improve test coverage for executor retry paths")
+    assert key == "a" and similarity >= 0.6
+    assert index.query("Migrate the broker database to PostgreSQL") is None
+    assert index.query_or_add("c", "Migrate the broker database to PostgreSQL") is None
+    assert len(index) == 3
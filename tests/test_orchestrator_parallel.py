@@ -0,0 +1,294 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+
+
+def _task(task_id, deps=(), priority=1):
+    return Task(
+        id=task_id,
+        description=str(task_id),
+        dependencies=list(deps),
+        priority=priority,
+        status="pending",
+    )
+
+
+class SleepExecutor:
+    def __init__(self, delay=0.05, fail_once=()):
+        self.delay = delay
+        self.fail_once = set(fail_once)
+        self.lock = threading.Lock()
+        self.events = []
+        self.active = 0
+        self.peak = 0
+
+    def execute(self, task):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.events.append(("start", task.id))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.events.append(("end", task.id))
+            if task.id in self.fail_once:
+                self.fail_once.discard(task.id)
+                raise RuntimeError("boom")
+
+
+def _orchestrator(tasks, executor, parallelism, planner=None, pool="thread"):
+    memory = MagicMock(spec=Memory)
+    memory.load_tasks.return_value = tasks
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    orch = Orchestrator(
+        planner or Planner(budget=0),
+        executor,
+        reflector,
+        memory,
+        auditor,
+        parallelism=parallelism,
+        pool=pool,
+    )
+    return orch, memory, auditor
+
+
+def _makespan(parallelism):
+    tasks = [_task(i) for i in range(16)]
+    executor = SleepExecutor(delay=0.05)
+    orch, _, _ = _orchestrator(tasks, executor, parallelism)
+    start = time.perf_counter()
+    orch.run("tasks.yml")
+    assert all(t.status == "done" for t in tasks)
+    return time.perf_counter() - start, executor.peak
+
+
+def test_wide_dag_makespan_scales_with_parallelism():
+    sequential, _ = _makespan(1)
+    parallel, peak = _makespan(8)
+    assert peak == 8
+    assert parallel < sequential / 4
+
+
+def test_dependencies_are_respected():
+    tasks = [
+        _task("a"),
+        _task("b", deps=["a"]),
+        _task("c"),
+        _task("d", deps=["b", "c"]),
+    ]
+    executor = SleepExecutor(delay=0.02)
+    orch, _, _ = _orchestrator(tasks, executor, parallelism=4)
+    orch.run("tasks.yml")
+    order = executor.events
+    assert order.index(("end", "a")) < order.index(("start", "b"))
+    assert order.index(("end", "b")) < order.index(("start", "d"))
+    assert order.index(("end", "c")) < order.index(("start", "d"))
+    assert all(t.status == "done" for t in tasks)
+
+
+def test_status_saved_as_tasks_complete():
+    tasks = [_task(i) for i in range(3)]
+    orch, memory, auditor = _orchestrator(
+        tasks, SleepExecutor(delay=0.01), parallelism=3
+    )
+    orch.run("tasks.yml")
+    # One save per status change: in_progress and done for each task.
+    assert memory.save_tasks.call_count == 6
+    assert auditor.audit.called
+
+
+def test_failed_task_is_retried():
+    tasks = [_task("x"), _task("y")]
+    executor = SleepExecutor(delay=0.01, fail_once={"x"})
+    orch, _, _ = _orchestrator(tasks, executor, parallelism=2)
+    orch.run("tasks.yml")
+    assert executor.events.count(("start", "x")) == 2
+    assert all(t.status == "done" for t in tasks)
+
+
+def test_planner_budget_limits_dispatch():
+    tasks = [_task(i) for i in range(10)]
+    executor = SleepExecutor(delay=0.01)
+    orch, _, _ = _orchestrator(
+        tasks, executor, parallelism=4, planner=Planner(budget=3)
+    )
+    orch.run("tasks.yml")
+    assert sum(1 for t in tasks if t.status == "done") == 3
+
+
+def test_unexpected_error_propagates():
+    class Broken:
+        def execute(self, task):
+            raise KeyError("bad")
+
+    orch, _, _ = _orchestrator([_task(1)], Broken(), parallelism=2)
+    with pytest.raises(KeyError):
+        orch.run("tasks.yml")
+
+
+def test_process_pool_executes_tasks():
+    tasks = [_task(i) for i in range(4)]
+    orch, _, _ = _orchestrator(tasks, None, parallelism=2, pool="process")
+    orch.run("tasks.yml")
+    assert all(t.status == "done" for t in tasks)
+
+
+def test_unknown_pool_rejected():
+    with pytest.raises(ValueError):
+        _orchestrator([], SleepExecutor(), parallelism=2, pool="gpu")
+
+
+def test_audit_cadence_batches_completions(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_AUDIT_EVERY", "4")
+    tasks = [_task(i) for i in range(10)]
+    orch, _, auditor = _orchestrator(tasks, SleepExecutor(delay=0), parallelism=1)
+    orch.run("tasks.yml")
+    assert all(t.status == "done" for t in tasks)
+    # Two full batches plus the remaining completions before halting.
+    assert auditor.audit.call_count == 3
+
+
+def test_deferred_audit_tasks_are_executed(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_AUDIT_EVERY", "0")
+    tasks = [_task(1), _task(2)]
+    executor = SleepExecutor(delay=0)
+    orch, _, auditor = _orchestrator(tasks, executor, parallelism=2)
+    auditor.audit.side_effect = [
+        [
+            {
+                "id": 3,
+                "description": "refactor",
+                "dependencies": [],
+                "priority": 1,
+                "status": "pending",
+            }
+        ],
+        [],
+    ]
+    orch.run("tasks.yml")
+    assert auditor.audit.call_count == 2
+    assert [t.id for t in tasks] == [1, 2, 3]
+    assert all(t.status == "done" for t in tasks)
+
+
+def test_pipeline_overlaps_audit_with_execution():
+    tasks = [_task(i) for i in range(6)]
+    executor = SleepExecutor(delay=0.02)
+    orch, memory, auditor = _orchestrator(tasks, executor, parallelism=2)
+    orch.mode = "pipeline"
+    audits = []
+
+    def slow_audit(snapshot):
+        audits.append(("start", len(executor.events)))
+        time.sleep(0.1)
+        audits.append(("end", len(executor.events)))
+        if len(audits) == 2:
+            return [
+                {
+                    "id": 100,
+                    "description": "audit",
+                    "dependencies": [],
+                    "priority": 1,
+                    "status": "pending",
+                }
+            ]
+        return []
+
+    auditor.audit.side_effect = slow_audit
+    orch.run("tasks.yml")
+
+    assert all(t.status == "done" for t in tasks)
+    assert tasks[-1].id == 100
+    # Tasks kept executing while the first audit ran.
+    assert audits[1][1] > audits[0][1]
+    stats = orch.pipeline.metrics.summary()
+    assert stats["execute"]["count"] == 7
+    assert stats["audit"]["count"] == auditor.audit.call_count
+    assert all(depth == 0 for depth in orch.pipeline.metrics.depth.values())
+
+
+def test_pipeline_merges_reflection_and_renumbers_collisions():
+    tasks = [_task(1), _task(2)]
+    executor = SleepExecutor(delay=0.05)
+    orch, _, auditor = _orchestrator(tasks, executor, parallelism=2)
+    orch.mode = "pipeline"
+    new = {
+        "id": 3,
+        "description": "new",
+        "dependencies": [],
+        "priority": 1,
+        "status": "pending",
+    }
+    follow = {
+        "id": 4,
+        "description": "follow",
+        "dependencies": [3],
+        "priority": 1,
+        "status": "pending",
+    }
+
+    def reflect(snapshot, save=True):
+        time.sleep(0.2)
+        # The snapshot still lists the tasks as pending; that must not win.
+        return snapshot + [dict(new), dict(follow)]
+
+    audited = []
+
+    def audit(snapshot):
+        audited.append(len(snapshot))
+        return [{**new, "description": "audit"}] if len(audited) == 1 else []
+
+    orch.reflector.run_cycle.side_effect = reflect
+    auditor.audit.side_effect = audit
+    orch.run("tasks.yml")
+
+    assert sorted(t.id for t in tasks) == [1, 2, 3, 4, 5]
+    by_desc = {t.description: t for t in tasks}
+    assert by_desc["follow"].dependencies == [by_desc["new"].id]
+    assert all(t.status == "done" for t in tasks)
+    assert executor.events.count(("start", 1)) == 1
+    # Only the coordinator saves; the reflector must not write its snapshot.
+    assert orch.reflector.run_cycle.call_args.kwargs == {"save": False}
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        Orchestrator(None, None, None, None, None, mode="dag")
+
+
+def test_pipeline_interval_audit(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_AUDIT_EVERY", "0")
+    monkeypatch.setenv("ORCHESTRATOR_AUDIT_INTERVAL", "0.05")
+    tasks = [_task(i) for i in range(8)]
+    orch, _, auditor = _orchestrator(tasks, SleepExecutor(delay=0.03), parallelism=1)
+    orch.mode = "pipeline"
+    orch.run("tasks.yml")
+    assert all(t.status == "done" for t in tasks)
+    assert 2 <= auditor.audit.call_count < 8
+
+
+def test_batch_planning_fills_free_slots(monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_BATCH_PLANNING", "true")
+    tasks = [_task(i, priority=i) for i in range(6)] + [_task(6, deps=[5])]
+    executor = SleepExecutor(delay=0.02)
+    planner = Planner(budget=0)
+    planner.plan_batch = MagicMock(wraps=planner.plan_batch)
+    orch, _, _ = _orchestrator(tasks, executor, parallelism=3, planner=planner)
+    orch.run("tasks.yml")
+
+    assert all(t.status == "done" for t in tasks)
+    assert planner.plan_batch.call_args_list[0].args[1] == 3
+    started = [task_id for kind, task_id in executor.events if kind == "start"]
+    assert set(started[:3]) == {3, 4, 5}
@@ -0,0 +1,84 @@
+import pstats
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+
+
+def _orchestrator(executor):
+    memory = MagicMock(spec=Memory)
+    memory.load_tasks.return_value = [
+        Task(id=1, description="t", dependencies=[], priority=1, status="pending")
+    ]
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    return Orchestrator(Planner(budget=0), executor, reflector, memory, auditor)
+
+
+class SlowExecutor:
+    def execute(self, task):
+        time.sleep(0.05)
+
+
+def test_steps_record_durations_and_spans():
+    orch = _orchestrator(SlowExecutor())
+    orch._step_duration = MagicMock()
+    orch._tracer = MagicMock()
+    orch.run("tasks.yml")
+
+    recorded = {
+        call.args[1]["step"]: call.args[0]
+        for call in orch._step_duration.record.call_args_list
+    }
+    assert set(recorded) == {
+        "load_tasks",
+        "reflect",
+        "execute_task",
+        "audit_and_extend",
+    }
+    assert recorded["execute_task"] >= 0.05
+    spans = {
+        call.args[0]: call.kwargs["attributes"]
+        for call in orch._tracer.start_as_current_span.call_args_list
+    }
+    assert spans["orchestrator.execute_task"]["task.id"] == "1"
+    assert spans["orchestrator.load_tasks"]["tasks.file"] == "tasks.yml"
+
+
+def test_failed_step_records_error_outcome():
+    orch = _orchestrator(None)
+    orch._step_duration = MagicMock()
+    with pytest.raises(KeyError):
+        orch._run_step("broken", lambda: {}["missing"])
+    assert orch._step_duration.record.call_args.args[1] == {
+        "step": "broken",
+        "outcome": "error",
+    }
+
+
+def test_slow_steps_are_profiled(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORCHESTRATOR_PROFILE_THRESHOLD", "0.03")
+    monkeypatch.setenv("ORCHESTRATOR_PROFILE_DIR", str(tmp_path))
+    orch = _orchestrator(SlowExecutor())
+    orch.run("tasks.yml")
+
+    assert [p.name.split("-")[0] for p in orch.profiles] == ["execute_task"]
+    stats = pstats.Stats(str(orch.profiles[0]))
+    assert any(func[2] == "execute" for func in stats.stats)
+
+
+def test_profiling_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    orch = _orchestrator(SlowExecutor())
+    orch.run("tasks.yml")
+    assert orch.profiles == []
+    assert not (tmp_path / "profiles").exists()
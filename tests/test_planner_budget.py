@@ -35,3 +35,83 @@ def test_refuse_over_budget_task():
     assert planner.plan(tasks).id == "t1"
     assert planner.plan(tasks) is None
 
+
+def test_plan_batch_maximizes_priority_within_budget():
+    planner = Planner(budget=5)
+    tasks = [
+        make_task("big", priority=10, cost=4),
+        make_task("a", priority=6, cost=2),
+        make_task("b", priority=6, cost=3),
+    ]
+    batch = planner.plan_batch(tasks, 3)
+    assert [t.id for t in batch.tasks] == ["a", "b"]
+    assert batch.cost == 5 and batch.unused_budget == 0 and batch.exact
+    assert planner.cost_used == 5
+    assert planner.plan_batch(tasks, 3).tasks == []
+
+
+def test_plan_batch_respects_size_and_reports_unused_budget():
+    planner = Planner(budget=10)
+    tasks = [make_task(f"t{i}", priority=i) for i in range(5)]
+    batch = planner.plan_batch(tasks, 2)
+    assert [t.id for t in batch.tasks] == ["t4", "t3"]
+    assert batch.unused_budget == 8
+
+
+def test_plan_batch_without_budget_takes_highest_priorities():
+    planner = Planner(budget=0)
+    tasks = [
+        make_task("low", priority=1),
+        make_task("high", priority=5),
+        make_task("mid", priority=3),
+    ]
+    dependent = Task(
+        id="dep", description="", dependencies=["high"], priority=9, status="pending"
+    )
+    batch = planner.plan_batch(tasks + [dependent], 2)
+    assert [t.id for t in batch.tasks] == ["high", "mid"]
+    assert batch.unused_budget is None
+
+
+def test_plan_batch_greedy_fallback_for_large_inputs():
+    planner = Planner(budget=5)
+    planner.batch_exact_limit = 0
+    tasks = [
+        make_task("big", priority=10, cost=4),
+        make_task("a", priority=6, cost=2),
+        make_task("b", priority=6, cost=3),
+    ]
+    batch = planner.plan_batch(tasks, 3)
+    assert not batch.exact
+    assert batch.cost <= 5 and sum(t.priority for t in batch.tasks) >= 10
+
+
+def test_incremental_plan_batch_matches_stateless():
+    def tasks():
+        return [make_task(f"t{i}", priority=i % 4, cost=1 + i % 3) for i in range(30)]
+
+    stateless = Planner(budget=20).plan_batch(tasks(), 8)
+    incremental = Planner(budget=20, incremental=True).plan_batch(tasks(), 8)
+    assert [t.id for t in stateless.tasks] == [t.id for t in incremental.tasks]
+
+
+def test_plan_batch_is_optimal_on_small_inputs():
+    import itertools
+    import random
+
+    rng = random.Random(0)
+    for _ in range(30):
+        tasks = [
+            make_task(f"t{i}", priority=rng.randint(0, 9), cost=rng.randint(1, 4))
+            for i in range(7)
+        ]
+        budget, k = rng.randint(1, 10), rng.randint(1, 4)
+        best = max(
+            sum(t.priority for t in combo)
+            for size in range(k + 1)
+            for combo in itertools.combinations(tasks, size)
+            if sum(t.cost for t in combo) <= budget
+        )
+        batch = Planner(budget=budget).plan_batch(tasks, k)
+        assert len(batch.tasks) <= k and batch.cost <= budget
+        assert sum(t.priority for t in batch.tasks) == best
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from core.planner import Planner
+from core.planner_utils import critical_path_lengths
+from core.task import Task
+
+
+def _task(task_id, deps=(), priority=1, cost=1, status="pending"):
+    return Task(
+        id=task_id,
+        description="",
+        dependencies=list(deps),
+        priority=priority,
+        status=status,
+        cost=cost,
+    )
+
+
+def _chain_and_side_tasks():
+    chain = [_task("a")] + [_task(n, deps=[p]) for p, n in zip("abc", "bcd")]
+    side = [_task(n, priority=5) for n in "efg"]
+    return chain + side
+
+
+def _makespan(planner, tasks, workers=2):
+    """Simulate unit-time list scheduling on ``workers`` slots."""
+    time = 0
+    while True:
+        started = []
+        while len(started) < workers and (task := planner.plan(tasks)) is not None:
+            task.status = "in_progress"
+            planner.task_updated(task)
+            started.append(task)
+        if not started:
+            return time
+        for task in started:
+            task.status = "done"
+            planner.task_updated(task)
+        time += 1
+
+
+def test_critical_path_lengths_follow_heaviest_chain():
+    tasks = [
+        _task(1, cost=2),
+        _task(2, deps=[1], cost=3),
+        _task(3, deps=[1], cost=1),
+        _task(4, deps=[2, 3], cost=1),
+        _task(5, status="done", cost=9),
+    ]
+    lengths = critical_path_lengths(tasks, lambda t: t.cost)
+    assert [lengths[id(t)] for t in tasks] == [6, 4, 2, 1, 0]
+
+
+def test_low_priority_gate_of_long_chain_runs_first():
+    tasks = _chain_and_side_tasks()
+    assert Planner(budget=0).plan(tasks).id == "e"
+    assert (
+        Planner(budget=0, mode="critical_path", critical_path_weight=2).plan(tasks).id
+        == "a"
+    )
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_critical_path_mode_shortens_makespan(incremental):
+    by_priority = _makespan(
+        Planner(budget=0, incremental=incremental), _chain_and_side_tasks()
+    )
+    by_path = _makespan(
+        Planner(
+            budget=0,
+            incremental=incremental,
+            mode="critical_path",
+            critical_path_weight=2,
+        ),
+        _chain_and_side_tasks(),
+    )
+    assert (by_priority, by_path) == (5, 4)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_cycle_is_reported_up_front(incremental):
+    tasks = [
+        _task("x", deps=["z"]),
+        _task("y", deps=["x"]),
+        _task("z", deps=["y"]),
+        _task("free"),
+    ]
+    planner = Planner(budget=0, incremental=incremental, mode="critical_path")
+    with pytest.raises(ValueError, match="Dependency cycle detected: .*x"):
+        planner.plan(tasks)
+
+
+def test_incremental_matches_stateless_in_critical_path_mode():
+    def tasks():
+        rng = random.Random(3)
+        return [
+            _task(
+                i,
+                deps=rng.sample(range(i), k=min(i, rng.randint(0, 2))),
+                priority=rng.randint(0, 5),
+                cost=rng.randint(1, 3),
+            )
+            for i in range(120)
+        ]
+
+    orders = []
+    for incremental in (False, True):
+        planner = Planner(
+            budget=0,
+            incremental=incremental,
+            mode="critical_path",
+            critical_path_weight=0.5,
+        )
+        items, order = tasks(), []
+        while (task := planner.plan(items)) is not None:
+            order.append(task.id)
+            task.status = "done"
+            planner.task_updated(task)
+        orders.append(order)
+    assert orders[0] == orders[1] and len(orders[0]) == 120
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        Planner(mode="fastest")
@@ -0,0 +1,115 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.planner_index import PlannerIndex
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+
+
+def _random_tasks(rng, n, start=0):
+    tasks = []
+    for i in range(start, start + n):
+        deps = rng.sample(range(i), k=min(i, rng.randint(0, 3)))
+        if rng.random() < 0.05:
+            # Dependency on a task that only exists once more tasks are added.
+            deps.append(i + 100)
+        status = rng.choice(["pending"] * 6 + ["done", "in_progress"])
+        tasks.append(
+            Task(
+                id=i,
+                description="",
+                dependencies=deps,
+                priority=rng.randint(0, 5),
+                status=status,
+            )
+        )
+    return tasks
+
+
+def _drain(planner, tasks, rng):
+    """Plan until nothing is ready, completing or failing tasks at random."""
+    order = []
+    while (task := planner.plan(tasks)) is not None:
+        order.append(task.id)
+        task.status = "in_progress"
+        planner.task_updated(task)
+        task.status = "pending" if rng.random() < 0.1 else "done"
+        planner.task_updated(task)
+    return order
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_planner_matches_stateless_planner(seed):
+    orders = []
+    for incremental in (False, True):
+        rng = random.Random(seed)
+        tasks = _random_tasks(rng, 150)
+        planner = Planner(budget=0, incremental=incremental)
+        order = _drain(planner, tasks, rng)
+        # Tasks added later, including ones satisfying missing dependencies.
+        tasks.extend(_random_tasks(rng, 50, start=150))
+        order += _drain(planner, tasks, rng)
+        orders.append(order)
+    assert orders[0] == orders[1]
+    assert len(orders[0]) > 50
+
+
+def test_index_tracks_reverse_dependencies():
+    tasks = [
+        Task(id=1, description="", dependencies=[], priority=1, status="pending"),
+        Task(id=2, description="", dependencies=[1], priority=9, status="pending"),
+    ]
+    index = PlannerIndex(tasks)
+    assert index.peek() is tasks[0]
+    tasks[0].status = "done"
+    index.update(tasks[0])
+    assert index.peek() is tasks[1]
+    tasks[0].status = "pending"
+    index.update(tasks[0])
+    assert index.peek() is tasks[0]
+
+
+def test_index_rejects_duplicate_ids():
+    tasks = [
+        Task(id=1, description="", dependencies=[], priority=1, status="pending")
+    ] * 2
+    with pytest.raises(ValueError):
+        Planner(incremental=True).plan(tasks)
+
+
+def test_orchestrator_reports_status_changes_to_planner():
+    tasks = [
+        Task(
+            id=i,
+            description="",
+            dependencies=[i - 1] if i else [],
+            priority=1,
+            status="pending",
+        )
+        for i in range(20)
+    ]
+    memory = MagicMock(spec=Memory)
+    memory.load_tasks.return_value = tasks
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    executor = MagicMock()
+    orch = Orchestrator(
+        Planner(budget=0, incremental=True),
+        executor,
+        reflector,
+        memory,
+        auditor,
+        parallelism=4,
+    )
+    orch._runs = orch._tasks_executed = orch._step_duration = MagicMock()
+    orch.run("tasks.yml")
+    assert [c.args[0].id for c in executor.execute.call_args_list] == list(range(20))
+    assert all(t.status == "done" for t in tasks)
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from core.async_runner import AsyncRunner
+from core.python_pool import PythonPool, parse_python_command
+from core.tool_runner import ToolRunner
+
+
+@pytest.fixture
+def pool():
+    p = PythonPool(size=1)
+    yield p
+    p.close()
+
+
+def test_parse_python_command():
+    assert parse_python_command(["python", "-c", "pass", "x"]) == (
+        "code",
+        "pass",
+        ["-c", "x"],
+    )
+    assert parse_python_command(["python3", "-u", "run.py", "a"]) == (
+        "script",
+        "run.py",
+        ["run.py", "a"],
+    )
+    for flag in ("-I", "-E", "-s", "-S"):
+        assert parse_python_command(["python", flag, "run.py"]) is None
+    assert parse_python_command(["python", "-m", "pytest"]) is None
+    assert parse_python_command(["echo", "hi"]) is None
+
+
+def test_run_code_captures_output_and_exit_code(pool):
+    result = pool.run(
+        ["python", "-c", "import sys; print(sys.argv[1]); sys.exit(3)", "hi"]
+    )
+    assert result["stdout"].strip() == "hi"
+    assert result["exit_code"] == 3
+    assert not result["timed_out"]
+
+
+def test_state_does_not_leak_between_commands(pool):
+    pool.run(["python", "-c", "import json; json.leaked = True"])
+    result = pool.run(["python", "-c", "import json; print(hasattr(json, 'leaked'))"])
+    assert result["stdout"].strip() == "False"
+
+
+def test_exception_reports_traceback(pool):
+    result = pool.run(["python", "-c", "raise ValueError('boom')"])
+    assert result["exit_code"] == 1
+    assert "ValueError: boom" in result["stderr"]
+
+
+def test_timeout_kills_child(pool):
+    result = pool.run(["python", "-c", "import time; time.sleep(30)"], timeout=0.3)
+    assert result["timed_out"]
+    assert result["duration"] < 5
+
+
+def test_tool_runner_uses_pool_in_sandbox(tmp_path, pool):
+    (tmp_path / "script.py").write_text("import os; print(os.getcwd())")
+    runner = ToolRunner(tmp_path, allowed_commands=["python"], python_pool=pool)
+    result = runner.run("python script.py")
+    assert result.returncode == 0
+    assert result.stdout.strip() == str(tmp_path.resolve())
+
+
+def test_async_runner_dispatches_to_pool(pool):
+    runner = AsyncRunner(python_pool=pool)
+    result = asyncio.run(runner.run(["python", "-c", "print('warm')"]))
+    assert result["stdout"].strip() == "warm"
+    assert result["exit_code"] == 0
+    assert "cancelled" not in result
@@ -1,6 +1,8 @@
+import os
 import yaml  # noqa: E402
 import logging
 import pytest
+from unittest.mock import MagicMock
 from core.reflector import Reflector  # noqa: E402
 
 
@@ -223,3 +225,66 @@ def test_metrics_influence_decisions(tmp_path):
     assert any(d.get("reason") == "Low test coverage" for d in decisions["process_improvements"])
     assert any(d.get("reason") == "outdated_dependencies" for d in decisions["architectural_improvements"])
 
+
+def _age(path, seconds=10):
+    stamp = path.stat().st_mtime - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_run_cycle_reads_metrics_once(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    tasks_file.write_text(
+        "- id: 1\n"
+        "  description: base\n"
+        "  component: core\n"
+        "  dependencies: []\n"
+        "  priority: 1\n"
+        "  status: pending\n"
+    )
+    code_file = tmp_path / "code.py"
+    code_file.write_text("def foo():\n    return 1\n")
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text('{"coverage": 90, "cpu": 0.5}')
+
+    provider = MetricsProvider(metrics_file)
+    refl = Reflector(
+        tasks_path=tasks_file, analysis_paths=[code_file], metrics_provider=provider
+    )
+    assert refl.rl_agent is not None
+    tasks = yaml.safe_load(tasks_file.read_text())
+    refl.run_cycle(tasks)
+    # RL training, analysis, health and trend stages share one read.
+    assert provider.reads == 1
+
+
+def test_metrics_provider_caches_until_file_changes(tmp_path):
+    metrics_file = tmp_path / "metrics.json"
+    metrics_file.write_text('{"coverage": 90}')
+    provider = MetricsProvider(metrics_file)
+
+    # A file modified just now may change again within the same timestamp.
+    provider.collect()
+    provider.collect()
+    assert provider.reads == 2
+
+    _age(metrics_file)
+    first = provider.collect()
+    first["coverage"] = 0
+    assert provider.collect() == {"coverage": 90}
+    assert provider.reads == 3
+
+    metrics_file.write_text('{"coverage": 95}')
+    assert provider.collect() == {"coverage": 95}
+    assert provider.reads == 4
+
+
+def test_run_cycle_without_save_only_returns_tasks(tmp_path, monkeypatch):
+    refl = Reflector(tasks_path=tmp_path / "tasks.yml", analysis_paths=[])
+    fields = {"component": "core", "dependencies": [], "priority": 1}
+    fields["status"] = "pending"
+    base = [{"id": 1, "description": "base", **fields}]
+    new = {"id": 2, "description": "new", **fields}
+    monkeypatch.setattr(refl, "execute", lambda decisions, tasks: [new])
+    monkeypatch.setattr(refl, "_save_tasks", MagicMock())
+    assert refl.run_cycle(base, save=False) == base + [new]
+    refl._save_tasks.assert_not_called()
@@ -0,0 +1,66 @@
+from unittest.mock import MagicMock
+
+from core.executor import Executor
+from core.result_cache import ResultCache, cacheable
+from core.tool_runner import ToolRunner
+
+
+def test_key_changes_with_inputs_and_env(tmp_path, monkeypatch):
+    src = tmp_path / "input.txt"
+    src.write_text("a")
+    first = ResultCache.key("cat input.txt", ["input.txt"], root=tmp_path)
+    assert first == ResultCache.key("cat input.txt", ["input.txt"], root=tmp_path)
+    src.write_text("b")
+    assert ResultCache.key("cat input.txt", ["input.txt"], root=tmp_path) != first
+
+    monkeypatch.setenv("CACHE_TEST_VAR", "1")
+    with_env = ResultCache.key("echo", env=["CACHE_TEST_VAR"])
+    monkeypatch.setenv("CACHE_TEST_VAR", "2")
+    assert ResultCache.key("echo", env=["CACHE_TEST_VAR"]) != with_env
+
+
+def test_only_tasks_declaring_inputs_are_cacheable():
+    assert not cacheable(None)
+    assert not cacheable({"inputs": []})
+    assert cacheable({"inputs": ["a.txt"]}) and cacheable({"env": ["HOME"]})
+    assert cacheable({"cacheable": True})
+    assert not cacheable({"cacheable": False, "inputs": ["a.txt"]})
+
+
+def test_get_put_and_counters(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db")
+    assert cache.get("k") is None
+    cache.put("k", "out", "err", 0)
+    assert cache.get("k") == {"stdout": "out", "stderr": "err", "exit_code": 0}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_respects_size_cap(tmp_path):
+    cache = ResultCache(tmp_path / "cache.db", max_bytes=10)
+    cache.put("a", "xxxx", "", 0)
+    cache.put("b", "yyyy", "", 0)
+    cache.get("a")
+    cache.put("c", "zzzz", "", 0)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+
+
+def test_executor_serves_repeat_command_from_cache(tmp_path, task_factory, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = ToolRunner(tmp_path / "sandbox", allowed_commands=["echo"])
+    runner.run = MagicMock(wraps=runner.run)
+    exe = Executor(tool_runner=runner, result_cache=ResultCache(tmp_path / "cache.db"))
+    exe.logger = MagicMock()
+    task = task_factory(id="c", command="echo cached", metadata={"cacheable": True})
+    uncached = task_factory(id="u", command="echo side effect")
+
+    exe.execute(task)
+    exe.execute(task)
+    exe.execute(uncached)
+    exe.execute(uncached)
+
+    assert runner.run.call_count == 3
+    logs = sorted((tmp_path / "logs").glob("task-c-*.log"))
+    assert logs and logs[-1].read_text().strip() == "cached"
@@ -0,0 +1,214 @@
+import math
+import signal
+
+import pytest
+
+from worker.autoscaler import AutoScaler, split_slots
+from worker.scaling import (
+    LoadEstimator,
+    LoadSample,
+    PredictivePolicy,
+    QueueLengthPolicy,
+    ScalingPolicy,
+)
+
+
+def replay(policy, arrivals, service_rate=1.0, dt=1.0):
+    """Feed a per-tick arrival trace to ``policy`` and return the worker counts."""
+    queue = 0
+    workers = 0
+    history = []
+    completions = None
+    for tick, arrived in enumerate(arrivals):
+        sample = LoadSample(
+            time=tick * dt,
+            queue_length=queue,
+            arrivals=arrived,
+            completions=completions,
+        )
+        workers = policy.decide(sample, workers)
+        history.append(workers)
+        queue += arrived
+        completions = min(queue, math.floor(workers * service_rate * dt))
+        queue -= completions
+    return history
+
+
+def changes(history):
+    return sum(1 for a, b in zip(history, history[1:]) if a != b)
+
+
+def test_steady_load_converges_to_throughput_target():
+    policy = PredictivePolicy(max_workers=10, scale_down_cooldown=5)
+    history = replay(policy, [4] * 40)
+    assert history[-1] == math.ceil(4 / 0.8)
+    assert changes(history[20:]) == 0
+
+
+def test_blips_cause_less_churn_than_queue_length_policy():
+    trace = ([0] * 4 + [3]) * 8
+    legacy = replay(QueueLengthPolicy(max_workers=4), trace)
+    predictive = replay(PredictivePolicy(max_workers=4, scale_down_cooldown=10), trace)
+    assert changes(predictive) < changes(legacy)
+
+
+def test_scale_down_waits_for_cooldown():
+    policy = PredictivePolicy(max_workers=8, scale_down_cooldown=5)
+    history = replay(policy, [5] * 10 + [0] * 20)
+    peak = max(history)
+    first_drop = next(i for i in range(10, len(history)) if history[i] < peak)
+    # Demand falls at tick 10; workers stay until the cooldown has passed.
+    assert first_drop >= 10 + 5 - 1
+    assert history[-1] == 0
+
+
+def test_min_workers_kept_warm():
+    policy = PredictivePolicy(max_workers=4, min_workers=2, scale_down_cooldown=0)
+    assert replay(policy, [0] * 10) == [2] * 10
+
+
+def test_scale_up_cooldown_limits_rate_of_increase():
+    policy = PredictivePolicy(max_workers=20, scale_up_cooldown=3)
+    history = replay(policy, [10] * 6)
+    assert changes(history[:3]) <= 1
+
+
+def test_backlog_respects_queue_wait_slo():
+    policy = PredictivePolicy(max_workers=50, target_wait=2.0)
+    sample = LoadSample(time=0.0, queue_length=20)
+    assert policy.decide(sample, 0) == 10
+
+
+def test_estimator_learns_service_rate_from_completions():
+    est = LoadEstimator(alpha=0.5, initial_service_rate=1.0)
+    est.update(LoadSample(0.0, queue_length=10), workers=2)
+    for t in range(1, 20):
+        est.update(
+            LoadSample(float(t), queue_length=10, arrivals=6, completions=6), workers=2
+        )
+    assert abs(est.service_rate - 3.0) < 0.01
+    assert abs(est.arrival_rate - 6.0) < 0.01
+
+
+def test_estimator_infers_arrivals_from_queue_growth():
+    est = LoadEstimator(alpha=1.0)
+    est.update(LoadSample(0.0, queue_length=0), workers=0)
+    est.update(LoadSample(2.0, queue_length=8), workers=0)
+    assert est.arrival_rate == 4.0
+
+
+def test_autoscaler_uses_pluggable_policy(monkeypatch):
+    class Fixed(ScalingPolicy):
+        def __init__(self):
+            self.samples = []
+
+        def decide(self, sample, current):
+            self.samples.append((sample.queue_length, current))
+            return 3
+
+    class FakeProc:
+        def poll(self):
+            return None
+
+        def terminate(self):
+            pass
+
+        def wait(self, timeout=None):
+            return 0
+
+    policy = Fixed()
+    scaler = AutoScaler("http://broker", 0, max_workers=2, policy=policy)
+    monkeypatch.setattr(scaler, "_stats", lambda: None)
+    monkeypatch.setattr(scaler, "_queue_length", lambda: 7)
+    monkeypatch.setattr(
+        scaler, "_spawn_worker", lambda: scaler.workers.append(FakeProc())
+    )
+    scaler.step()
+    assert policy.samples == [(7, 0)]
+    # Decisions are capped at ``max_workers``.
+    assert len(scaler.workers) == 2
+
+
+def test_policy_must_implement_decide():
+    class Incomplete(ScalingPolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_split_slots_prefers_concurrency():
+    assert split_slots(0, 4, 4) == (0, 1)
+    assert split_slots(3, 4, 4) == (1, 3)
+    assert split_slots(6, 4, 4) == (2, 3)
+    assert split_slots(100, 4, 4) == (4, 4)
+    assert split_slots(3, 4, 1) == (3, 1)
+
+
+def test_autoscaler_samples_stats_and_resizes_workers(monkeypatch):
+    class FakeProc:
+        def __init__(self):
+            self.signals = []
+
+        def poll(self):
+            return None
+
+        def send_signal(self, sig):
+            self.signals.append(sig)
+
+    stats = iter(
+        [
+            {
+                "queue_depth": 3,
+                "in_flight": 0,
+                "created_total": 3,
+                "completed_total": 0,
+                "service_time": None,
+            },
+            {
+                "queue_depth": 6,
+                "in_flight": 3,
+                "created_total": 9,
+                "completed_total": 0,
+                "service_time": 1.0,
+            },
+            {
+                "queue_depth": 8,
+                "in_flight": 6,
+                "created_total": 17,
+                "completed_total": 6,
+                "service_time": 1.0,
+            },
+        ]
+    )
+    samples = []
+
+    class Recording(QueueLengthPolicy):
+        def decide(self, sample, current):
+            samples.append(sample)
+            return super().decide(sample, current)
+
+    scaler = AutoScaler(
+        "http://broker",
+        0,
+        max_workers=2,
+        max_concurrency=4,
+        policy=Recording(max_workers=8),
+    )
+    monkeypatch.setattr(scaler, "_stats", lambda: next(stats))
+    monkeypatch.setattr(
+        scaler, "_spawn_worker", lambda: scaler.workers.append(FakeProc())
+    )
+    scaler.step()
+    assert (len(scaler.workers), scaler.concurrency) == (1, 3)
+    assert samples[0].arrivals is None
+    scaler.step()
+    assert samples[1].arrivals == 6 and samples[1].in_flight == 3
+    assert (len(scaler.workers), scaler.concurrency) == (2, 3)
+    assert scaler.concurrency_file.read_text() == "3"
+    assert scaler.workers[0].signals == []
+    scaler.step()
+    assert (len(scaler.workers), scaler.concurrency) == (2, 4)
+    assert scaler.concurrency_file.read_text() == "4"
+    assert all(proc.signals == [signal.SIGHUP] for proc in scaler.workers)
+    scaler._control_dir.cleanup()
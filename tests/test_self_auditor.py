@@ -78,3 +78,29 @@ def test_self_auditor_class_nodes(tmp_path):
     data = metrics[key]
     types = {item["type"] for item in data["complexity"]}
     assert "class" in types
+
+
+def test_self_auditor_cache_only_reanalyzes_changed_files(tmp_path):
+    files = []
+    for i in range(3):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text(f"def f{i}(x):\n    if x:\n        return {i}\n    return 0\n")
+        files.append(path)
+    cache = tmp_path / "audit_cache.json"
+
+    auditor = SelfAuditor(complexity_threshold=1, cache_file=cache)
+    first = auditor.analyze_incremental(files)
+    assert auditor.last_analyzed == 3
+    assert first == SelfAuditor(complexity_threshold=1).analyze(files)
+
+    files[1].write_text("def g():\n    return 1\n")
+    second = SelfAuditor(complexity_threshold=1, cache_file=cache)
+    metrics = second.analyze_incremental(files)
+    assert second.last_analyzed == 1
+    assert list(metrics) == [str(f) for f in files]
+    assert metrics[str(files[1])]["max_complexity"] == 1
+
+    # Changing thresholds invalidates the cache.
+    stricter = SelfAuditor(complexity_threshold=5, cache_file=cache)
+    stricter.analyze_incremental(files)
+    assert stricter.last_analyzed == 3
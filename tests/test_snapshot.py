@@ -0,0 +1,111 @@
+import json
+import struct
+
+import pytest
+
+from core.memory import Memory
+from core.snapshot import (
+    MAGIC,
+    Snapshot,
+    StaleSnapshotError,
+    is_snapshot,
+    write_snapshot,
+)
+
+
+STATE = {
+    "history": [{"id": 1, "ok": True, "score": 0.5}],
+    "counters": {"runs": 3},
+    "name": "x",
+    "none": None,
+}
+
+
+@pytest.mark.parametrize("codec", ["marshal", "json"])
+def test_round_trip(tmp_path, codec):
+    path = tmp_path / "state.snap"
+    write_snapshot(path, STATE, codec=codec)
+    assert is_snapshot(path)
+    with Snapshot(path) as snap:
+        assert set(snap) == set(STATE)
+        assert snap.value() == STATE
+
+
+def test_sections_decode_lazily(tmp_path, monkeypatch):
+    from core import snapshot as snapshot_mod
+
+    path = tmp_path / "state.snap"
+    write_snapshot(path, STATE)
+    decoded = []
+    real = snapshot_mod._decode
+    monkeypatch.setattr(
+        snapshot_mod,
+        "_decode",
+        lambda payload, codec: decoded.append(1) or real(payload, codec),
+    )
+    with Snapshot(path) as snap:
+        assert decoded == []
+        assert snap["counters"] == {"runs": 3}
+        assert snap["counters"] is snap["counters"]
+        assert len(decoded) == 1
+
+
+def test_non_mapping_state(tmp_path):
+    mem = Memory(tmp_path / "state.json", snapshot=True)
+    mem.save([1, 2, 3])
+    assert mem.load() == [1, 2, 3]
+    assert mem.load_section("anything", "default") == "default"
+
+
+def test_memory_reads_either_format(tmp_path):
+    path = tmp_path / "state.json"
+    Memory(path).save(STATE)
+    assert not is_snapshot(path)
+    snap_mem = Memory(path, snapshot=True)
+    assert snap_mem.load() == STATE
+    snap_mem.save(STATE)
+    assert is_snapshot(path)
+    assert Memory(path).load() == STATE
+    assert Memory(path).load_section("counters") == {"runs": 3}
+    assert Memory(path).load_section("missing", 7) == 7
+
+
+def test_marshal_from_other_python_is_a_cache_miss(tmp_path):
+    path = tmp_path / "state.json"
+    mem = Memory(path, snapshot=True, snapshot_codec="marshal")
+    mem.save(STATE)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<BB", data, len(MAGIC) + 8, 2, 7)
+    path.write_bytes(data)
+    with pytest.raises(StaleSnapshotError, match="Python 2.7"):
+        Snapshot(path)
+    assert mem.load() == {}
+    assert mem.load_section("counters", "default") == "default"
+
+    write_snapshot(path, STATE, codec="json")
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<BB", data, len(MAGIC) + 8, 2, 7)
+    path.write_bytes(data)
+    assert mem.load() == STATE
+
+
+def test_rejects_unknown_version_and_corruption(tmp_path):
+    path = tmp_path / "state.snap"
+    write_snapshot(path, STATE)
+    data = bytearray(path.read_bytes())
+
+    bad_version = bytearray(data)
+    struct.pack_into("<H", bad_version, len(MAGIC), 99)
+    path.write_bytes(bad_version)
+    with pytest.raises(ValueError, match="version 99"):
+        Snapshot(path)
+
+    data[-1] ^= 0xFF
+    path.write_bytes(data)
+    with Snapshot(path) as snap:
+        with pytest.raises(ValueError, match="Corrupt"):
+            snap.value()
+
+    path.write_text(json.dumps(STATE))
+    with pytest.raises(ValueError, match="not a snapshot"):
+        Snapshot(path)
@@ -0,0 +1,124 @@
+from unittest.mock import MagicMock
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.status_journal import StatusJournal
+from core.task import Task
+
+
+def _tasks(n):
+    return [
+        Task(id=i, description=f"t{i}", dependencies=[], priority=1, status="pending")
+        for i in range(n)
+    ]
+
+
+def _write_tasks(path, n):
+    Memory(str(path.with_suffix(".json"))).save_tasks(_tasks(n), str(path))
+
+
+def test_replay_restores_latest_status_and_skips_torn_line(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, 3)
+    memory = Memory(str(tmp_path / "mem.json"))
+    tasks = memory.load_tasks(str(tasks_file))
+
+    journal = StatusJournal(
+        str(tasks_file), memory, compact_every=100, compact_interval=3600
+    )
+    for task, status in [
+        (tasks[0], "in_progress"),
+        (tasks[0], "done"),
+        (tasks[1], "in_progress"),
+    ]:
+        task.status = status
+        journal.record(task, tasks)
+    journal.close()
+    with journal.path.open("a") as fh:
+        fh.write('{"id": 2, "stat')  # crash mid-append
+
+    reloaded = memory.load_tasks(str(tasks_file))
+    assert [t.status for t in reloaded] == ["pending"] * 3
+    fresh = StatusJournal(str(tasks_file), memory)
+    assert fresh.replay(reloaded) == 3
+    assert [t.status for t in reloaded] == ["done", "in_progress", "pending"]
+
+
+def test_compaction_rewrites_file_and_truncates_journal(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, 4)
+    memory = Memory(str(tmp_path / "mem.json"))
+    tasks = memory.load_tasks(str(tasks_file))
+
+    journal = StatusJournal(
+        str(tasks_file), memory, compact_every=2, compact_interval=3600
+    )
+    tasks[0].status = "done"
+    journal.record(tasks[0], tasks)
+    assert journal.compactions == 0 and journal.path.exists()
+    tasks[1].status = "done"
+    journal.record(tasks[1], tasks)
+    assert journal.compactions == 1
+    assert not journal.path.exists()
+    assert not (tmp_path / "tasks.yml.tmp").exists()
+    assert [t.status for t in memory.load_tasks(str(tasks_file))] == [
+        "done",
+        "done",
+        "pending",
+        "pending",
+    ]
+
+
+def test_interval_triggers_compaction(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, 1)
+    memory = Memory(str(tmp_path / "mem.json"))
+    tasks = memory.load_tasks(str(tasks_file))
+    journal = StatusJournal(
+        str(tasks_file), memory, compact_every=100, compact_interval=0
+    )
+    tasks[0].status = "done"
+    journal.record(tasks[0], tasks)
+    assert journal.compactions == 1
+
+
+def _orchestrator(memory, journal):
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    executor = MagicMock()
+    return Orchestrator(
+        Planner(budget=0), executor, reflector, memory, auditor, journal=journal
+    )
+
+
+def test_orchestrator_journal_avoids_full_rewrites(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, 20)
+    memory = Memory(str(tmp_path / "mem.json"))
+    memory.save_tasks = MagicMock(wraps=memory.save_tasks)
+
+    _orchestrator(memory, journal=True).run(str(tasks_file))
+
+    assert memory.save_tasks.call_count == 1
+    assert not (tmp_path / "tasks.yml.journal").exists()
+    assert all(t.status == "done" for t in memory.load_tasks(str(tasks_file)))
+
+
+def test_orchestrator_replays_journal_from_interrupted_run(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    _write_tasks(tasks_file, 3)
+    memory = Memory(str(tmp_path / "mem.json"))
+    (tmp_path / "tasks.yml.journal").write_text(
+        '{"id": 0, "status": "done", "ts": 0}\n{"id": 1, "status": "done", "ts": 0}\n'
+    )
+    orch = _orchestrator(memory, journal=True)
+    orch.run(str(tasks_file))
+
+    executed = [call.args[0].id for call in orch.executor.execute.call_args_list]
+    assert executed == [2]
+    assert all(t.status == "done" for t in memory.load_tasks(str(tasks_file)))
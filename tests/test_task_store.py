@@ -0,0 +1,166 @@
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from jsonschema.exceptions import ValidationError
+
+from core.memory import Memory
+from core.orchestrator import Orchestrator
+from core.planner import Planner
+from core.reflector import Reflector
+from core.self_auditor import SelfAuditor
+from core.task import Task
+from core.task_store import TaskStore, task_store_from_config
+
+
+def _task(i, **kwargs):
+    fields = {
+        "description": f"task {i}",
+        "dependencies": [],
+        "priority": 1,
+        "status": "pending",
+    }
+    fields.update(kwargs)
+    return Task(id=i, **fields)
+
+
+def test_save_and_load_preserve_order_and_metadata(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    tasks = [
+        _task(3, epic="E1", metadata={"foo": "bar"}),
+        _task(1, component="core"),
+        _task(2),
+    ]
+    store.save_tasks(tasks, "ignored.yml")
+    assert store.load_tasks() == tasks
+
+    tasks = [tasks[2], tasks[0]]
+    store.save_tasks(tasks)
+    assert store.load_tasks() == tasks
+    assert store.get(1) is None
+
+
+def test_save_tasks_only_writes_changed_rows(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    tasks = [_task(i) for i in range(5)]
+    store.save_tasks(tasks)
+
+    conn = sqlite3.connect(store.path)
+    conn.execute("CREATE TABLE log (id INTEGER)")
+    conn.execute(
+        "CREATE TRIGGER t AFTER INSERT ON tasks "
+        "BEGIN INSERT INTO log VALUES (NEW.id); END"
+    )
+    conn.commit()
+    tasks[3].status = "done"
+    store.save_tasks(tasks)
+    written = [row[0] for row in conn.execute("SELECT id FROM log")]
+    conn.close()
+    assert written == [3]
+
+
+def test_update_task_and_queries(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    store.save_tasks(
+        [
+            _task(1, component="core", epic="A", priority=2),
+            _task(2, component="web", epic="A", priority=5),
+            _task(3, component="core", epic="B", priority=5),
+        ]
+    )
+    task = store.get(1)
+    task.status = "done"
+    store.update_task(task)
+    store.update_task(_task(4, component="core"))
+
+    assert [t.id for t in store.find(status="pending")] == [2, 3, 4]
+    assert [t.id for t in store.find(component="core")] == [1, 3, 4]
+    assert [t.id for t in store.find(epic="A", status="pending")] == [2]
+    assert [t.id for t in store.find(status="pending", by_priority=True)] == [2, 3, 4]
+    assert store.count() == 4 and store.count("done") == 1
+    assert store.load_tasks()[-1].id == 4
+
+
+def test_invalid_task_is_rejected(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    with pytest.raises(ValidationError):
+        store.save_tasks([_task(1, priority=9)])
+    assert store.count() == 0
+
+
+def test_yaml_import_export_round_trip(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    tasks = [
+        _task(1, title="One", metadata={"extra": [1, 2]}),
+        _task(2, dependencies=[1]),
+    ]
+    Memory(tmp_path / "state.json").save_tasks(tasks, tasks_file)
+
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    assert store.import_yaml(tasks_file) == 2
+    out = tmp_path / "out.yml"
+    assert store.export_yaml(out) == 2
+    assert yaml.safe_load(out.read_text()) == yaml.safe_load(tasks_file.read_text())
+
+
+def test_from_config_seeds_empty_store(tmp_path):
+    tasks_file = tmp_path / "tasks.yml"
+    Memory(tmp_path / "state.json").save_tasks([_task(1)], tasks_file)
+    cfg = {"task_store": {"backend": "sqlite", "path": str(tmp_path / "tasks.sqlite")}}
+    assert task_store_from_config({"task_store": {"backend": "yaml"}}) is None
+    store = task_store_from_config(cfg, str(tasks_file))
+    assert [t.id for t in store.load_tasks()] == [1]
+
+
+def test_orchestrator_updates_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    store.save_tasks(
+        [_task(1, command="echo 1"), _task(2, dependencies=[1], command="echo 2")]
+    )
+    monkeypatch.setattr(store, "save_tasks", MagicMock())
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    executor = MagicMock()
+    orch = Orchestrator(Planner(budget=0), executor, reflector, store, auditor)
+    orch._runs = orch._tasks_executed = orch._step_duration = MagicMock()
+    orch.run("tasks.yml")
+    assert [t.status for t in store.load_tasks()] == ["done", "done"]
+    assert executor.execute.call_count == 2
+    store.save_tasks.assert_not_called()
+
+
+def test_orchestrator_with_journal_enabled(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    store.save_tasks([_task(i, command=f"echo {i}") for i in range(1, 4)])
+    reflector = MagicMock(spec=Reflector)
+    reflector.run_cycle.return_value = None
+    auditor = MagicMock(spec=SelfAuditor)
+    auditor.audit.return_value = []
+    orch = Orchestrator(
+        Planner(budget=0), MagicMock(), reflector, store, auditor, journal=True
+    )
+    orch.journal_compact_every = 1
+    orch._runs = orch._tasks_executed = orch._step_duration = MagicMock()
+    orch.logger = MagicMock()
+    orch.run("tasks.yml")
+    assert [t.status for t in store.load_tasks()] == ["done"] * 3
+    assert not (tmp_path / "tasks.yml.journal").exists()
+    orch.logger.exception.assert_not_called()
+
+
+def test_reflector_saves_to_store(tmp_path):
+    store = TaskStore(tmp_path / "tasks.sqlite")
+    store.save_tasks([_task(1)])
+    reflector = Reflector(
+        tasks_path=tmp_path / "tasks.yml", analysis_paths=[], task_store=store
+    )
+    tasks = reflector._load_tasks()
+    reflector._save_tasks(tasks + [{**tasks[0], "id": 2, "source": "reflection"}])
+    assert [t.id for t in store.load_tasks()] == [1, 2]
+    assert store.get(2).metadata == {"source": "reflection"}
+    assert not (tmp_path / "tasks.yml").exists()
@@ -16,6 +16,14 @@ def telemetry_server():
     metrics_internal._METER_PROVIDER = None
     trace_api._TRACER_PROVIDER_SET_ONCE._done = False
     trace_api._TRACER_PROVIDER = None
+    # Drop collectors of meter providers installed by earlier tests so the
+    # scrape only reports this provider's metrics.
+    from prometheus_client import REGISTRY
+    from opentelemetry.exporter.prometheus import _CustomCollector
+
+    for collector in list(REGISTRY._collector_to_names):
+        if isinstance(collector, _CustomCollector):
+            REGISTRY.unregister(collector)
 
     server, _ = setup_telemetry(metrics_port=0)
     yield server
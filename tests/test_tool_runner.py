@@ -21,3 +21,40 @@ def test_prevent_path_escape(tmp_path):
     with pytest.raises(PermissionError):
         runner.run(["touch", "../outside.txt"])
     assert not Path(tmp_path).parent.joinpath("outside.txt").exists()
+
+
+def _is_running(pid: int) -> bool:
+    """Return ``True`` if ``pid`` exists and is not a zombie."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def test_timeout_kills_process_group(tmp_path):
+    runner = ToolRunner(tmp_path, allowed_commands=["sh"], timeout=0.5)
+    result = runner.run(["sh", "-c", "sleep 30 & echo $!; wait"])
+    assert result.timed_out
+    assert result.duration < 5
+    child = int(result.stdout.split()[0])
+    assert not _is_running(child)
+
+
+def test_cancel_event_stops_command(tmp_path):
+    import threading
+
+    runner = ToolRunner(tmp_path, allowed_commands=["sleep"])
+    event = threading.Event()
+    threading.Timer(0.2, event.set).start()
+    result = runner.run(["sleep", "30"], cancel_event=event)
+    assert result.cancelled and not result.timed_out
+    assert result.duration < 5
+
+
+def test_result_reports_duration(tmp_path):
+    runner = ToolRunner(tmp_path, allowed_commands=["echo"])
+    result = runner.run("echo hi")
+    assert not result.timed_out
+    assert result.returncode == 0
+    assert result.duration >= 0
@@ -0,0 +1,57 @@
+import asyncio
+
+from worker.concurrency import AdjustableSemaphore
+
+
+def test_resize_changes_parallelism():
+    async def run():
+        sem = AdjustableSemaphore(1)
+        active = 0
+        peak = 0
+
+        async def job():
+            nonlocal active, peak
+            async with sem:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.05)
+                active -= 1
+
+        tasks = [asyncio.create_task(job()) for _ in range(6)]
+        await asyncio.sleep(0.01)
+        assert peak == 1
+        sem.resize(3)
+        await asyncio.gather(*tasks)
+        return peak
+
+    assert asyncio.run(run()) == 3
+
+
+def test_shrink_waits_for_running_tasks():
+    async def run():
+        sem = AdjustableSemaphore(2)
+        await sem.acquire()
+        await sem.acquire()
+        sem.resize(1)
+        waiter = asyncio.create_task(sem.acquire())
+        sem.release()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        sem.release()
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_passes_on_wakeup():
+    async def run():
+        sem = AdjustableSemaphore(1)
+        await sem.acquire()
+        first = asyncio.create_task(sem.acquire())
+        second = asyncio.create_task(sem.acquire())
+        await asyncio.sleep(0)
+        sem.release()
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+
+    asyncio.run(run())
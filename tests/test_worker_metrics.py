@@ -0,0 +1,49 @@
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+import worker.metrics as worker_metrics
+from worker.metrics import WorkerMetrics, command_family
+
+
+def _collect(reader):
+    points = {}
+    data = reader.get_metrics_data()
+    for rm in data.resource_metrics:
+        for sm in rm.scope_metrics:
+            for metric in sm.metrics:
+                for point in metric.data.data_points:
+                    points.setdefault(metric.name, []).append(point)
+    return points
+
+
+def _patch_provider(monkeypatch):
+    reader = InMemoryMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    monkeypatch.setattr(worker_metrics.metrics, "get_meter_provider", lambda: provider)
+    return reader
+
+
+def test_command_family():
+    assert command_family("python -c 'print(1)'") == "python"
+    assert command_family("/usr/bin/echo hi") == "echo"
+    assert command_family(None) == "none"
+
+
+def test_records_stage_histograms_by_family(monkeypatch):
+    reader = _patch_provider(monkeypatch)
+    wm = WorkerMetrics()
+    task = {"id": 7, "command": "echo hi"}
+    wm.record("spawn", 0.01, task)
+    with wm.time("report", task):
+        pass
+    points = _collect(reader)
+    assert points["worker_spawn_seconds"][0].attributes == {"command.family": "echo"}
+    assert points["worker_report_seconds"][0].count == 1
+
+
+def test_tag_by_task_id(monkeypatch):
+    reader = _patch_provider(monkeypatch)
+    wm = WorkerMetrics(tag_by="task")
+    wm.record("claim", 0.02, {"id": 3, "command": "echo"})
+    points = _collect(reader)
+    assert points["worker_claim_seconds"][0].attributes == {"task.id": "3"}
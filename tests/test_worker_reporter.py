@@ -0,0 +1,115 @@
+import asyncio
+
+from worker.reporter import ResultReporter
+
+
+class FakeResponse:
+    def __init__(self, data=None):
+        self._data = data or {"status": "ok"}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakePost:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, url, json=None, headers=None):
+        self.calls.append((url, json))
+        return FakeResponse()
+
+
+def _result(duration=0.01):
+    return {"stdout": "out", "stderr": "", "exit_code": 0, "duration": duration}
+
+
+def test_single_result_posts_per_task():
+    post = FakePost()
+    reporter = ResultReporter("http://broker", post=post)
+    asyncio.run(reporter.report({"id": 1}, _result()))
+    assert post.calls == [
+        (
+            "http://broker/tasks/1/result",
+            {"stdout": "out", "stderr": "", "exit_code": 0},
+        )
+    ]
+
+
+def test_flushes_when_batch_is_full():
+    post = FakePost()
+    reporter = ResultReporter(
+        "http://broker", batch_size=3, flush_interval=60, post=post
+    )
+
+    async def run():
+        for i in range(4):
+            await reporter.report({"id": i}, _result())
+
+    asyncio.run(run())
+    assert len(post.calls) == 1
+    url, body = post.calls[0]
+    assert url == "http://broker/tasks/results"
+    assert [item["task_id"] for item in body] == [0, 1, 2]
+
+    asyncio.run(reporter.close())
+    assert [item["task_id"] for item in post.calls[1][1]] == [3]
+
+
+def test_long_task_reports_immediately():
+    post = FakePost()
+    reporter = ResultReporter(
+        "http://broker", batch_size=10, flush_interval=0.5, post=post
+    )
+
+    async def run():
+        await reporter.report({"id": 1}, _result())
+        await reporter.report({"id": 2}, _result(duration=2.0))
+
+    asyncio.run(run())
+    assert [item["task_id"] for item in post.calls[0][1]] == [1, 2]
+
+
+def test_periodic_flush():
+    post = FakePost()
+    reporter = ResultReporter(
+        "http://broker", batch_size=10, flush_interval=0.05, post=post
+    )
+
+    async def run():
+        reporter.start()
+        await reporter.report({"id": 1}, _result())
+        await asyncio.sleep(0.2)
+        assert len(post.calls) == 1
+        await reporter.close()
+
+    asyncio.run(run())
+    assert len(post.calls) == 1
+
+
+def test_failed_flush_keeps_results():
+    reporter = ResultReporter("http://broker", batch_size=2, flush_interval=60)
+    calls = []
+
+    def failing_post(url, json=None, headers=None):
+        calls.append(json)
+        raise ConnectionError("down")
+
+    reporter._post = failing_post
+
+    async def run():
+        await reporter.report({"id": 1}, _result())
+        try:
+            await reporter.report({"id": 2}, _result())
+        except ConnectionError:
+            pass
+        post = FakePost()
+        reporter._post = post
+        await reporter.close()
+        return post
+
+    post = asyncio.run(run())
+    assert [item["task_id"] for item in post.calls[0][1]] == [1, 2]
@@ -1,20 +1,57 @@
-"""Simple auto-scaler for worker processes."""
+"""Auto-scaler for worker processes.
+
+Every ``interval`` seconds the broker's ``/stats`` endpoint is sampled and a
+:class:`~worker.scaling.ScalingPolicy` decides how many worker slots should
+be available. Slots are split into worker processes of up to
+``max_concurrency`` concurrent tasks each. Running workers pick up a new
+concurrency limit from a shared file on ``SIGHUP``, so capacity can often be
+adjusted without starting or stopping processes. Spawned workers poll the
+broker while idle so that a warm pool survives short gaps in the queue.
+"""
 
 from __future__ import annotations
 
+import math
 import os
+import signal
 import subprocess
 import sys
+import tempfile
 import time
+from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
 
 from config import load_config
+from worker.scaling import (
+    LoadSample,
+    PredictivePolicy,
+    QueueLengthPolicy,
+    ScalingPolicy,
+)
+
+
+def split_slots(slots: int, max_workers: int, max_concurrency: int) -> tuple[int, int]:
+    """Return ``(workers, concurrency)`` providing at least ``slots`` slots.
+
+    Concurrency is raised before processes are added, and the slots are
+    spread evenly over the workers.
+    """
+    slots = max(0, min(slots, max_workers * max_concurrency))
+    if not slots:
+        return 0, 1
+    workers = math.ceil(slots / max_concurrency)
+    return workers, math.ceil(slots / workers)
 
 
 class AutoScaler:
-    """Spawn or terminate workers based on broker queue length."""
+    """Spawn, resize or terminate workers as decided by a scaling policy.
+
+    ``policy`` defaults to a :class:`~worker.scaling.PredictivePolicy`
+    limited to ``max_workers * max_concurrency`` slots. ``scale_events``
+    counts spawned and stopped workers as a measure of churn.
+    """
 
     def __init__(
         self,
@@ -23,38 +60,102 @@ class AutoScaler:
         max_workers: int = 4,
         interval: float = 1.0,
         loops: int | None = None,
+        policy: ScalingPolicy | None = None,
+        max_concurrency: int = 1,
+        headers: dict[str, str] | None = None,
     ) -> None:
         self.broker_url = broker_url.rstrip("/")
         self.metrics_port = metrics_port
         self.max_workers = max_workers
+        self.max_concurrency = max(1, max_concurrency)
         self.interval = interval
         self.loops = loops
+        self.policy = policy or PredictivePolicy(
+            max_workers=max_workers * self.max_concurrency
+        )
         self.workers: list[subprocess.Popen] = []
+        self.concurrency = 1
+        self.scale_events = 0
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+        self._control_dir = tempfile.TemporaryDirectory(prefix="autoscaler-")
+        self.concurrency_file = Path(self._control_dir.name) / "concurrency"
+        self._write_concurrency(self.concurrency)
+        self._totals: tuple[int, int] | None = None
 
     # ------------------------------------------------------------------
     def _metrics_url(self) -> str:
         host = urlparse(self.broker_url).hostname or "localhost"
         return f"http://{host}:{self.metrics_port}/metrics"
 
+    # ------------------------------------------------------------------
+    def _stats(self) -> dict | None:
+        """Return the broker's ``/stats`` payload or ``None`` if unavailable."""
+        try:
+            resp = self.session.get(f"{self.broker_url}/stats", timeout=1)
+            resp.raise_for_status()
+            return resp.json()
+        except (requests.RequestException, ValueError):
+            return None
+
     # ------------------------------------------------------------------
     def _queue_length(self) -> int:
+        """Fallback for brokers without ``/stats``: scrape the metrics gauge."""
         try:
-            resp = requests.get(self._metrics_url(), timeout=1)
+            resp = self.session.get(self._metrics_url(), timeout=1)
         except requests.RequestException:
             return 0
         for line in resp.text.splitlines():
-            if line.startswith("broker_queue_length"):
+            name, _, value = line.partition(" ")
+            if name == "broker_queue_length":
                 try:
-                    return int(float(line.split()[-1]))
+                    return int(float(value))
                 except ValueError:
                     return 0
         return 0
 
+    # ------------------------------------------------------------------
+    def _sample(self) -> LoadSample:
+        now = time.monotonic()
+        stats = self._stats()
+        if stats is None:
+            return LoadSample(now, self._queue_length())
+        totals = (stats["created_total"], stats["completed_total"])
+        last, self._totals = self._totals, totals
+        return LoadSample(
+            now,
+            stats["queue_depth"],
+            arrivals=totals[0] - last[0] if last else None,
+            completions=totals[1] - last[1] if last else None,
+            service_time=stats.get("service_time"),
+            in_flight=stats.get("in_flight"),
+        )
+
+    # ------------------------------------------------------------------
+    def _write_concurrency(self, value: int) -> None:
+        tmp = self.concurrency_file.with_suffix(".tmp")
+        tmp.write_text(str(value))
+        os.replace(tmp, self.concurrency_file)
+
+    # ------------------------------------------------------------------
+    def _set_concurrency(self, value: int) -> None:
+        if value == self.concurrency:
+            return
+        self.concurrency = value
+        self._write_concurrency(value)
+        for proc in self.workers:
+            try:
+                proc.send_signal(signal.SIGHUP)
+            except ProcessLookupError:
+                pass
+
     # ------------------------------------------------------------------
     def _spawn_worker(self) -> None:
         env = os.environ.copy()
         env.setdefault("BROKER_URL", self.broker_url)
         env.setdefault("WORKER_METRICS_PORT", "0")
+        env.setdefault("WORKER_IDLE_POLL", str(self.interval))
+        env["WORKER_CONCURRENCY_FILE"] = str(self.concurrency_file)
         proc = subprocess.Popen(
             [sys.executable, "-m", "worker.main"],
             stdout=subprocess.DEVNULL,
@@ -62,6 +163,7 @@ class AutoScaler:
             env=env,
         )
         self.workers.append(proc)
+        self.scale_events += 1
 
     # ------------------------------------------------------------------
     def _stop_worker(self) -> None:
@@ -71,13 +173,21 @@ class AutoScaler:
             proc.wait(timeout=5)
         except Exception:
             proc.kill()
+        self.scale_events += 1
 
     # ------------------------------------------------------------------
     def step(self) -> None:
-        desired = min(self.max_workers, self._queue_length())
-        while len(self.workers) < desired:
+        self.workers = [proc for proc in self.workers if proc.poll() is None]
+        current = len(self.workers) * self.concurrency
+        slots = self.policy.decide(self._sample(), current)
+        workers, concurrency = split_slots(
+            slots, self.max_workers, self.max_concurrency
+        )
+        if workers:
+            self._set_concurrency(concurrency)
+        while len(self.workers) < workers:
             self._spawn_worker()
-        while len(self.workers) > desired:
+        while len(self.workers) > workers:
             self._stop_worker()
 
     # ------------------------------------------------------------------
@@ -89,6 +199,25 @@ class AutoScaler:
             count += 1
         while self.workers:
             self._stop_worker()
+        self.session.close()
+        self._control_dir.cleanup()
+
+
+def policy_from_env(max_workers: int) -> ScalingPolicy:
+    """Build the scaling policy selected by ``AUTOSCALER_POLICY``.
+
+    ``max_workers`` is the number of worker slots the policy may request.
+    """
+    min_workers = int(os.getenv("AUTOSCALER_MIN_WORKERS", "0"))
+    if os.getenv("AUTOSCALER_POLICY", "predictive") == "queue":
+        return QueueLengthPolicy(max_workers=max_workers, min_workers=min_workers)
+    return PredictivePolicy(
+        max_workers=max_workers,
+        min_workers=min_workers,
+        target_wait=float(os.getenv("AUTOSCALER_TARGET_WAIT", "5")),
+        scale_up_cooldown=float(os.getenv("AUTOSCALER_SCALE_UP_COOLDOWN", "0")),
+        scale_down_cooldown=float(os.getenv("AUTOSCALER_SCALE_DOWN_COOLDOWN", "30")),
+    )
 
 
 def main() -> None:
@@ -96,19 +225,27 @@ def main() -> None:
     broker_url = cfg["worker"]["broker_url"]
     metrics_port = int(cfg["broker"]["metrics_port"])
     max_workers = int(os.getenv("AUTOSCALER_MAX_WORKERS", "4"))
+    max_concurrency = int(os.getenv("AUTOSCALER_MAX_CONCURRENCY", "1"))
     interval = float(os.getenv("AUTOSCALER_INTERVAL", "1"))
     loops_env = os.getenv("AUTOSCALER_LOOPS")
     loops = int(loops_env) if loops_env is not None else None
+    headers = {}
+    if cfg["security"]["api_key"]:
+        headers["X-API-Key"] = cfg["security"]["api_key"]
+    if cfg["security"].get("worker_token"):
+        headers["Authorization"] = f"Bearer {cfg['security']['worker_token']}"
     scaler = AutoScaler(
         broker_url=broker_url,
         metrics_port=metrics_port,
         max_workers=max_workers,
         interval=interval,
         loops=loops,
+        policy=policy_from_env(max_workers * max_concurrency),
+        max_concurrency=max_concurrency,
+        headers=headers,
     )
     scaler.run()
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI
     main()
-
@@ -0,0 +1,68 @@
+"""Concurrency limit for the worker that can change while tasks run."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+
+class AdjustableSemaphore:
+    """Asyncio semaphore whose number of slots can be changed at runtime.
+
+    Shrinking the limit never interrupts running tasks; new tasks wait until
+    enough of them have released their slot.
+    """
+
+    def __init__(self, value: int = 1) -> None:
+        self._value = max(1, int(value))
+        self._in_use = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    # ------------------------------------------------------------------
+    @property
+    def value(self) -> int:
+        return self._value
+
+    # ------------------------------------------------------------------
+    def resize(self, value: int) -> None:
+        """Set the number of slots to ``value`` (at least one)."""
+        self._value = max(1, int(value))
+        self._wake()
+
+    # ------------------------------------------------------------------
+    async def acquire(self) -> None:
+        while self._in_use >= self._value:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                else:
+                    # Pass on a wake-up this waiter can no longer use.
+                    self._wake()
+                raise
+        self._in_use += 1
+
+    # ------------------------------------------------------------------
+    def release(self) -> None:
+        self._in_use -= 1
+        self._wake()
+
+    # ------------------------------------------------------------------
+    def _wake(self) -> None:
+        free = self._value - self._in_use
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    # ------------------------------------------------------------------
+    async def __aenter__(self) -> "AdjustableSemaphore":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
@@ -3,31 +3,64 @@
 The worker contacts the broker specified by ``BROKER_URL`` and requests the
 next available task via ``/tasks/next``. Each task may provide a shell
 ``command`` which is executed asynchronously. Results are posted back using
-``/tasks/{id}/result``.
+``/tasks/{id}/result`` or, when ``report_batch_size`` is above one, in batches
+via ``/tasks/results``.
+
+The worker exits once the queue is empty unless ``idle_poll`` is set, in which
+case it polls the broker every ``idle_poll`` seconds until it receives
+``SIGTERM``. On ``SIGTERM`` it stops claiming tasks, finishes the running ones
+and flushes buffered results before exiting.
+
+``SIGHUP`` reloads the configuration and applies a new concurrency limit to
+the running worker. When ``concurrency_file`` is set, the limit is read from
+that file, which lets the autoscaler resize its workers in place.
 """
 
 import logging
 import os
 import asyncio
 import signal
+import time
 import requests
 import sentry_sdk
 from core.telemetry import setup_telemetry
 from config import load_config, reload_config
 from core.log_utils import configure_logging
 from core.async_runner import AsyncRunner
+from core.python_pool import PythonPool
+from core.result_cache import ResultCache, cache_from_config, cacheable
+from worker.concurrency import AdjustableSemaphore
+from worker.metrics import WorkerMetrics
+from worker.reporter import ResultReporter
+
+
+def _concurrency(cfg: dict) -> int:
+    """Return the concurrency limit from ``concurrency_file`` or ``cfg``."""
+    path = cfg["worker"].get("concurrency_file")
+    if path:
+        try:
+            with open(path) as fh:
+                return int(fh.read().strip())
+        except (OSError, ValueError):
+            pass
+    return int(cfg["worker"].get("concurrency", 2))
+
 
 config = load_config()
 BROKER_URL = config["worker"]["broker_url"]
-CONCURRENCY = int(config["worker"].get("concurrency", 2))
+CONCURRENCY = _concurrency(config)
+TASK_TIMEOUT = config["worker"].get("task_timeout")
 sentry_sdk.init(dsn=os.getenv("SENTRY_DSN"))
 
+
 def _reload_config(signum, frame) -> None:
     """Reload settings on ``SIGHUP``."""
-    global config, BROKER_URL, CONCURRENCY
+    global config, BROKER_URL, CONCURRENCY, TASK_TIMEOUT
     config = reload_config()
     BROKER_URL = config["worker"]["broker_url"]
-    CONCURRENCY = int(config["worker"].get("concurrency", 2))
+    CONCURRENCY = _concurrency(config)
+    TASK_TIMEOUT = config["worker"].get("task_timeout")
+
 
 signal.signal(signal.SIGHUP, _reload_config)
 setup_telemetry(
@@ -37,10 +70,10 @@ setup_telemetry(
 )
 configure_logging()
 logger = logging.getLogger(__name__)
+worker_metrics = WorkerMetrics(config["worker"].get("metrics_tag", "family"))
 
 
-def fetch_next_task():
-    """Return the next task from the broker or ``None`` if the queue is empty."""
+def _auth_headers() -> dict:
     api_key = config["security"]["api_key"]
     token = config["security"].get("worker_token")
     headers = {}
@@ -48,49 +81,124 @@ def fetch_next_task():
         headers["X-API-Key"] = api_key
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    resp = requests.get(f"{BROKER_URL}/tasks/next", headers=headers)
+    return headers
+
+
+def fetch_next_task():
+    """Return the next task from the broker or ``None`` if the queue is empty."""
+    resp = requests.get(f"{BROKER_URL}/tasks/next", headers=_auth_headers())
     resp.raise_for_status()
     return resp.json()
 
 
-async def process_task(runner: AsyncRunner, task: dict, sem: asyncio.Semaphore):
+def _make_reporter(batch_size: int | None = None) -> ResultReporter:
+    worker_cfg = config["worker"]
+    if batch_size is None:
+        batch_size = int(worker_cfg.get("report_batch_size") or 1)
+    return ResultReporter(
+        BROKER_URL,
+        _auth_headers(),
+        batch_size=batch_size,
+        flush_interval=float(worker_cfg.get("report_flush_interval", 0.5)),
+        metrics=worker_metrics,
+    )
+
+
+async def process_task(
+    runner: AsyncRunner,
+    task: dict,
+    sem: AdjustableSemaphore,
+    cache: ResultCache | None = None,
+    reporter: ResultReporter | None = None,
+):
     command = task.get("command")
     if not command:
         return
-    async with sem:
-        result = await runner.run(command)
+    result = None
+    meta = task.get("metadata") or {}
+    if cache is not None and not cacheable(meta):
+        cache = None
+    if cache is not None:
+        key = ResultCache.key(command, meta.get("inputs", []), meta.get("env", []))
+        # The cache is a SQLite file; keep its I/O off the event loop.
+        result = await asyncio.to_thread(cache.get, key)
+    if result is None:
+        waited = time.perf_counter()
+        async with sem:
+            worker_metrics.record("slot_wait", time.perf_counter() - waited, task)
+            result = await runner.run(command, timeout=TASK_TIMEOUT)
+        spawn = result.get("spawn_duration", 0.0)
+        worker_metrics.record("spawn", spawn, task)
+        worker_metrics.record("execution", result["duration"] - spawn, task)
+        if (
+            cache is not None
+            and result["exit_code"] == 0
+            and not result.get("timed_out")
+        ):
+            await asyncio.to_thread(
+                cache.put, key, result["stdout"], result["stderr"], result["exit_code"]
+            )
+    else:
+        logger.info("Result cache hit for task %s", task["id"])
+    if result.get("timed_out"):
+        logger.warning(
+            "Task %s timed out after %.1fs", task["id"], result["duration"]
+        )
     logger.info("Executed command for task %s", task["id"])
-    api_key = config["security"]["api_key"]
-    token = config["security"].get("worker_token")
-    headers = {}
-    if api_key:
-        headers["X-API-Key"] = api_key
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-    requests.post(
-        f"{BROKER_URL}/tasks/{task['id']}/result",
-        json={
-            "stdout": result["stdout"],
-            "stderr": result["stderr"],
-            "exit_code": result["exit_code"],
-        },
-        headers=headers,
-    ).raise_for_status()
-    logger.info("Reported result for task %s", task["id"])
+    if reporter is None:
+        reporter = _make_reporter(batch_size=1)
+    await reporter.report(task, result)
+
+
+def _resize_on_reload(sem: AdjustableSemaphore) -> None:
+    _reload_config(signal.SIGHUP, None)
+    if sem.value != CONCURRENCY:
+        logger.info("Concurrency changed from %d to %d", sem.value, CONCURRENCY)
+        sem.resize(CONCURRENCY)
 
 
 async def main_async():
     logger.info("Worker starting")
-    runner = AsyncRunner()
-    sem = asyncio.Semaphore(CONCURRENCY)
+    pool_size = int(config["worker"].get("python_pool") or 0)
+    pool = PythonPool(pool_size) if pool_size else None
+    runner = AsyncRunner(python_pool=pool)
+    cache = cache_from_config(config)
+    reporter = _make_reporter()
+    reporter.start()
+    sem = AdjustableSemaphore(CONCURRENCY)
+    idle_poll = config["worker"].get("idle_poll")
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stopping.set)
+    loop.add_signal_handler(signal.SIGHUP, _resize_on_reload, sem)
     pending = []
-    while True:
-        task = fetch_next_task()
-        if not task:
-            break
-        pending.append(asyncio.create_task(process_task(runner, task, sem)))
-    if pending:
-        await asyncio.gather(*pending)
+    try:
+        while not stopping.is_set():
+            claimed = time.perf_counter()
+            task = fetch_next_task()
+            worker_metrics.record("claim", time.perf_counter() - claimed, task)
+            if not task:
+                if not idle_poll:
+                    break
+                # Keep finished tasks out of ``pending`` while idling; failed
+                # ones stay so that ``gather`` still raises their errors.
+                pending = [t for t in pending if not t.done() or t.exception()]
+                try:
+                    await asyncio.wait_for(stopping.wait(), float(idle_poll))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            pending.append(
+                asyncio.create_task(process_task(runner, task, sem, cache, reporter))
+            )
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        loop.remove_signal_handler(signal.SIGHUP)
+        await reporter.close()
+        if pool:
+            pool.close()
 
 
 def main():
@@ -0,0 +1,84 @@
+"""Latency breakdown histograms for the broker worker.
+
+Each task passes through the same stages: claiming it from the broker,
+waiting for a concurrency slot, spawning the command, executing it and
+reporting the result. :class:`WorkerMetrics` records one histogram per stage
+so the per-task overhead is visible on the worker's ``metrics_port``.
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    from opentelemetry import metrics
+except Exception:  # pragma: no cover - optional dependency
+    metrics = None
+
+STAGES = {
+    "claim": "Time spent fetching the next task from the broker",
+    "slot_wait": "Time a task waited for a free concurrency slot",
+    "spawn": "Time spent starting the task command",
+    "execution": "Time the task command ran after it was started",
+    "report": "Time from a task finishing until the broker stored its result",
+}
+
+
+def command_family(command: Optional[str]) -> str:
+    """Return the executable name of ``command`` (``"python"``, ``"echo"``...)."""
+    if not command:
+        return "none"
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        args = command.split()
+    return os.path.basename(args[0]) if args else "none"
+
+
+class WorkerMetrics:
+    """Record worker stage latencies as OpenTelemetry histograms.
+
+    ``tag_by`` selects the attribute attached to each sample: ``"family"``
+    (the default) tags by :func:`command_family`, ``"task"`` by task id.
+    Tagging by task id gives exact per-task timings at the cost of one
+    series per task.
+    """
+
+    def __init__(self, tag_by: str = "family") -> None:
+        self.tag_by = tag_by
+        self._histograms: Dict[str, object] = {}
+        if metrics:
+            meter = metrics.get_meter_provider().get_meter(__name__)
+            for stage, description in STAGES.items():
+                self._histograms[stage] = meter.create_histogram(
+                    f"worker_{stage}_seconds", unit="s", description=description
+                )
+
+    # ------------------------------------------------------------------
+    def attributes(self, task: Optional[dict]) -> Dict[str, str]:
+        if not task:
+            return {}
+        if self.tag_by == "task":
+            return {"task.id": str(task.get("id"))}
+        return {"command.family": command_family(task.get("command"))}
+
+    # ------------------------------------------------------------------
+    def record(self, stage: str, seconds: float, task: Optional[dict] = None) -> None:
+        """Record ``seconds`` spent in ``stage`` for ``task``."""
+        hist = self._histograms.get(stage)
+        if hist is not None:
+            hist.record(max(0.0, seconds), self.attributes(task))
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def time(self, stage: str, task: Optional[dict] = None) -> Iterator[None]:
+        """Context manager recording the duration of the enclosed block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, task)
@@ -0,0 +1,141 @@
+"""Buffered reporting of task results to the broker.
+
+Posting every result on its own costs one HTTP round trip and one broker
+write transaction per task, which dominates for high-rate short tasks.
+:class:`ResultReporter` collects finished results and sends them to
+``POST /tasks/results`` once ``batch_size`` results are waiting or
+``flush_interval`` seconds have passed. Results of tasks that ran for at least
+``flush_interval`` are sent straight away so long tasks are never held back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from worker.metrics import WorkerMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class ResultReporter:
+    """Send task results to the broker individually or in batches.
+
+    With ``batch_size`` of ``1`` (the default) every result is posted to
+    ``/tasks/{id}/result`` as before and nothing is buffered.
+    """
+
+    def __init__(
+        self,
+        broker_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        batch_size: int = 1,
+        flush_interval: float = 0.5,
+        metrics: Optional[WorkerMetrics] = None,
+        post: Optional[Callable[..., requests.Response]] = None,
+    ) -> None:
+        self.broker_url = broker_url
+        self.headers = headers or {}
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.metrics = metrics
+        self._post = post or requests.post
+        self._buffer: List[tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    @property
+    def batching(self) -> bool:
+        return self.batch_size > 1
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Start the periodic flush task when batching is enabled."""
+        if self.batching and self._flusher is None and self.flush_interval > 0:
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    # ------------------------------------------------------------------
+    async def report(self, task: dict, result: dict) -> None:
+        """Queue ``result`` for ``task`` and flush if a threshold is reached."""
+        payload = {
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "exit_code": result["exit_code"],
+        }
+        if not self.batching:
+            start = time.perf_counter()
+            await asyncio.to_thread(
+                self._send, f"{self.broker_url}/tasks/{task['id']}/result", payload
+            )
+            self._record(task, time.perf_counter() - start)
+            logger.info("Reported result for task %s", task["id"])
+            return
+        self._buffer.append((task, payload, time.perf_counter()))
+        long_task = result.get("duration", 0.0) >= self.flush_interval
+        if long_task or len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    # ------------------------------------------------------------------
+    async def flush(self) -> None:
+        """Post all buffered results in one request.
+
+        On failure the results are put back in the buffer and the error is
+        re-raised so the next flush retries them.
+        """
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        body = [{"task_id": task["id"], **payload} for task, payload, _ in batch]
+        try:
+            data = await asyncio.to_thread(
+                self._send, f"{self.broker_url}/tasks/results", body
+            )
+        except Exception:
+            self._buffer[0:0] = batch
+            raise
+        now = time.perf_counter()
+        for task, _, queued in batch:
+            self._record(task, now - queued)
+        missing = (data or {}).get("missing") or []
+        if missing:
+            logger.warning("Broker does not know tasks %s", missing)
+        logger.info("Reported %d results", len(batch))
+
+    # ------------------------------------------------------------------
+    async def close(self) -> None:
+        """Stop the periodic flush task and send any remaining results."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+    # ------------------------------------------------------------------
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to report buffered results")
+
+    # ------------------------------------------------------------------
+    def _send(self, url: str, body) -> Optional[dict]:
+        resp = self._post(url, json=body, headers=self.headers)
+        resp.raise_for_status()
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    # ------------------------------------------------------------------
+    def _record(self, task: dict, seconds: float) -> None:
+        if self.metrics is not None:
+            self.metrics.record("report", seconds, task)
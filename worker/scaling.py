@@ -0,0 +1,185 @@
+"""Scaling policies for :class:`worker.autoscaler.AutoScaler`.
+
+A policy receives a :class:`LoadSample` every autoscaler interval and returns
+the number of workers that should be running. When workers run several tasks
+concurrently the autoscaler counts worker slots instead of processes.
+:class:`QueueLengthPolicy` reproduces the original behaviour of one worker per
+queued task.
+:class:`PredictivePolicy` sizes the pool from smoothed arrival and service
+rates so that queued tasks wait no longer than a target, and uses cooldowns
+to avoid reacting to every blip in the queue.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class LoadSample:
+    """Broker load observed at ``time``.
+
+    ``arrivals`` and ``completions`` count tasks created and finished since
+    the previous sample. ``service_time`` is the recent mean execution time
+    of a task in seconds and ``in_flight`` the number of claimed tasks that
+    have not reported a result. Any of them may be ``None`` when the source
+    cannot provide it; estimators then fall back to what they can infer.
+    """
+
+    time: float
+    queue_length: int
+    arrivals: Optional[int] = None
+    completions: Optional[int] = None
+    service_time: Optional[float] = None
+    in_flight: Optional[int] = None
+
+
+class ScalingPolicy(ABC):
+    """Interface for autoscaling policies."""
+
+    @abstractmethod
+    def decide(self, sample: LoadSample, current: int) -> int:
+        """Return the desired worker count given ``current`` running workers."""
+
+
+class QueueLengthPolicy(ScalingPolicy):
+    """Run one worker per queued task up to ``max_workers``."""
+
+    def __init__(self, max_workers: int = 4, min_workers: int = 0) -> None:
+        self.max_workers = max_workers
+        self.min_workers = min_workers
+
+    def decide(self, sample: LoadSample, current: int) -> int:
+        return max(self.min_workers, min(self.max_workers, sample.queue_length))
+
+
+class LoadEstimator:
+    """Exponentially weighted arrival and per-worker service rates.
+
+    ``alpha`` is the weight of the newest observation. ``service_rate`` starts
+    at ``initial_service_rate`` tasks per second per worker until completions
+    are observed.
+    """
+
+    def __init__(self, alpha: float = 0.3, initial_service_rate: float = 1.0) -> None:
+        self.alpha = alpha
+        self.arrival_rate = 0.0
+        self.service_rate = initial_service_rate
+        self._last: Optional[LoadSample] = None
+
+    # ------------------------------------------------------------------
+    def _smooth(self, old: float, new: float) -> float:
+        return self.alpha * new + (1 - self.alpha) * old
+
+    # ------------------------------------------------------------------
+    def update(self, sample: LoadSample, workers: int) -> None:
+        """Fold ``sample`` into the estimates.
+
+        ``workers`` is the number of workers running since the previous sample.
+        """
+        last, self._last = self._last, sample
+        if sample.service_time:
+            self.service_rate = self._smooth(
+                self.service_rate, 1.0 / sample.service_time
+            )
+        if last is None:
+            return
+        dt = sample.time - last.time
+        if dt <= 0:
+            return
+        completions = sample.completions
+        if (
+            sample.service_time is None
+            and completions is not None
+            and workers > 0
+            and last.queue_length > 0
+        ):
+            # Workers were saturated, so completions reflect their capacity.
+            self.service_rate = self._smooth(
+                self.service_rate, completions / (workers * dt)
+            )
+        if sample.arrivals is not None:
+            arrivals = sample.arrivals
+        else:
+            drained = completions
+            if drained is None:
+                drained = min(last.queue_length, self.service_rate * workers * dt)
+            arrivals = max(0.0, sample.queue_length - last.queue_length + drained)
+        self.arrival_rate = self._smooth(self.arrival_rate, arrivals / dt)
+
+
+class PredictivePolicy(ScalingPolicy):
+    """Size the worker pool from estimated throughput and a queue-wait SLO.
+
+    The target is the larger of the workers needed to keep up with the
+    arrival rate at ``utilisation`` and the workers needed to drain the
+    current backlog within ``target_wait`` seconds, clamped to
+    ``[min_workers, max_workers]``. Scaling up is allowed once
+    ``scale_up_cooldown`` seconds have passed since the last change. Scaling
+    down additionally requires demand to have stayed below the current size
+    for ``scale_down_cooldown`` seconds.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        min_workers: int = 0,
+        target_wait: float = 5.0,
+        scale_up_cooldown: float = 0.0,
+        scale_down_cooldown: float = 30.0,
+        utilisation: float = 0.8,
+        estimator: Optional[LoadEstimator] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.min_workers = min(min_workers, max_workers)
+        self.target_wait = target_wait
+        self.scale_up_cooldown = scale_up_cooldown
+        self.scale_down_cooldown = scale_down_cooldown
+        self.utilisation = utilisation
+        self.estimator = estimator or LoadEstimator()
+        self._last_change: Optional[float] = None
+        self._high_since: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    def target(self, queue_length: int) -> int:
+        """Return the unclamped worker count required by current estimates."""
+        rate = max(self.estimator.service_rate, 1e-9)
+        arrival_rate = self.estimator.arrival_rate
+        needed = 0
+        # The smoothed rate only decays towards zero, so ignore it once less
+        # than one task is expected to arrive within ``target_wait``.
+        if arrival_rate * self.target_wait >= 1:
+            needed = math.ceil(arrival_rate / (rate * self.utilisation))
+        if queue_length:
+            needed = max(
+                needed, math.ceil(queue_length / (rate * max(self.target_wait, 1e-9)))
+            )
+        return needed
+
+    # ------------------------------------------------------------------
+    def decide(self, sample: LoadSample, current: int) -> int:
+        self.estimator.update(sample, current)
+        now = sample.time
+        desired = max(
+            self.min_workers, min(self.max_workers, self.target(sample.queue_length))
+        )
+        if self._high_since is None or desired >= current:
+            self._high_since = now
+        if desired > current and self._cooled(now, self.scale_up_cooldown):
+            self._last_change = now
+            return desired
+        if (
+            desired < current
+            and self._cooled(now, self.scale_down_cooldown)
+            and now - self._high_since >= self.scale_down_cooldown
+        ):
+            self._last_change = now
+            return desired
+        return current
+
+    # ------------------------------------------------------------------
+    def _cooled(self, now: float, cooldown: float) -> bool:
+        return self._last_change is None or now - self._last_change >= cooldown